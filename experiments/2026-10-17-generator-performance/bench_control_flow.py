@@ -0,0 +1,44 @@
+"""
+Benchmark: control-flow generation cost as nesting depth grows.
+
+Builds function ASTs directly (the tokenizer caps source indentation at
+100 levels) holding 1000 `if` statements, nested to a given depth, and
+times HoloformGeneratorVisitor on each. Time per `if` should stay flat.
+"""
+import ast
+import os
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.ast_visitor import HoloformGeneratorVisitor
+
+def build_function(num_ifs, depth):
+    def assign(name):
+        return ast.Assign(targets=[ast.Name(id=name, ctx=ast.Store())], value=ast.Name(id="a", ctx=ast.Load()), lineno=1)
+
+    body = []
+    for _ in range(num_ifs // depth):
+        nested = []
+        for _ in range(depth):
+            nested = [ast.If(test=ast.Name(id="a", ctx=ast.Load()), body=nested + [assign("y")], orelse=[assign("z")])]
+        body.extend(nested)
+    arguments = ast.arguments(posonlyargs=[], args=[ast.arg(arg="a")], kwonlyargs=[], kw_defaults=[], defaults=[])
+    return ast.FunctionDef(name="f", args=arguments, body=body, decorator_list=[], returns=None)
+
+def main(num_ifs=1000, repeats=5):
+    for depth in (1, 10, 100, 1000):
+        function = build_function(num_ifs, depth)
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            HoloformGeneratorVisitor([]).visit(function)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"depth={depth:<5} {best * 1e3:7.2f} ms  {best / num_ifs * 1e6:6.2f} us per if")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: generation time for single functions with thousands of
+statements, to check that def/use extraction scales linearly.
+
+Each statement reads a few earlier variables through calls, attributes
+and arithmetic, so every operation carries a def_use entry.
+"""
+import ast
+import os
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+
+STATEMENTS = [
+    "    v{i} = v{a} * 2 + v{b}\n",
+    "    v{i} = compute(v{a}, scale=v{b})\n",
+    "    self.state[v{a}] = v{b} - 1\n",
+    "    v{i} = self.store.get(v{a}.key, [v{b}, v{a}])\n",
+]
+
+def build_function(num_statements):
+    lines = ["def big(self, v0, v1):\n"]
+    for i in range(2, num_statements + 2):
+        lines.append(STATEMENTS[i % len(STATEMENTS)].format(i=i, a=i - 1, b=i - 2))
+    lines.append(f"    return v{num_statements + 1}\n")
+    return "".join(lines)
+
+def main(repeats=3):
+    for num_statements in (1000, 2000, 4000, 8000, 16000):
+        source_code = build_function(num_statements)
+        parsed_ast = ast.parse(source_code)
+        source_lines = source_code.splitlines()
+        best = None
+        for _ in range(repeats):
+            start = time.process_time()
+            generate_holoforms_from_tree(parsed_ast, source_lines)
+            elapsed = time.process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"statements={num_statements:<6} {best * 1e3:8.1f} ms  {best / num_statements * 1e6:6.1f} us/statement")
+
+if __name__ == "__main__":
+    main()
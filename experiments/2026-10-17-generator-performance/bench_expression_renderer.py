@@ -0,0 +1,68 @@
+"""
+Benchmark: expressions per second for each expression-rendering dialect.
+
+Renders a synthetic corpus of expressions (names, attributes, calls,
+arithmetic, comparisons, subscripts and constants, nested up to a few
+levels) with the three entry points that share the render engine.
+"""
+import ast
+import os
+import random
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.ast_utils import REPR_CACHE, ast_node_to_repr_str
+from src.holoform_generators.differential_analyzer import DifferentialAnalyzer
+from src.holoform_generators.holochain_parser import HoloChainParser
+
+NAMES = ["customer", "order", "total", "self", "items", "rate", "x", "priority"]
+
+def random_expression(rng, depth):
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice([rng.choice(NAMES), str(rng.randint(0, 100)), "'gold'"])
+    kind = rng.randrange(5)
+    left = random_expression(rng, depth - 1)
+    right = random_expression(rng, depth - 1)
+    if kind == 0:
+        return f"({left} {rng.choice('+-*/')} {right})"
+    if kind == 1:
+        return f"({left} {rng.choice(['<', '>', '=='])} {right})"
+    if kind == 2:
+        return f"{rng.choice(NAMES)}.{rng.choice(NAMES)}({left}, {right})"
+    if kind == 3:
+        return f"{rng.choice(NAMES)}[{left}]"
+    return f"{rng.choice(NAMES)}.{rng.choice(NAMES)}"
+
+def build_corpus(size, depth=4, seed=0):
+    rng = random.Random(seed)
+    return [ast.parse(random_expression(rng, depth), mode="eval").body for _ in range(size)]
+
+def time_dialect(render, corpus, repeats=7):
+    # CPU time, best of several runs: wall-clock time is noisy on shared hosts.
+    best = None
+    for _ in range(repeats):
+        start = time.process_time()
+        for node in corpus:
+            render(node)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(corpus) / best
+
+def main(size=20000):
+    corpus = build_corpus(size)
+    parser = HoloChainParser()
+    dialects = [
+        ("repr (uncached)", ast_node_to_repr_str),
+        ("repr (cached)", lambda node: ast_node_to_repr_str(node, REPR_CACHE)),
+        ("holochain", parser._format_expression),
+        ("differential", DifferentialAnalyzer._format_expression),
+    ]
+    for label, render in dialects:
+        print(f"{label:<16} {time_dialect(render, corpus):10.0f} expr/s")
+
+if __name__ == "__main__":
+    main()
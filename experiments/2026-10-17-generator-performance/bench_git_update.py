@@ -0,0 +1,57 @@
+"""
+Benchmark: applying a git diff to a store vs. re-walking the project.
+
+Commits a synthetic project, changes a few files in a second commit, and
+times update_project on the diff against a warm parse_project.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators import project_parser
+from src.holoform_generators.git_changes import get_changed_files
+from src.holoform_generators.holoform_store import HoloformStore
+from bench_parallel_parse import build_project
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", repo, "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+                          check=True, capture_output=True, text=True).stdout.strip()
+
+def main(num_files=400, functions_per_file=50):
+    print(f"{num_files} files x {functions_per_file} functions")
+    for num_changed in (1, 10, 40):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = os.path.join(tmp, "repo")
+            build_project(repo, num_files, functions_per_file)
+            git(repo, "init", "-q")
+            git(repo, "add", "-A")
+            git(repo, "commit", "-q", "-m", "base")
+            base = git(repo, "rev-parse", "HEAD")
+
+            with HoloformStore(os.path.join(tmp, "store.sqlite")) as store:
+                project_parser.parse_project(repo, store=store)
+                for file_idx in range(num_changed):
+                    with open(os.path.join(repo, f"pkg{file_idx % 10}", f"mod{file_idx}.py"), "a") as f:
+                        f.write("\ndef extra():\n    return 1\n")
+                git(repo, "commit", "-q", "-a", "-m", "change")
+
+                start = time.perf_counter()
+                changes = get_changed_files(repo, base, "HEAD")
+                project_parser.update_project(repo, changes, store=store)
+                diff_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                project_parser.parse_project(repo, store=store, paranoid=True)
+                full_time = time.perf_counter() - start
+
+            print(f"changed={num_changed:<3} update_project: {diff_time * 1e3:8.1f} ms   "
+                  f"paranoid parse_project: {full_time * 1e3:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: binary Holoform file vs. a JSON document of the same Holoforms.
+
+Writes the Holoforms of a large module both ways, then times getting one
+Holoform by id from a fresh process state (opening the file included),
+random lookups on an open file, and loading everything.
+"""
+import ast
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_records import to_json_value
+from src.holoform_generators.holoform_file import HoloformFile, write_holoform_file
+from bench_single_parse import generate_module
+
+def timed(function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        result = function()
+        best = min(best, time.process_time() - start)
+    return result, best
+
+def json_get(json_path, holoform_id):
+    with open(json_path) as f:
+        return next(h for h in json.load(f) if h["id"] == holoform_id)
+
+def binary_get(binary_path, holoform_id):
+    with HoloformFile(binary_path) as holoform_file:
+        return holoform_file[holoform_id]
+
+def main(num_functions=20000, num_lookups=2000):
+    source_code = generate_module(num_functions)
+    holoforms = generate_holoforms_from_tree(ast.parse(source_code), source_code.splitlines())
+    ids = [holoform["id"] for holoform in holoforms]
+    target = ids[len(ids) // 2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "holoforms.json")
+        binary_path = os.path.join(tmp, "holoforms.hlf")
+
+        def write_json():
+            with open(json_path, "w") as f:
+                json.dump(holoforms, f, default=to_json_value)
+        _, json_write = timed(write_json)
+        _, binary_write = timed(lambda: write_holoform_file(binary_path, holoforms))
+        print(f"{num_functions} functions")
+        print(f"size:  json {os.path.getsize(json_path) / 2**20:6.2f} MiB, "
+              f"binary {os.path.getsize(binary_path) / 2**20:6.2f} MiB")
+        print(f"write: json {json_write * 1e3:8.1f} ms, binary {binary_write * 1e3:8.1f} ms")
+
+        from_json, json_one = timed(lambda: json_get(json_path, target))
+        from_binary, binary_one = timed(lambda: binary_get(binary_path, target))
+        assert json.dumps(from_binary, default=to_json_value) == json.dumps(from_json)
+        print(f"open + get one: json {json_one * 1e3:8.1f} ms, binary {binary_one * 1e6:8.1f} us")
+
+        sample = random.Random(0).sample(ids, num_lookups)
+        with HoloformFile(binary_path) as holoform_file:
+            _, lookups = timed(lambda: [holoform_file[holoform_id] for holoform_id in sample], repeat=1)
+            _, warm_lookups = timed(lambda: [holoform_file[holoform_id] for holoform_id in sample])
+            _, binary_all = timed(lambda: list(holoform_file.iter_holoforms()))
+        print(f"random get: {lookups / num_lookups * 1e6:6.1f} us first, "
+              f"{warm_lookups / num_lookups * 1e6:6.1f} us with strings cached")
+
+        def load_json():
+            with open(json_path) as f:
+                return json.load(f)
+        _, json_all = timed(load_json)
+        print(f"load all: json {json_all * 1e3:8.1f} ms, binary {binary_all * 1e3:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
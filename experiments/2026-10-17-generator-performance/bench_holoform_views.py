@@ -0,0 +1,111 @@
+"""
+Benchmark: reading a few fields of every Holoform, the way call-graph and
+bug-localisation code does, from a JSON document, from a binary Holoform
+file decoded in full, and through lazy HoloformViews of the same file.
+
+Each strategy runs in a fresh interpreter, so its peak RSS is its own. The
+task is to collect each Holoform's id and the target_function_name of its
+top-level call operations.
+"""
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_records import to_json_value
+from src.holoform_generators.holoform_file import HoloformFile, write_holoform_file
+from bench_single_parse import generate_module
+
+def callees(holoforms):
+    return [(holoform["id"], [op["target_function_name"] for op in holoform.get("operations", ())
+                              if "target_function_name" in op])
+            for holoform in holoforms]
+
+def from_json(json_path, binary_path):
+    with open(json_path) as f:
+        return callees(json.load(f))
+
+def from_binary(json_path, binary_path):
+    with HoloformFile(binary_path) as holoform_file:
+        return callees(holoform_file.iter_holoforms())
+
+def from_views(json_path, binary_path):
+    with HoloformFile(binary_path) as holoform_file:
+        return callees(holoform_file.iter_views())
+
+def one_from_json(json_path, binary_path, holoform_id):
+    with open(json_path) as f:
+        return callees(h for h in json.load(f) if h["id"] == holoform_id)
+
+def one_from_view(json_path, binary_path, holoform_id):
+    with HoloformFile(binary_path) as holoform_file:
+        return callees([holoform_file.view(holoform_id)])
+
+STRATEGIES = {function.__name__: function for function in (from_json, from_binary, from_views)}
+SINGLE = {function.__name__: function for function in (one_from_json, one_from_view)}
+
+def memory_status_kib(field):
+    """
+    Reads VmRSS or VmHWM (peak RSS, which unlike ru_maxrss is reset by
+    exec) from /proc, in KiB.
+    """
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+def child(name, json_path, binary_path, *args):
+    base = memory_status_kib("VmRSS")
+    start = time.perf_counter()
+    result = (STRATEGIES.get(name) or SINGLE[name])(json_path, binary_path, *args)
+    elapsed = time.perf_counter() - start
+    peak = memory_status_kib("VmHWM")
+    print(json.dumps({"seconds": elapsed, "rss_kib": peak - base, "result_size": len(result)}))
+
+def run_child(*args):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", *args],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def best_of(args, repeat=3):
+    runs = [run_child(*args) for _ in range(repeat)]
+    return min(run["seconds"] for run in runs), min(run["rss_kib"] for run in runs)
+
+def main(num_functions=30000):
+    source_code = generate_module(num_functions)
+    holoforms = generate_holoforms_from_tree(ast.parse(source_code), source_code.splitlines())
+    target = holoforms[len(holoforms) // 2]["id"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "holoforms.json")
+        binary_path = os.path.join(tmp, "holoforms.hlf")
+        with open(json_path, "w") as f:
+            json.dump(holoforms, f, default=to_json_value)
+        write_holoform_file(binary_path, holoforms)
+        del holoforms
+        print(f"{num_functions} functions: json {os.path.getsize(json_path) / 2**20:.1f} MiB, "
+              f"binary {os.path.getsize(binary_path) / 2**20:.1f} MiB")
+
+        print(f"{'strategy':>12} {'all callees (ms)':>17} {'peak RSS (MiB)':>15}")
+        for name in STRATEGIES:
+            seconds, rss = best_of([name, json_path, binary_path])
+            print(f"{name:>12} {seconds * 1e3:>17.1f} {rss / 1024:>15.1f}")
+
+        print(f"{'strategy':>12} {'one Holoform (ms)':>17} {'peak RSS (MiB)':>15}")
+        for name in SINGLE:
+            seconds, rss = best_of([name, json_path, binary_path, target])
+            print(f"{name:>12} {seconds * 1e3:>17.3f} {rss / 1024:>15.1f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,37 @@
+"""
+Benchmark: cold parse_project with and without directory pruning.
+
+The synthetic project has 100 source files plus a virtualenv and a
+node_modules tree that together hold 60% of all .py files.
+"""
+import os
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators import project_parser
+from src.holoform_generators.ignore_rules import IgnoreRules, WalkStats
+from bench_parallel_parse import build_project
+
+def main(functions_per_file=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = os.path.join(tmp, "project")
+        build_project(os.path.join(project_dir, "src"), 100, functions_per_file)
+        build_project(os.path.join(project_dir, ".venv", "lib"), 100, functions_per_file)
+        build_project(os.path.join(project_dir, "web", "node_modules"), 50, functions_per_file)
+
+        for label, rules in (("no pruning", IgnoreRules(use_defaults=False)), ("defaults", None)):
+            walk_stats = WalkStats()
+            start = time.perf_counter()
+            holoforms, _ = project_parser.parse_project(
+                project_dir, cache_path=os.path.join(tmp, f"{label}.sqlite"),
+                ignore_rules=rules, walk_stats=walk_stats)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<11} {elapsed:6.2f} s  holoforms={len(holoforms):<6} {walk_stats.report()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: one JSON document vs. JSON Lines streams of the same Holoforms.
+
+For a large module's Holoforms, compares the size and write time of a JSON
+document and of plain, gzip and xz JSON Lines files, the time and peak
+traced memory of reading everything back (json.load holds it all,
+read_jsonl one line at a time), the latency of reading one line through
+the sidecar index, and rebuilding a missing index.
+"""
+import ast
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_records import to_json_value
+from src.holoform_generators.jsonl_stream import INDEX_SUFFIX, JsonlReader, read_jsonl, rebuild_index, write_jsonl
+from bench_single_parse import generate_module
+
+def timed(function):
+    start = time.process_time()
+    result = function()
+    return result, time.process_time() - start
+
+def read_cost(function):
+    """
+    Returns the time of function untraced, and its peak traced memory.
+    """
+    _, elapsed = timed(function)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def count_ids(values):
+    return sum(1 for value in values if value.get("id"))
+
+def main(num_functions=20000, num_seeks=200):
+    source_code = generate_module(num_functions)
+    holoforms = generate_holoforms_from_tree(ast.parse(source_code), source_code.splitlines())
+    rng = random.Random(0)
+    lines = [rng.randrange(len(holoforms)) for _ in range(num_seeks)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "holoforms.json")
+
+        def write_json():
+            with open(json_path, "w") as f:
+                json.dump(holoforms, f, default=to_json_value)
+        _, write_time = timed(write_json)
+
+        def load_json():
+            with open(json_path) as f:
+                return count_ids(json.load(f))
+        read_time, read_peak = read_cost(load_json)
+        print(f"{num_functions} functions, {len(holoforms)} Holoforms")
+        print(f"{'format':>12} {'size (MiB)':>11} {'write (ms)':>11} {'read all (ms)':>14} "
+              f"{'read peak (KiB)':>16} {'seek (us)':>10} {'reindex (ms)':>13}")
+        print(f"{'json':>12} {os.path.getsize(json_path) / 2**20:>11.2f} {write_time * 1e3:>11.1f} "
+              f"{read_time * 1e3:>14.1f} {read_peak / 2**10:>16.0f} {'-':>10} {'-':>13}")
+
+        for name in ("holoforms.jsonl", "holoforms.jsonl.gz", "holoforms.jsonl.xz"):
+            path = os.path.join(tmp, name)
+            _, write_time = timed(lambda: write_jsonl(path, holoforms))
+            read_time, read_peak = read_cost(lambda: count_ids(read_jsonl(path)))
+            reader = JsonlReader(path)
+            _, seek_time = timed(lambda: [reader[line] for line in lines])
+            os.remove(path + INDEX_SUFFIX)
+            _, reindex_time = timed(lambda: rebuild_index(path))
+            assert reader[lines[0]] == JsonlReader(path)[lines[0]]
+            print(f"{name.split('.', 1)[1]:>12} {os.path.getsize(path) / 2**20:>11.2f} {write_time * 1e3:>11.1f} "
+                  f"{read_time * 1e3:>14.1f} {read_peak / 2**10:>16.0f} {seek_time / num_seeks * 1e6:>10.1f} "
+                  f"{reindex_time * 1e3:>13.1f}")
+
+if __name__ == "__main__":
+    main()
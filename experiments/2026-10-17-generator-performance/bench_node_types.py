@@ -0,0 +1,80 @@
+"""
+Benchmark: generation cost per statement type as functions grow.
+
+For each statement type, builds functions holding N copies of it, each
+copy wrapping one assignment and nested in groups of five, and times
+HoloformGeneratorVisitor on the parsed function. The time per copy should
+stay flat as N grows for every type; the last column is the largest size's
+cost over the smallest's.
+"""
+import ast
+import gc
+import os
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.ast_visitor import HoloformGeneratorVisitor
+
+# Header lines that open each construct; None for plain statements.
+CONSTRUCTS = {
+    "assign": None,
+    "call": None,
+    "if": ["if a > 1:"],
+    "while": ["while a:"],
+    "try": ["try:"],
+    "for": ["for i, b in enumerate(a):"],
+    "async for": ["async for b in a:"],
+    "with": ["with open(a) as fh, lock:"],
+    "async with": ["async with session(a) as s:"],
+}
+if hasattr(ast, "Match"):
+    CONSTRUCTS["match"] = ["match a:", "case {'k': v, **rest} if v:"]
+
+NESTING = 5
+
+def build_function(construct, count):
+    headers = CONSTRUCTS[construct]
+    lines = ["async def f(a):"]
+    for group in range(0, count, NESTING):
+        indent = "    "
+        for _ in range(min(NESTING, count - group)):
+            if headers is None:
+                lines.append(indent + ("x = a + 1" if construct == "assign" else "g(a, key=a)"))
+                continue
+            for header in headers:
+                lines.append(indent + header)
+                indent += "    "
+            lines.append(indent + "x = a + 1")
+            if construct == "try":
+                lines.append(indent[4:] + "except ValueError as e:")
+                lines.append(indent + "x = e")
+    lines.append("    return x")
+    return ast.parse("\n".join(lines)).body[0]
+
+def time_visit(function, repeats):
+    # As in timeit, the cyclic collector is off while timing: its passes
+    # scale with every live object in the process, not with the visit.
+    best = None
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.process_time()
+            HoloformGeneratorVisitor([]).visit(function)
+            elapsed = time.process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+def main(sizes=(500, 2000, 8000), repeats=5):
+    print(f"{'construct':<11}" + "".join(f"{f'us/copy @{size}':>16}" for size in sizes) + f"{'ratio':>8}")
+    for construct in CONSTRUCTS:
+        costs = [time_visit(build_function(construct, size), repeats) / size * 1e6 for size in sizes]
+        print(f"{construct:<11}" + "".join(f"{cost:16.2f}" for cost in costs) + f"{costs[-1] / costs[0]:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: corpus statistics over a million operations, by walking the
+nested operation dicts of each Holoform and by aggregating OperationColumns.
+
+The statistics are op_type frequencies, the fan-out (number of calls) of
+each Holoform, and the mean def and use counts per op_type. The corpus is
+a generated module's Holoforms repeated until it has ~1M operations.
+"""
+import ast
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_columns import (
+    NESTED_CLAUSE_KEYS, NESTED_OPERATION_KEYS, OperationColumns, numpy, read_operation_columns,
+)
+
+FUNCTION_TEMPLATE = """
+def handle_{i}(request, items):
+    total = 0
+    for item in items:
+        if item.valid:
+            total = add_{i}(total, item.price, item.count)
+        else:
+            log("skip", item)
+    request.total = total
+    return respond(request, total)
+"""
+
+def generate_module(num_functions):
+    return "".join(FUNCTION_TEMPLATE.format(i=i) for i in range(num_functions))
+
+def walk(holoform):
+    stack = list(reversed(holoform.get("operations", [])))
+    while stack:
+        operation = stack.pop()
+        yield operation
+        nested = []
+        for key in NESTED_OPERATION_KEYS:
+            nested.extend(operation.get(key) or ())
+        for key in NESTED_CLAUSE_KEYS:
+            for clause in operation.get(key) or ():
+                nested.extend(clause.get("body") or ())
+        stack.extend(reversed(nested))
+
+def dict_statistics(holoforms):
+    op_types = Counter()
+    fan_out = Counter()
+    totals = {}
+    for holoform in holoforms:
+        for operation in walk(holoform):
+            op_type = operation.get("op_type")
+            op_types[op_type] += 1
+            if op_type == "function_call":
+                fan_out[holoform.get("id")] += 1
+            def_use = operation.get("def_use")
+            num_defs, num_uses = (len(def_use["defs"]), len(def_use["uses"])) if def_use is not None else (0, 0)
+            total = totals.setdefault(op_type, [0, 0, 0])
+            total[0] += num_defs
+            total[1] += num_uses
+            total[2] += 1
+    means = {op_type: (defs / count, uses / count) for op_type, (defs, uses, count) in totals.items()}
+    return dict(op_types), dict(fan_out), means
+
+def column_statistics(columns):
+    op_types = columns.value_counts("op_type")
+    fan_out = columns.value_counts("holoform", where={"op_type": "function_call"})
+    defs = columns.mean("num_defs", by="op_type")
+    uses = columns.mean("num_uses", by="op_type")
+    return op_types, fan_out, {op_type: (defs[op_type], uses[op_type]) for op_type in defs}
+
+def timed(function):
+    start = time.process_time()
+    result = function()
+    return result, time.process_time() - start
+
+def main(target_operations=1_000_000, num_functions=12500):
+    source_code = generate_module(num_functions)
+    holoforms = generate_holoforms_from_tree(ast.parse(source_code), source_code.splitlines())
+    per_copy = sum(1 for holoform in holoforms for _ in walk(holoform))
+    holoforms = holoforms * -(-target_operations // per_copy)
+
+    dict_result, dict_time = timed(lambda: dict_statistics(holoforms))
+    columns, build_time = timed(lambda: OperationColumns(holoforms, use_numpy=False))
+    print(f"{len(holoforms)} Holoforms, {len(columns)} operations, NumPy {'available' if numpy else 'not installed'}")
+    print(f"{'strategy':>18} {'statistics (ms)':>16}")
+    print(f"{'nested dicts':>18} {dict_time * 1e3:>16.1f}")
+    print(f"{'build columns':>18} {build_time * 1e3:>16.1f}")
+
+    for use_numpy in (False, True) if numpy is not None else (False,):
+        columns.use_numpy = use_numpy
+        result, query_time = timed(lambda: column_statistics(columns))
+        assert result == dict_result
+        print(f"{'columns (NumPy)' if use_numpy else 'columns (array)':>18} {query_time * 1e3:>16.1f}")
+    columns.use_numpy = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _, write_time = timed(lambda: columns.write(tmp))
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        _, read_time = timed(lambda: read_operation_columns(tmp, use_numpy=False))
+    print(f"export: {size / 2**20:.1f} MiB, write {write_time * 1e3:.1f} ms, read {read_time * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: memory held by generated operations, slotted records vs. dicts.
+
+Generates Holoforms for a large module and measures, with tracemalloc,
+the bytes retained by the generated Holoforms in both representations,
+divided by the number of operations. The dict representation is built
+with holoform_to_dict, which yields exactly what the visitor produced
+before operation records.
+"""
+import ast
+import gc
+import os
+import sys
+import tracemalloc
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_records import holoform_to_dict
+from bench_single_parse import generate_module
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+def main(num_functions=20000):
+    source_code = generate_module(num_functions)
+    parsed_ast = ast.parse(source_code)
+    source_lines = source_code.splitlines()
+
+    holoforms, record_bytes = measure(lambda: generate_holoforms_from_tree(parsed_ast, source_lines))
+    num_ops = sum(len(h["operations"]) for h in holoforms)
+    # The records are dropped as soon as they are converted, so only the
+    # dicts and the strings they share with the records stay retained.
+    _, dict_bytes = measure(lambda: [holoform_to_dict(h) for h in generate_holoforms_from_tree(parsed_ast, source_lines)])
+
+    print(f"{num_functions} functions, {num_ops} operations")
+    print(f"dicts:   {dict_bytes / num_ops:7.1f} bytes/op  ({dict_bytes / 2**20:6.1f} MiB)")
+    print(f"records: {record_bytes / num_ops:7.1f} bytes/op  ({record_bytes / 2**20:6.1f} MiB)")
+    op = holoforms[0]["operations"][0]
+    print(f"single call op: record {sys.getsizeof(op)} bytes, dict {sys.getsizeof(op.to_dict())} bytes (shallow)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: serial vs. process-pool project parsing.
+
+Builds a synthetic project in a temporary directory and times parse_project
+for several worker counts, checking that every run returns the same output.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators import project_parser
+
+FUNCTION_TEMPLATE = """
+def process_{i}(user, amount):
+    total = amount * 2
+    user.balance = total
+    result = helper_{i}(user, total)
+    return result
+"""
+
+def build_project(project_dir, num_files, functions_per_file):
+    for file_idx in range(num_files):
+        package_dir = os.path.join(project_dir, f"pkg{file_idx % 10}")
+        os.makedirs(package_dir, exist_ok=True)
+        with open(os.path.join(package_dir, f"mod{file_idx}.py"), "w") as f:
+            f.write("".join(FUNCTION_TEMPLATE.format(i=i) for i in range(functions_per_file)))
+
+def main(num_files=400, functions_per_file=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        old_cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            build_project(os.path.join(tmp, "project"), num_files, functions_per_file)
+            print(f"{num_files} files x {functions_per_file} functions, {os.cpu_count()} CPUs")
+            baseline = None
+            for workers in (1, 2, 4, os.cpu_count()):
+                if os.path.exists(project_parser.CACHE_FILE):
+                    os.remove(project_parser.CACHE_FILE)
+                start = time.perf_counter()
+                result = project_parser.parse_project(os.path.join(tmp, "project"), workers=workers)
+                elapsed = time.perf_counter() - start
+                output = json.dumps(result)
+                baseline = baseline or output
+                print(f"workers={workers:<3} {elapsed:8.2f} s  identical={output == baseline}")
+        finally:
+            os.chdir(old_cwd)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: all analyzers over the same files, with and without the shared
+parse cache.
+
+Each module goes through the Holoform generator, HoloChainParser and
+DifferentialAnalyzer.analyze (up to three parses of its own), twice,
+as when the same files are analysed again after an unrelated change.
+"Uncached" runs the same code with a cache that holds nothing, so the
+parse_seconds counter still measures the time spent parsing.
+"""
+import ast
+import os
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.parse_cache import PARSE_CACHE, DEFAULT_MAX_TREE_BYTES, compile_module
+from src.holoform_generators.main_generator import generate_holoform_from_code_string
+from src.holoform_generators.holochain_parser import HoloChainParser
+from src.holoform_generators.differential_analyzer import DifferentialAnalyzer
+
+FUNCTION_TEMPLATE = """
+def process_{i}(customer, amount):
+    total = amount * 2
+    if customer.status == "active":
+        customer.balance = total
+    for item in customer.items:
+        item.price = item.price - 1
+    result = helper_{i}(customer, total)
+    return result
+"""
+
+def generate_modules(num_modules, functions_per_module):
+    return ["".join(FUNCTION_TEMPLATE.format(i=m * functions_per_module + i) for i in range(functions_per_module))
+            for m in range(num_modules)]
+
+def analyze_all(modules, rounds=2):
+    for _ in range(rounds):
+        for source_code in modules:
+            generate_holoform_from_code_string(source_code)
+            HoloChainParser().parse_code(source_code)
+            DifferentialAnalyzer().analyze(source_code)
+
+def run(modules, max_tree_bytes):
+    PARSE_CACHE.clear()
+    PARSE_CACHE.max_tree_bytes = max_tree_bytes
+    start = time.process_time()
+    analyze_all(modules)
+    return time.process_time() - start, PARSE_CACHE.stats()
+
+def time_parser(func, modules, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for source_code in modules:
+            func(source_code)
+        best = min(best, time.process_time() - start)
+    return best
+
+def main():
+    print(f"{'modules':>8} {'defs/mod':>9} {'uncached (ms)':>14} {'parse (ms)':>11} "
+          f"{'cached (ms)':>12} {'parse (ms)':>11} {'hits':>6} {'misses':>7}")
+    for num_modules, functions_per_module in ((200, 5), (50, 40), (10, 200)):
+        modules = generate_modules(num_modules, functions_per_module)
+        uncached, uncached_stats = run(modules, 0)
+        cached, cached_stats = run(modules, DEFAULT_MAX_TREE_BYTES)
+        print(f"{num_modules:>8} {functions_per_module:>9} {uncached * 1e3:>14.1f} "
+              f"{uncached_stats['parse_seconds'] * 1e3:>11.1f} {cached * 1e3:>12.1f} "
+              f"{cached_stats['parse_seconds'] * 1e3:>11.1f} {cached_stats['hits']:>6} {cached_stats['misses']:>7}")
+    PARSE_CACHE.clear()
+    PARSE_CACHE.max_tree_bytes = DEFAULT_MAX_TREE_BYTES
+
+    modules = generate_modules(2000, 1)
+    print(f"\n2000 one-function modules: ast.parse {time_parser(ast.parse, modules) * 1e3:.1f} ms, "
+          f"compile(ONLY_AST) {time_parser(compile_module, modules) * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
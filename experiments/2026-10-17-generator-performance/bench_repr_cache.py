@@ -0,0 +1,78 @@
+"""
+Benchmark: ast_node_to_repr_str with and without the structural repr cache.
+
+Renders every expression operand the visitor would render for a large
+synthetic module, once through RenderCache and once uncached, and reports
+time, hit rate, bytes saved and the memory held by the rendered strings.
+"""
+import ast
+import os
+import sys
+import time
+import tracemalloc
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.ast_utils import RenderCache, ast_node_to_repr_str
+
+FUNCTION_TEMPLATE = """
+def handler_{i}(self, request, amount_{j}):
+    total = amount_{j} * 2 + self.fee
+    self.balance = total
+    record = self.store.save(request, total, retries=3)
+    payload = build_payload(self, request, [total, amount_{j}, key_{i}])
+    return record
+"""
+
+def collect_operands(source_code):
+    """
+    Returns the value and argument expressions of every statement, as the
+    visitor renders them.
+    """
+    nodes = []
+    for node in ast.walk(ast.parse(source_code)):
+        if isinstance(node, (ast.Assign, ast.Return)) and node.value is not None:
+            nodes.append(node.value)
+        if isinstance(node, ast.Call):
+            nodes.extend(node.args)
+            nodes.extend(kw.value for kw in node.keywords)
+    return nodes
+
+def render_all(nodes, cache):
+    """
+    Times one rendering pass, then measures the memory a second pass keeps
+    alive (tracemalloc would distort the timing).
+    """
+    start = time.perf_counter()
+    strings = [ast_node_to_repr_str(node, cache) for node in nodes]
+    elapsed = time.perf_counter() - start
+    if cache is not None:
+        cache.clear()
+    del strings
+
+    tracemalloc.start()
+    strings = [ast_node_to_repr_str(node, cache) for node in nodes]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return strings, elapsed, retained
+
+def main(num_functions=20000):
+    nodes = collect_operands("".join(FUNCTION_TEMPLATE.format(i=i, j=i % 100) for i in range(num_functions)))
+    print(f"{len(nodes)} expressions")
+
+    uncached, elapsed, retained = render_all(nodes, None)
+    print(f"uncached: {elapsed * 1e3:7.1f} ms  {len(nodes) / elapsed:9.0f} expr/s  strings {retained / 2**20:5.1f} MiB")
+
+    for maxsize in (65536, 256):
+        cache = RenderCache(maxsize)
+        cached, elapsed, retained = render_all(nodes, cache)
+        assert cached == uncached
+        stats = cache.stats()
+        print(f"cached (maxsize={maxsize:<5}): {elapsed * 1e3:7.1f} ms  {len(nodes) / elapsed:9.0f} expr/s  "
+              f"strings {retained / 2**20:5.1f} MiB  hit rate {stats['hit_rate']:.1%}  "
+              f"bytes saved {stats['bytes_saved'] / 2**20:.1f} MiB  evictions {stats['evictions']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: serializing function Holoforms with many operations, the old way
+(a json.dumps per operation, lines joined at the end) vs. the single-pass
+write_json serializer, into a string and streamed to a file, for Holoforms
+of operation records and for the same Holoforms as plain dicts.
+
+Checks that both give byte-identical text, then reports throughput.
+"""
+import ast
+import json
+import os
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_records import holoform_to_dict, to_json_value
+from src.holoform_generators.serialization import serialize_holoform, write_holoform
+
+BLOCK_TEMPLATE = """
+    value_{i} = compute(data, {i})
+    self.cache["k{i}"] = value_{i}
+    if value_{i} > limit:
+        for item in value_{i}:
+            log(item, level=2)
+    with open(path) as handle_{i}:
+        total = total + handle_{i}.read()
+"""
+
+def generate_module(num_functions, blocks_per_function):
+    return "".join(
+        f"\ndef process_{f}(self, data, limit, path):\n    total = 0\n"
+        + "".join(BLOCK_TEMPLATE.format(i=i) for i in range(blocks_per_function))
+        + "    return total\n"
+        for f in range(num_functions))
+
+def old_serialize_function_holoform(holoform):
+    lines = []
+    lines.append(f"Function: {holoform.get('id')}")
+    lines.append(f"Description: {holoform.get('description')}")
+    lines.append(f"Inputs: {', '.join(holoform.get('input_parameters', []))}")
+    lines.append(f"Output: {holoform.get('output_variable_name')}")
+    lines.append("Operations:")
+    for op in holoform.get("operations", []):
+        lines.append(f"  - {json.dumps(op, default=to_json_value)}")
+    return "\n".join(lines)
+
+def best_time(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        function()
+        best = min(best, time.process_time() - start)
+    return best
+
+def main(num_functions=20, blocks_per_function=500):
+    source_code = generate_module(num_functions, blocks_per_function)
+    holoforms = generate_holoforms_from_tree(ast.parse(source_code), source_code.splitlines())
+    num_operations = sum(len(holoform["operations"]) for holoform in holoforms)
+    plain_holoforms = [holoform_to_dict(holoform) for holoform in holoforms]
+    texts = [old_serialize_function_holoform(holoform) for holoform in holoforms]
+    assert texts == [serialize_holoform(holoform) for holoform in holoforms]
+    assert texts == [serialize_holoform(holoform) for holoform in plain_holoforms]
+    size = sum(len(text) for text in texts) / 2**20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "holoforms.txt")
+
+        def stream():
+            with open(path, "w") as f:
+                for holoform in holoforms:
+                    write_holoform(holoform, f)
+
+        def old_to_file():
+            with open(path, "w") as f:
+                for holoform in holoforms:
+                    f.write(old_serialize_function_holoform(holoform))
+
+        results = [
+            ("json.dumps per op", best_time(lambda: [old_serialize_function_holoform(h) for h in holoforms])),
+            ("single pass", best_time(lambda: [serialize_holoform(h) for h in holoforms])),
+            ("old, to file", best_time(old_to_file)),
+            ("streamed to file", best_time(stream)),
+            ("plain, per op", best_time(lambda: [old_serialize_function_holoform(h) for h in plain_holoforms])),
+            ("plain, single pass", best_time(lambda: [serialize_holoform(h) for h in plain_holoforms])),
+        ]
+        with open(path) as f:
+            assert f.read() == "".join(texts)
+
+    print(f"{len(holoforms)} functions, {num_operations} top-level operations, {size:.1f} MiB of text")
+    print(f"{'serializer':>18} {'time (ms)':>10} {'MiB/s':>8}")
+    for name, seconds in results:
+        print(f"{name:>18} {seconds * 1e3:>10.1f} {size / seconds:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: building side-effect summaries and updating them after an edit.
+
+The synthetic project has N functions in layers of 100: each function
+writes an attribute of its parameter and calls three functions of the
+layer below, and every tenth function also calls back into its own layer,
+which makes 10-function cycles. An edit replaces one function with a
+version that writes nothing, then with one that also calls different
+functions, which needs a new component decomposition.
+"""
+import ast
+import os
+import random
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.side_effects import SideEffectSummaries
+
+LAYER_SIZE = 100
+
+def function_source(index, num_functions, rng, writes=True):
+    lines = [f"def f{index}(obj, extra):"]
+    lines.append(f"    obj.field{index % 7} = extra" if writes else "    local = extra")
+    next_layer = (index // LAYER_SIZE + 1) * LAYER_SIZE
+    if next_layer < num_functions:
+        for _ in range(3):
+            lines.append(f"    f{rng.randrange(next_layer, min(next_layer + LAYER_SIZE, num_functions))}(obj, extra)")
+    # Rings of ten functions within a layer.
+    ring_next = index - 9 if index % 10 == 9 else index + 1
+    if ring_next < num_functions:
+        lines.append(f"    f{ring_next}(extra, obj)")
+    return "\n".join(lines) + "\n"
+
+def build_sources(num_functions, seed=0, edited_index=None):
+    rng = random.Random(seed)
+    return [function_source(i, num_functions, rng, writes=i != edited_index) for i in range(num_functions)]
+
+def to_holoforms(sources):
+    code = "".join(sources)
+    return generate_holoforms_from_tree(ast.parse(code), code.splitlines())
+
+def timed_update(summaries, holoforms):
+    start = time.process_time()
+    summaries.update(holoforms)
+    return time.process_time() - start, summaries.last_recomputed_components
+
+def main():
+    print(f"{'functions':>9} {'build ms':>9} {'components':>11} "
+          f"{'same-calls edit ms':>19} {'recomputed':>11} {'new-calls edit ms':>18} {'recomputed':>11}")
+    for num_functions in (1000, 5000, 20000):
+        holoforms = to_holoforms(build_sources(num_functions))
+        start = time.process_time()
+        summaries = SideEffectSummaries(holoforms)
+        build = time.process_time() - start
+        num_components = summaries.last_recomputed_components
+
+        # Edit a function in the middle layer: first only its body, then its calls too.
+        edited_index = num_functions // 2
+        same_calls = build_sources(num_functions, edited_index=edited_index)[edited_index]
+        same_calls_time, same_calls_recomputed = timed_update(summaries, to_holoforms([same_calls]))
+        new_calls = function_source(edited_index, num_functions, random.Random(1))
+        new_calls_time, new_calls_recomputed = timed_update(summaries, to_holoforms([new_calls]))
+        print(f"{num_functions:>9} {build * 1e3:9.1f} {num_components:>11} "
+              f"{same_calls_time * 1e3:19.1f} {same_calls_recomputed:>11} "
+              f"{new_calls_time * 1e3:18.1f} {new_calls_recomputed:>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: per-file generation cost as the number of definitions grows.
+
+Compares the old parse_project strategy (re-parse the file for every
+top-level definition) with the single-parse generate_holoforms_from_tree
+path. Time per definition should stay flat for the single-parse path.
+"""
+import ast
+import os
+import sys
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import (
+    generate_holoform_from_code_string,
+    generate_holoforms_from_tree,
+)
+
+FUNCTION_TEMPLATE = """
+def process_{i}(user, amount):
+    total = amount * 2
+    user.balance = total
+    result = helper_{i}(user, total)
+    return result
+"""
+
+def generate_module(num_functions):
+    return "".join(FUNCTION_TEMPLATE.format(i=i) for i in range(num_functions))
+
+def per_definition_parse(source_code):
+    holoforms = []
+    for node in ast.parse(source_code).body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            holoforms.append(generate_holoform_from_code_string(source_code, target_name=node.name))
+    return holoforms
+
+def single_parse(source_code):
+    return generate_holoforms_from_tree(ast.parse(source_code), source_code.splitlines())
+
+def time_it(func, source_code, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(source_code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    print(f"{'defs':>6} {'per-def parse (ms)':>20} {'us/def':>10} {'single parse (ms)':>20} {'us/def':>10}")
+    for num_functions in (50, 100, 200, 400, 800):
+        source_code = generate_module(num_functions)
+        old = time_it(per_definition_parse, source_code)
+        new = time_it(single_parse, source_code)
+        print(f"{num_functions:>6} {old * 1e3:>20.2f} {old / num_functions * 1e6:>10.1f} "
+              f"{new * 1e3:>20.2f} {new / num_functions * 1e6:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: peak Python heap of parse_project vs. iter_project_holoforms.
+
+Both runs are cold (fresh store). The streaming run only feeds a
+CallGraphBuilder, so its peak should track the largest file rather than the
+whole project.
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators import project_parser
+from bench_parallel_parse import build_project
+
+def materialised(project_dir, cache_path):
+    holoforms, call_graph = project_parser.parse_project(project_dir, cache_path=cache_path)
+    return len(holoforms), len(call_graph)
+
+def streaming(project_dir, cache_path):
+    builder = project_parser.CallGraphBuilder()
+    count = 0
+    for _ in builder.consume(project_parser.iter_project_holoforms(project_dir, cache_path=cache_path)):
+        count += 1
+    return count, len(builder.call_graph)
+
+def measure(func, project_dir, cache_path):
+    tracemalloc.start()
+    result = func(project_dir, cache_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+def main(functions_per_file=50):
+    print(f"{'files':>6} {'parse_project peak (MB)':>24} {'streaming peak (MB)':>20}")
+    for num_files in (100, 200, 400):
+        with tempfile.TemporaryDirectory() as tmp:
+            project_dir = os.path.join(tmp, "project")
+            build_project(project_dir, num_files, functions_per_file)
+            _, full_peak = measure(materialised, project_dir, os.path.join(tmp, "full.sqlite"))
+            _, stream_peak = measure(streaming, project_dir, os.path.join(tmp, "stream.sqlite"))
+            print(f"{num_files:>6} {full_peak / 2**20:>24.1f} {stream_peak / 2**20:>20.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: memory and access cost of CompactHoloforms vs. operation records.
+
+Generates Holoforms for a large module, then measures with tracemalloc the
+bytes retained by the records and by CompactHoloforms sharing one symbol
+table (the records dropped), per operation. Also times building the
+compact form, JSON output from each, and counting the call sites of every
+callee through the records' strings, through decoded CompactHoloforms and
+through symbol ids.
+"""
+import ast
+import gc
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators.main_generator import generate_holoforms_from_tree
+from src.holoform_generators.operation_records import to_json_value
+from src.holoform_generators.symbol_table import compact_holoforms
+from bench_operation_memory import measure
+from bench_single_parse import generate_module
+
+def timed(function):
+    start = time.process_time()
+    result = function()
+    return result, time.process_time() - start
+
+def count_callees(holoforms):
+    counts = Counter()
+    stack = [op for holoform in holoforms for op in holoform.get("operations", [])]
+    while stack:
+        op = stack.pop()
+        if op.get("op_type") in ("function_call", "constructor_call"):
+            counts[op["target_function_name"]] += 1
+        for key in ("body", "orelse", "loop_body_operations", "finalbody"):
+            stack.extend(op.get(key, ()))
+    return counts
+
+def main(num_functions=20000):
+    source_code = generate_module(num_functions)
+    parsed_ast = ast.parse(source_code)
+    source_lines = source_code.splitlines()
+
+    holoforms, record_bytes = measure(lambda: generate_holoforms_from_tree(parsed_ast, source_lines))
+    num_ops = sum(len(h.get("operations", [])) for h in holoforms)
+    (compact, table), compact_bytes = measure(
+        lambda: compact_holoforms(generate_holoforms_from_tree(parsed_ast, source_lines)))
+    _, build_time = timed(lambda: compact_holoforms(holoforms))
+
+    print(f"{num_functions} functions, {num_ops} operations, {len(table)} symbols")
+    print(f"records: {record_bytes / num_ops:7.1f} bytes/op  ({record_bytes / 2**20:6.1f} MiB)")
+    print(f"compact: {compact_bytes / num_ops:7.1f} bytes/op  ({compact_bytes / 2**20:6.1f} MiB, table included)")
+    print(f"compact build: {build_time * 1e3:7.1f} ms")
+
+    gc.collect()
+    records_json, records_time = timed(lambda: json.dumps(holoforms, default=to_json_value))
+    compact_json, compact_time = timed(lambda: json.dumps(compact, default=to_json_value))
+    assert records_json == compact_json
+    print(f"json output: records {records_time * 1e3:7.1f} ms, compact {compact_time * 1e3:7.1f} ms")
+
+    string_counts, string_time = timed(lambda: count_callees(holoforms))
+    def count_ids():
+        counts = Counter()
+        for holoform in compact:
+            counts.update(holoform.symbol_ids("target_function_name"))
+        return counts
+    id_counts, id_time = timed(count_ids)
+    decoded_counts, decoded_time = timed(lambda: count_callees(compact))
+    assert {table.resolve(i): n for i, n in id_counts.items()} == string_counts == decoded_counts
+    print(f"call-site counts: records {string_time * 1e3:7.1f} ms, compact decoded {decoded_time * 1e3:7.1f} ms, "
+          f"symbol ids {id_time * 1e3:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark: cold vs. warm parse_project runs over an unchanged tree.
+
+A warm run replays cached Holoforms instead of re-parsing, and must still
+return the complete project. The paranoid warm run re-hashes every file
+instead of trusting unchanged stat fields. The last run edits a single file,
+which only rewrites that file's rows in the store.
+"""
+import os
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators import project_parser
+from bench_parallel_parse import build_project
+
+def timed_parse(project_dir, cache_path, **kwargs):
+    start = time.perf_counter()
+    result = project_parser.parse_project(project_dir, cache_path=cache_path, **kwargs)
+    return time.perf_counter() - start, result
+
+def main(num_files=400, functions_per_file=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = os.path.join(tmp, "project")
+        cache_path = os.path.join(tmp, "cache.sqlite")
+        build_project(project_dir, num_files, functions_per_file)
+
+        cold_time, cold = timed_parse(project_dir, cache_path)
+        warm_time, warm = timed_parse(project_dir, cache_path)
+        paranoid_time, paranoid = timed_parse(project_dir, cache_path, paranoid=True)
+        with open(os.path.join(project_dir, "pkg0", "mod0.py"), "a") as f:
+            f.write("\ndef extra():\n    return 1\n")
+        one_file_time, one_file = timed_parse(project_dir, cache_path)
+        print(f"{num_files} files x {functions_per_file} functions")
+        print(f"cold run: {cold_time:8.3f} s  holoforms={len(cold[0])}")
+        print(f"warm run: {warm_time:8.3f} s  holoforms={len(warm[0])}  complete={warm == cold}")
+        print(f"paranoid: {paranoid_time:8.3f} s  holoforms={len(paranoid[0])}  complete={paranoid == cold}")
+        print(f"one file: {one_file_time:8.3f} s  holoforms={len(one_file[0])}")
+
+if __name__ == "__main__":
+    main()
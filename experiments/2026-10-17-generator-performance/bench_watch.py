@@ -0,0 +1,50 @@
+"""
+Benchmark: watch-mode poll latency vs. re-running parse_project.
+
+Measures an idle poll, a poll that picks up one modified file, and a warm
+parse_project over the same tree for comparison.
+"""
+import os
+import sys
+import tempfile
+import time
+
+_PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT_DIR not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT_DIR)
+
+from src.holoform_generators import project_parser
+from src.holoform_generators.project_watcher import ProjectWatcher
+from bench_parallel_parse import build_project
+
+def main(num_files=400, functions_per_file=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        project_dir = os.path.join(tmp, "project")
+        cache_path = os.path.join(tmp, "store.sqlite")
+        build_project(project_dir, num_files, functions_per_file)
+
+        with ProjectWatcher(project_dir, cache_path=cache_path) as watcher:
+            start = time.perf_counter()
+            idle_events = watcher.poll()
+            idle = time.perf_counter() - start
+
+            filepath = os.path.join(project_dir, "pkg0", "mod0.py")
+            with open(filepath, "a") as f:
+                f.write("\ndef extra():\n    return helper_0(1)\n")
+            st = os.stat(filepath)
+            os.utime(filepath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            start = time.perf_counter()
+            change_events = watcher.poll()
+            change = time.perf_counter() - start
+
+        start = time.perf_counter()
+        project_parser.parse_project(project_dir, cache_path=cache_path)
+        warm_full = time.perf_counter() - start
+
+        print(f"{num_files} files x {functions_per_file} functions")
+        print(f"idle poll:          {idle * 1e3:8.1f} ms  events={len(idle_events)}")
+        print(f"one-file change:    {change * 1e3:8.1f} ms  events={len(change_events)}")
+        print(f"warm parse_project: {warm_full * 1e3:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,57 @@
 # AIResearchProject/src/holoform_generators/ast_utils.py
 import ast
+from .expression_renderer import RenderCache, RenderProfile, render_expression
 
-def ast_node_to_repr_str(node):
-    """Converts an AST expression node to a string representation of its structure."""
-    if isinstance(node, ast.Name):
-        return f"Name(id='{node.id}')"
-    elif isinstance(node, ast.Constant):
-        val_type = type(node.value).__name__
-        if isinstance(node.value, (int, float)):
-            val_type = 'number' # Generic type for numbers
-        elif isinstance(node.value, list) and not node.value:
-            return "List(elts=[])" # Specific representation for empty list constant
-        return f"Constant(value_type='{val_type}')"
-    elif isinstance(node, ast.Num): # For older Python (deprecated in 3.8)
-        return f"Constant(value_type='number')" # Map to new Constant representation
-    elif isinstance(node, ast.List):
-        if not node.elts: # Empty list literal e.g. x = []
-            return "List(elts=[])"
-        else: # List with elements, more complex to represent, TBD if needed for current POCs
-            return f"List(elts=[{', '.join([ast_node_to_repr_str(e) for e in node.elts])}])"
-    elif isinstance(node, ast.BinOp):
-        op_map = {
-            ast.Add: "Add", ast.Sub: "Sub", ast.Mult: "Mult", ast.Div: "Div",
-            ast.FloorDiv: "FloorDiv", ast.Mod: "Mod", ast.Pow: "Pow"
-        }
-        op_str = op_map.get(type(node.op), type(node.op).__name__)
-        left_repr = ast_node_to_repr_str(node.left)
-        right_repr = ast_node_to_repr_str(node.right)
-        return f"BinOp({left_repr}, {op_str}, {right_repr})"
-    elif isinstance(node, ast.Call):
-        func_repr = ast_node_to_repr_str(node.func)
-        args_repr = [ast_node_to_repr_str(arg) for arg in node.args]
-        keywords_repr_map = {kw.arg: ast_node_to_repr_str(kw.value) for kw in node.keywords}
-        # For cleaner output, only include keywords if present
-        keywords_str = f", keywords={keywords_repr_map}" if keywords_repr_map else ""
-        return f"Call(func={func_repr}, args=[{', '.join(args_repr)}]{keywords_str})"
-    else:
-        return f"UnsupportedASTNode({type(node).__name__})"
+BINOP_NAMES = {
+    ast.Add: "Add", ast.Sub: "Sub", ast.Mult: "Mult", ast.Div: "Div",
+    ast.FloorDiv: "FloorDiv", ast.Mod: "Mod", ast.Pow: "Pow"
+}
+
+def _get_constant_type(node):
+    if isinstance(node.value, (int, float)):
+        return 'number' # Generic type for numbers
+    elif isinstance(node.value, list) and not node.value:
+        return None # Rendered like an empty list literal
+    return type(node.value).__name__
+
+def _format_constant(node, parts, context):
+    value_type = _get_constant_type(node)
+    if value_type is None:
+        return "List(elts=[])"
+    return f"Constant(value_type='{value_type}')"
+
+def _format_binop(node, parts, context):
+    op_str = BINOP_NAMES.get(type(node.op), type(node.op).__name__)
+    return f"BinOp({parts[0]}, {op_str}, {parts[1]})"
+
+def _format_call(node, parts, context):
+    num_args = len(node.args)
+    keywords_repr_map = {kw.arg: part for kw, part in zip(node.keywords, parts[1 + num_args:])}
+    # For cleaner output, only include keywords if present
+    keywords_str = f", keywords={keywords_repr_map}" if keywords_repr_map else ""
+    return f"Call(func={parts[0]}, args=[{', '.join(parts[1:1 + num_args])}]{keywords_str})"
+
+# Structural repr used in Holoform operations, e.g.
+# "BinOp(Name(id='a'), Add, Constant(value_type='number'))".
+REPR_PROFILE = RenderProfile("repr", {
+    ast.Name: (None, lambda node, parts, context: f"Name(id='{node.id}')", lambda node: node.id),
+    ast.Constant: (None, _format_constant, _get_constant_type),
+    ast.List: (lambda node: node.elts, lambda node, parts, context: f"List(elts=[{', '.join(parts)}])", None),
+    ast.BinOp: (lambda node: (node.left, node.right), _format_binop, lambda node: type(node.op)),
+    ast.Call: (lambda node: (node.func, *node.args, *[kw.value for kw in node.keywords]), _format_call,
+               lambda node: (len(node.args), tuple(kw.arg for kw in node.keywords))),
+}, fallback=(None, lambda node, parts, context: f"UnsupportedASTNode({type(node).__name__})", None))
+
+# A cache callers can share to intern equal strings across a run. It is
+# opt-in: a node's key is built from its children's strings, so a hit still
+# walks the whole subtree and only saves memory, not time.
+REPR_CACHE = RenderCache()
+
+def ast_node_to_repr_str(node, cache=None, names=None):
+    """
+    Converts an AST expression node to a string representation of its structure.
+    If cache is a RenderCache, such as REPR_CACHE, equal sub-expressions share
+    one string. If names is a list, the ids of the Names in the expression are
+    appended to it while rendering.
+    """
+    return render_expression(node, REPR_PROFILE, cache=cache, names=names)
@@ -2,12 +2,40 @@
 import ast
 from . import constants as C
 from .ast_utils import ast_node_to_repr_str
+from .expression_renderer import collect_names
+from .operation_records import (
+    AssignmentOperation, AttributeAssignmentOperation, CallOperation, DefUse, ExceptHandler,
+    ForOperation, IfOperation, MatchCase, MatchOperation, ReturnOperation,
+    SubscriptAssignmentOperation, TryOperation, WhileOperation, WithItem, WithOperation,
+)
+
+# ast.Match only exists from Python 3.10 on.
+MATCH_NODES = (ast.Match,) if hasattr(ast, "Match") else ()
+CONTROL_FLOW_NODES = (ast.If, ast.While, ast.Try, ast.For, ast.AsyncFor, ast.With, ast.AsyncWith) + MATCH_NODES
+LOOP_SUBTYPES = {ast.For: "for", ast.AsyncFor: "async_for"}
+WITH_SUBTYPES = {ast.With: "with", ast.AsyncWith: "async_with"}
+# Nodes that can hold statements of the enclosing function.
+BLOCK_NODES = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, "match_case") else ())
+DEFINITION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
 
 class HoloformGeneratorVisitor(ast.NodeVisitor):
     def __init__(self, source_code_lines_list):
         self.source_lines = source_code_lines_list
         self.holoform_data = {}
         self.current_op_idx = 0
+        # Operation list of the block being visited, and how many
+        # control-flow statements enclose it within the current function.
+        self.operations = None
+        self.block_depth = 0
+        # Every Holoform generated so far, outer scopes before inner ones.
+        self.holoforms = []
+        # Qualified-name prefixes of the enclosing scopes, as in __qualname__.
+        self.scope_prefixes = []
+        # Per scope, the names of the functions and classes a function
+        # defines (None for a class, whose names calls cannot see), and the
+        # name of a method's self or cls parameter.
+        self.scope_names = []
+        self._saved_scopes = []
 
     def _get_step_id(self, op_type_prefix):
         step_id = f"s_{op_type_prefix}_{self.current_op_idx}"
@@ -19,112 +47,197 @@ class HoloformGeneratorVisitor(ast.NodeVisitor):
         return self.holoform_data
 
     def visit_FunctionDef(self, node):
-        self.holoform_data = {
+        qualname = self._get_qualname(node.name)
+        tags = list(C.DEFAULT_TAGS)
+        if isinstance(node, ast.AsyncFunctionDef):
+            tags.append(C.TAG_ASYNC)
+        self._enter_scope({
             "holoform_type": "function",
-            C.KEY_ID: f"{node.name}_auto_v1",
+            C.KEY_ID: f"{qualname}_auto_v1",
             C.KEY_PARENT_MODULE_ID: C.DEFAULT_PARENT_MODULE_ID,
             C.KEY_DESCRIPTION: ast.get_docstring(node, clean=False) or C.DEFAULT_DESCRIPTION,
-            C.KEY_TAGS: list(C.DEFAULT_TAGS),
+            C.KEY_TAGS: tags,
             C.KEY_INPUT_PARAMETERS: [arg.arg for arg in node.args.args],
             C.KEY_OPERATIONS: [],
             C.KEY_OUTPUT_VARIABLE_NAME: None
-        }
+        }, f"{qualname}.<locals>.", _get_local_definitions(node), self._get_self_name(node))
+        # Nested definitions met here get their own Holoform and do not
+        # end up in this function's operations.
         self.generic_visit(node)
+        self._exit_scope()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
 
     def visit_ClassDef(self, node):
-        self.holoform_data = {
+        qualname = self._get_qualname(node.name)
+        definitions = get_block_definitions(node.body)
+        self._enter_scope({
             "holoform_type": "class",
-            C.KEY_ID: f"{node.name}_auto_v1",
+            C.KEY_ID: f"{qualname}_auto_v1",
             C.KEY_PARENT_MODULE_ID: C.DEFAULT_PARENT_MODULE_ID,
             C.KEY_DESCRIPTION: ast.get_docstring(node, clean=False) or C.DEFAULT_DESCRIPTION,
             C.KEY_TAGS: list(C.DEFAULT_TAGS),
             "parent_classes": [ast_node_to_repr_str(base) for base in node.bases],
-            "methods": [f.name for f in node.body if isinstance(f, ast.FunctionDef)],
+            "methods": [f.name for f in definitions if isinstance(f, (ast.FunctionDef, ast.AsyncFunctionDef))],
             "class_attributes": [t.id for s in node.body if isinstance(s, ast.Assign) for t in s.targets if isinstance(t, ast.Name)]
-        }
-        # Don't visit children, we've handled them here
+        }, f"{qualname}.", None, None)
+        # The class body has no operations of its own; only visit the
+        # methods and nested classes defined in it, including those under
+        # if or try blocks.
+        for child in definitions:
+            self.visit(child)
+        self._exit_scope()
         return self.holoform_data
 
+    def _get_qualname(self, name):
+        return self.scope_prefixes[-1] + name if self.scope_prefixes else name
+
+    def _get_self_name(self, node):
+        """
+        Returns the first parameter of a function defined directly in a
+        class, through which its methods are called, or None.
+        """
+        parameters = getattr(node.args, "posonlyargs", []) + node.args.args
+        if self.scope_names and self.scope_names[-1][0] is None and parameters:
+            return parameters[0].arg
+        return None
+
+    def _enter_scope(self, holoform_data, prefix, local_names, self_name):
+        self._saved_scopes.append((self.holoform_data, self.current_op_idx, self.operations, self.block_depth))
+        self.holoform_data = holoform_data
+        self.current_op_idx = 0
+        self.operations = holoform_data.get(C.KEY_OPERATIONS)
+        self.block_depth = 0
+        self.holoforms.append(holoform_data)
+        self.scope_prefixes.append(prefix)
+        self.scope_names.append((local_names, self_name))
+
+    def _exit_scope(self):
+        self.scope_prefixes.pop()
+        self.scope_names.pop()
+        saved_data, saved_op_idx, saved_operations, saved_block_depth = self._saved_scopes.pop()
+        # A nested scope resumes its enclosing Holoform; the outermost one
+        # stays current so that visit() returns it.
+        if self.scope_prefixes:
+            self.holoform_data = saved_data
+            self.current_op_idx = saved_op_idx
+            self.operations = saved_operations
+            self.block_depth = saved_block_depth
+
     def visit_Expr(self, node):
         if isinstance(node.value, ast.Call):
-            self._handle_call(node, None)
+            uses = []
+            self._handle_call(node, None, uses)
+            self.operations[-1].def_use = DefUse([], uses)
 
     def visit_Assign(self, node):
+        operations = self.operations
+        num_operations = len(operations)
+        # Names read by the value, collected while it is rendered.
+        uses = []
         if len(node.targets) == 1:
             target = node.targets[0]
             if isinstance(target, ast.Name) and isinstance(node.value, ast.Call):
-                self._handle_call(node, target.id)
+                self._handle_call(node, target.id, uses)
             elif isinstance(target, ast.Name):
-                self._handle_simple_assign(node, target.id)
+                self._handle_simple_assign(node, target.id, uses)
             elif isinstance(target, ast.Attribute):
-                self._handle_attribute_assign(node)
+                self._handle_attribute_assign(node, uses)
             elif isinstance(target, ast.Subscript):
-                self._handle_subscript_assign(node)
+                self._handle_subscript_assign(node, uses)
 
-        for op in self.holoform_data[C.KEY_OPERATIONS]:
-            if op["step_id"] == self._get_step_id("assign") - 1:
-                op["def_use"] = self._get_def_use(node)
+        if len(operations) > num_operations:
+            defs = [target.id for target in node.targets if isinstance(target, ast.Name)]
+            operations[-1].def_use = DefUse(defs, uses)
 
     def visit_Return(self, node):
         if node.value:
-            self.holoform_data[C.KEY_OUTPUT_VARIABLE_NAME] = ast_node_to_repr_str(node.value)
+            uses = []
+            value = ast_node_to_repr_str(node.value, names=uses)
+            # Only returns outside control-flow blocks name the function's
+            # output, as when each block had a visitor of its own.
+            if self.block_depth == 0:
+                self.holoform_data[C.KEY_OUTPUT_VARIABLE_NAME] = value
 
-            operation = {
-                "step_id": self._get_step_id("return"),
-                "op_type": "return",
-                "value": ast_node_to_repr_str(node.value),
-                "def_use": self._get_def_use(node)
-            }
-            self.holoform_data[C.KEY_OPERATIONS].append(operation)
+            operation = ReturnOperation(
+                self._get_step_id("return"),
+                value,
+                DefUse([], uses)
+            )
+            self.operations.append(operation)
 
-    def _handle_call(self, node, assign_to_variable):
+    def _handle_call(self, node, assign_to_variable, uses=None):
         call_node = node.value
         func_name = self._get_name(call_node.func)
         op_type = "constructor_call" if func_name and func_name[0].isupper() else "function_call"
 
-        operation = {
-            "step_id": self._get_step_id(op_type),
-            "op_type": op_type,
-            "assign_to_variable": assign_to_variable,
-            "target_function_name": func_name,
-            "parameter_mapping": self._get_parameter_mapping(call_node)
-        }
+        # Render the callee before the arguments so uses stay in source order.
+        target_object = None
         if isinstance(call_node.func, ast.Attribute):
-            operation["target_object"] = ast_node_to_repr_str(call_node.func.value)
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
-
-    def _handle_simple_assign(self, node, assign_to_variable):
-        operation = {
-            "step_id": self._get_step_id("assign"),
-            "op_type": "assignment",
-            "assign_to_variable": assign_to_variable,
-            "value": ast_node_to_repr_str(node.value)
-        }
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
-
-    def _handle_attribute_assign(self, node):
+            target_object = ast_node_to_repr_str(call_node.func.value, names=uses)
+        elif uses is not None:
+            collect_names(call_node.func, uses)
+
+        operation = CallOperation(
+            self._get_step_id(op_type),
+            op_type,
+            assign_to_variable,
+            func_name,
+            self._get_parameter_mapping(call_node, uses)
+        )
+        if target_object is not None:
+            operation.target_object = target_object
+        callee_id = self._resolve_callee_id(call_node.func)
+        if callee_id is not None:
+            operation.callee_id = callee_id
+        self.operations.append(operation)
+
+    def _resolve_callee_id(self, func):
+        """
+        Returns the id of the Holoform a call reaches when that is not the
+        module-level function of its name: a definition in an enclosing
+        function (innermost first), or a method called on self or cls.
+        """
+        if isinstance(func, ast.Name):
+            for prefix, (local_names, _) in zip(reversed(self.scope_prefixes), reversed(self.scope_names)):
+                if local_names is not None and func.id in local_names:
+                    return f"{prefix}{func.id}_auto_v1"
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and self.scope_names:
+            self_name = self.scope_names[-1][1]
+            if self_name is not None and func.value.id == self_name:
+                return f"{self.scope_prefixes[-2]}{func.attr}_auto_v1"
+        return None
+
+    def _handle_simple_assign(self, node, assign_to_variable, uses):
+        operation = AssignmentOperation(
+            self._get_step_id("assign"),
+            assign_to_variable,
+            ast_node_to_repr_str(node.value, names=uses)
+        )
+        self.operations.append(operation)
+
+    def _handle_attribute_assign(self, node, uses):
+        # Python evaluates the value before the object it is stored on.
         target = node.targets[0]
-        operation = {
-            "step_id": self._get_step_id("attribute_assign"),
-            "op_type": "state_modification",
-            "subtype": "attribute_assignment",
-            "target_object": ast_node_to_repr_str(target.value),
-            "attribute": target.attr,
-            "value": ast_node_to_repr_str(node.value)
-        }
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
-
-    def _handle_subscript_assign(self, node):
+        value = ast_node_to_repr_str(node.value, names=uses)
+        operation = AttributeAssignmentOperation(
+            self._get_step_id("attribute_assign"),
+            ast_node_to_repr_str(target.value, names=uses),
+            target.attr,
+            value
+        )
+        self.operations.append(operation)
+
+    def _handle_subscript_assign(self, node, uses):
         target = node.targets[0]
-        operation = {
-            "step_id": self._get_step_id("subscript_assign"),
-            "op_type": "state_modification",
-            "subtype": "dict_key_assignment",
-            "target_dict": ast_node_to_repr_str(target.value),
-            "key": ast_node_to_repr_str(target.slice),
-            "value": ast_node_to_repr_str(node.value)
-        }
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
+        value = ast_node_to_repr_str(node.value, names=uses)
+        operation = SubscriptAssignmentOperation(
+            self._get_step_id("subscript_assign"),
+            ast_node_to_repr_str(target.value, names=uses),
+            ast_node_to_repr_str(target.slice, names=uses),
+            value
+        )
+        self.operations.append(operation)
 
     def _get_name(self, func_node):
         if isinstance(func_node, ast.Name):
@@ -133,87 +246,250 @@ class HoloformGeneratorVisitor(ast.NodeVisitor):
             return func_node.attr
         return None
 
-    def _get_parameter_mapping(self, call_node):
+    def _get_parameter_mapping(self, call_node, uses=None):
         mapping = {}
         for i, arg in enumerate(call_node.args):
-            mapping[f"arg{i}"] = ast_node_to_repr_str(arg)
+            mapping[f"arg{i}"] = ast_node_to_repr_str(arg, names=uses)
         for kw in call_node.keywords:
-            mapping[kw.arg] = ast_node_to_repr_str(kw.value)
+            mapping[kw.arg] = ast_node_to_repr_str(kw.value, names=uses)
         return mapping
 
-    def _get_def_use(self, node):
+    def visit_If(self, node):
+        self._visit_control_flow(node)
+
+    visit_While = visit_If
+    visit_Try = visit_If
+    visit_For = visit_If
+    visit_AsyncFor = visit_If
+    visit_With = visit_If
+    visit_AsyncWith = visit_If
+    visit_Match = visit_If
+
+    def _visit_control_flow(self, node):
+        """
+        Visits a control-flow statement and everything nested in it in one
+        loop over an explicit stack of blocks, so deep nesting neither
+        spawns a visitor per block nor recurses. Each block collects its
+        operations in its own list, with step ids numbered from 0; the
+        control-flow operation takes the enclosing block's next step id
+        once all of its blocks are done.
+        """
+        stack = []
+        self._push_control_flow(stack, node)
+        while stack:
+            statement = next(stack[-1].statements, None)
+            if statement is None:
+                self._finish_block(stack)
+            elif isinstance(statement, CONTROL_FLOW_NODES):
+                self._push_control_flow(stack, statement)
+            else:
+                self.visit(statement)
+
+    def _push_control_flow(self, stack, node):
+        if isinstance(node, ast.Try):
+            blocks = [node.body] + [handler.body for handler in node.handlers] + [node.finalbody]
+        elif isinstance(node, (ast.If, ast.For, ast.AsyncFor)):
+            blocks = [node.body, node.orelse]
+        elif isinstance(node, MATCH_NODES):
+            blocks = [case.body for case in node.cases]
+        else:
+            blocks = [node.body]
+        frame = _ControlFlowFrame(node, blocks, self.operations, self.current_op_idx)
+        stack.append(frame)
+        self.block_depth += 1
+        self._start_block(frame)
+
+    def _start_block(self, frame):
+        frame.statements = iter(frame.blocks[len(frame.block_operations)])
+        self.operations = []
+        self.current_op_idx = 0
+
+    def _finish_block(self, stack):
+        frame = stack[-1]
+        frame.block_operations.append(self.operations)
+        if len(frame.block_operations) < len(frame.blocks):
+            self._start_block(frame)
+            return
+
+        stack.pop()
+        self.block_depth -= 1
+        self.operations = frame.saved_operations
+        self.current_op_idx = frame.saved_op_idx
+        self.operations.append(self._build_control_flow(frame.node, frame.block_operations))
+
+    def _build_control_flow(self, node, block_operations):
+        if isinstance(node, (ast.If, ast.While)):
+            uses = []
+            test = ast_node_to_repr_str(node.test, names=uses)
+            if isinstance(node, ast.If):
+                operation = IfOperation(self._get_step_id("if"), test, block_operations[0], block_operations[1])
+            else:
+                operation = WhileOperation(self._get_step_id("while"), test, block_operations[0])
+            operation.def_use = DefUse([], uses)
+            return operation
+
+        loop_subtype = LOOP_SUBTYPES.get(type(node))
+        if loop_subtype is not None:
+            return self._build_loop(node, loop_subtype, block_operations)
+        with_subtype = WITH_SUBTYPES.get(type(node))
+        if with_subtype is not None:
+            return self._build_with(node, with_subtype, block_operations)
+        if isinstance(node, MATCH_NODES):
+            return self._build_match(node, block_operations)
+
+        handlers = []
+        for handler, handler_operations in zip(node.handlers, block_operations[1:-1]):
+            handlers.append(ExceptHandler(
+                ast_node_to_repr_str(handler.type) if handler.type else None,
+                handler.name,
+                handler_operations
+            ))
+        return TryOperation(
+            self._get_step_id("try"),
+            block_operations[0],
+            handlers,
+            block_operations[-1]
+        )
+
+    def _build_loop(self, node, subtype, block_operations):
+        uses = []
+        iterable = ast_node_to_repr_str(node.iter, names=uses)
+        target = node.target.id if isinstance(node.target, ast.Name) else _target_text(node.target)
+        operation = ForOperation(
+            self._get_step_id(subtype),
+            subtype,
+            target,
+            iterable,
+            block_operations[0],
+            block_operations[1]
+        )
+        operation.def_use = DefUse(_get_bound_names(node.target), uses)
+        return operation
+
+    def _build_with(self, node, subtype, block_operations):
+        items = []
         defs = []
         uses = []
+        for item in node.items:
+            target = item.optional_vars
+            if target is None:
+                optional_vars = None
+            elif isinstance(target, ast.Name):
+                optional_vars = target.id
+            else:
+                optional_vars = _target_text(target)
+            items.append(WithItem(ast_node_to_repr_str(item.context_expr, names=uses), optional_vars))
+            if target is not None:
+                defs.extend(_get_bound_names(target))
+        operation = WithOperation(self._get_step_id(subtype), subtype, items, block_operations[0])
+        operation.def_use = DefUse(defs, uses)
+        return operation
 
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    defs.append(target.id)
-            for value_node in ast.walk(node.value):
-                if isinstance(value_node, ast.Name):
-                    uses.append(value_node.id)
-        elif isinstance(node, ast.Return):
-            for value_node in ast.walk(node.value):
-                if isinstance(value_node, ast.Name):
-                    uses.append(value_node.id)
+    def _build_match(self, node, block_operations):
+        uses = []
+        subject = ast_node_to_repr_str(node.subject, names=uses)
+        cases = []
+        for case, case_operations in zip(node.cases, block_operations):
+            # Patterns are small and have no structural repr; they are kept
+            # as source text, walked once for captures and value lookups.
+            captures, case_uses = _get_pattern_names(case.pattern)
+            guard = None
+            if case.guard is not None:
+                guard = ast_node_to_repr_str(case.guard, names=case_uses)
+            match_case = MatchCase(ast.unparse(case.pattern), guard, case_operations)
+            match_case.def_use = DefUse(captures, case_uses)
+            cases.append(match_case)
+        operation = MatchOperation(self._get_step_id("match"), subject, cases)
+        operation.def_use = DefUse([], uses)
+        return operation
 
-        return {"defs": defs, "uses": uses}
+class _ControlFlowFrame:
+    """
+    A control-flow statement being visited: its blocks, the operations of
+    the blocks already finished, the statements left in the current one,
+    and the enclosing block's state to restore when it is done.
+    """
 
-    def visit_If(self, node):
-        test = ast_node_to_repr_str(node.test)
-        body_visitor = HoloformGeneratorVisitor(self.source_lines)
-        body = body_visitor.visit(node.body)
-
-        orelse_visitor = HoloformGeneratorVisitor(self.source_lines)
-        orelse = orelse_visitor.visit(node.orelse) if node.orelse else []
-
-        operation = {
-            "step_id": self._get_step_id("if"),
-            "op_type": "control_flow",
-            "subtype": "if",
-            "test": test,
-            "body": body["operations"],
-            "orelse": orelse["operations"] if orelse else []
-        }
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
-
-    def visit_While(self, node):
-        test = ast_node_to_repr_str(node.test)
-        body_visitor = HoloformGeneratorVisitor(self.source_lines)
-        body = body_visitor.visit(node.body)
-
-        operation = {
-            "step_id": self._get_step_id("while"),
-            "op_type": "control_flow",
-            "subtype": "while",
-            "test": test,
-            "body": body["operations"]
-        }
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
-
-    def visit_Try(self, node):
-        body_visitor = HoloformGeneratorVisitor(self.source_lines)
-        body = body_visitor.visit(node.body)
+    __slots__ = ("node", "blocks", "block_operations", "statements", "saved_operations", "saved_op_idx")
 
-        handlers = []
-        for handler in node.handlers:
-            handler_visitor = HoloformGeneratorVisitor(self.source_lines)
-            handler_body = handler_visitor.visit(handler.body)
-            handlers.append({
-                "type": ast_node_to_repr_str(handler.type) if handler.type else None,
-                "name": handler.name,
-                "body": handler_body["operations"]
-            })
-
-        finalbody_visitor = HoloformGeneratorVisitor(self.source_lines)
-        finalbody = finalbody_visitor.visit(node.finalbody) if node.finalbody else []
-
-        operation = {
-            "step_id": self._get_step_id("try"),
-            "op_type": "control_flow",
-            "subtype": "try",
-            "body": body["operations"],
-            "handlers": handlers,
-            "finalbody": finalbody["operations"] if finalbody else []
-        }
-        self.holoform_data[C.KEY_OPERATIONS].append(operation)
+    def __init__(self, node, blocks, saved_operations, saved_op_idx):
+        self.node = node
+        self.blocks = blocks
+        self.block_operations = []
+        self.statements = None
+        self.saved_operations = saved_operations
+        self.saved_op_idx = saved_op_idx
+
+def get_block_definitions(body):
+    """
+    Returns the function and class definitions of a module, class or
+    function body in source order, including those inside its if, try,
+    with, loop and match blocks but not inside nested definitions.
+    """
+    definitions = []
+    stack = list(reversed(body))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, DEFINITION_NODES):
+            definitions.append(child)
+            continue
+        blocks = [grandchild for grandchild in ast.iter_child_nodes(child) if isinstance(grandchild, BLOCK_NODES)]
+        stack.extend(reversed(blocks))
+    return definitions
+
+def _get_local_definitions(node):
+    """
+    Returns the names of the functions and classes defined in a function's
+    body, including inside its control-flow blocks.
+    """
+    return {child.name for child in get_block_definitions(node.body)}
+
+def _target_text(target):
+    """
+    Returns the source text of a loop or with target, e.g. "i, path" for a
+    tuple, without the parentheses ast.unparse adds around tuples.
+    """
+    if isinstance(target, ast.Tuple):
+        return ", ".join(ast.unparse(element) for element in target.elts)
+    return ast.unparse(target)
+
+def _get_bound_names(target):
+    """
+    Returns the variables an assignment target binds, looking through
+    tuples, lists and starred targets but not into attributes or items.
+    """
+    names = []
+    stack = [target]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Name):
+            names.append(node.id)
+        elif isinstance(node, (ast.Tuple, ast.List)):
+            stack.extend(reversed(node.elts))
+        elif isinstance(node, ast.Starred):
+            stack.append(node.value)
+    return names
+
+def _get_pattern_names(pattern):
+    """
+    Returns the names a match pattern captures and the names its value
+    patterns read, both in source order.
+    """
+    captures = []
+    uses = []
+    stack = [pattern]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            captures.append(node)
+            continue
+        if isinstance(node, ast.expr):
+            # Values and class names in the pattern are looked up, not bound.
+            collect_names(node, uses)
+            continue
+        # "**rest" and "... as name" bind after their sub-patterns.
+        name = node.rest if isinstance(node, ast.MatchMapping) else getattr(node, "name", None)
+        if name is not None:
+            stack.append(name)
+        stack.extend(reversed(list(ast.iter_child_nodes(node))))
+    return captures, uses
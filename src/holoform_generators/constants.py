@@ -1,9 +1,13 @@
 # AIResearchProject/src/holoform_generators/constants.py
 
+# Bump whenever generated Holoforms change shape, so cached results are regenerated
+GENERATOR_VERSION = 9
+
 # Default values for Holoform fields
 DEFAULT_PARENT_MODULE_ID = "Unknown_Module_AST_v1"
 DEFAULT_DESCRIPTION = "Auto-generated Holoform (default description)."
 DEFAULT_TAGS = ["ast_generated"]
+TAG_ASYNC = "async"
 
 # AST Node representation constants (optional, could be part of a config)
 # Example: How to represent unsupported nodes
@@ -0,0 +1,614 @@
+import copy
+import hashlib
+import itertools
+import json
+from collections import OrderedDict, deque
+from .operation_records import OperationRecord
+
+DEFAULT_CACHE_SIZE = 1024
+
+# Closes a list or mapping in _content_tokens, and marks unset record slots.
+_CLOSE = object()
+
+# Slot names of each operation record type, last first, for _content_tokens.
+_REVERSED_SLOTS = {}
+
+class BasicBlock:
+    """
+    A straight-line run of operations in a function's control-flow graph.
+
+    operations holds indexes into FunctionDataflow.operations; successors
+    and predecessors hold block indexes.
+    """
+
+    __slots__ = ("index", "operations", "successors", "predecessors")
+
+    def __init__(self, index):
+        self.index = index
+        self.operations = []
+        self.successors = []
+        self.predecessors = []
+
+class FunctionDataflow:
+    """
+    Reaching definitions and liveness for one function Holoform.
+
+    operations lists every operation of the function, nested ones included,
+    in the order they appear in the Holoform; a control-flow operation
+    stands for the evaluation of its test and precedes its blocks, and a
+    match case, listed before its body, for its pattern and guard. Blocks
+    0 and 1 are the empty entry and exit blocks of the CFG.
+
+    definitions lists the (operation index, variable) pairs the function
+    defines, grouped by variable, a parameter's with operation index None
+    first in its group. Both analyses
+    keep their sets as Python ints, one bit per definition (reach_in,
+    reach_out) or per variable in variables (live_in, live_out), indexed
+    by block.
+    """
+
+    def __init__(self, holoform):
+        builder = _CFGBuilder()
+        builder.build(holoform.get("operations", []))
+        self.holoform_id = holoform.get("id")
+        self.operations = builder.operations
+        self.blocks = builder.blocks
+        self.op_defs = builder.op_defs
+        self.op_uses = builder.op_uses
+        self.op_block = [None] * len(self.operations)
+        for block in self.blocks:
+            for index in block.operations:
+                self.op_block[index] = block.index
+
+        # Each variable's definitions get consecutive bits, the parameter
+        # first, so the definitions of one name reaching a point can be
+        # shifted out of a whole-function bitset into a small int.
+        parameters = holoform.get("input_parameters", [])
+        sites = {name: [None] for name in parameters}
+        for index, defs in enumerate(self.op_defs):
+            for name in defs:
+                sites.setdefault(name, []).append(index)
+        self.definitions = []
+        self.variable_first_bit = {}
+        self.variable_defs = {}
+        for name, indexes in sites.items():
+            self.variable_first_bit[name] = len(self.definitions)
+            self.variable_defs[name] = ((1 << len(indexes)) - 1) << len(self.definitions)
+            self.definitions.extend((index, name) for index in indexes)
+        self.parameter_bits = 0
+        next_bit = dict(self.variable_first_bit)
+        for name in parameters:
+            self.parameter_bits |= 1 << next_bit[name]
+            next_bit[name] += 1
+        self.op_def_bits = []
+        for defs in self.op_defs:
+            bits = []
+            for name in defs:
+                bits.append(next_bit[name])
+                next_bit[name] += 1
+            self.op_def_bits.append(bits)
+
+        self.variables = list(self.variable_defs)
+        self.variable_index = {name: i for i, name in enumerate(self.variables)}
+        for uses in self.op_uses:
+            for name in uses:
+                if name not in self.variable_index:
+                    self.variable_index[name] = len(self.variables)
+                    self.variables.append(name)
+
+        self.reach_in, self.reach_out = self._solve_reaching_definitions()
+        self.live_in, self.live_out = self._solve_liveness()
+        self._chains = None
+
+    def _for_holoform(self, holoform):
+        """
+        Returns a copy of this analysis for another Holoform with the same
+        content, sharing the solved sets but carrying that Holoform's own id
+        and operations.
+        """
+        result = copy.copy(self)
+        result.holoform_id = holoform.get("id")
+        result.operations = _flatten_operations(holoform.get("operations", []))
+        return result
+
+    def reaching_definitions(self, op_index, name=None):
+        """
+        Returns the definitions that reach an operation, before it runs,
+        or only those of one variable if name is given.
+        """
+        reaching = self._reaching_bits(op_index)
+        names = self.variable_defs if name is None else (name,)
+        definitions = [self.definitions[bit] for name in names
+                       for bit in self._variable_bits(name, reaching)]
+        definitions.sort(key=lambda definition: -1 if definition[0] is None else definition[0])
+        return definitions
+
+    def live_variables(self, op_index):
+        """
+        Returns the names of the variables live just before an operation.
+        """
+        block = self.blocks[self.op_block[op_index]]
+        live = self.live_out[block.index]
+        for index in reversed(block.operations):
+            live = self._live_before(index, live)
+            if index == op_index:
+                break
+        return sorted(self.variables[bit] for bit in _iter_bits(live))
+
+    def def_use_chains(self):
+        """
+        Maps each (operation index, variable) use to the operation indexes
+        of the definitions that can reach it, None standing for the
+        function's parameters. Uses no definition reaches (globals, free
+        variables, except-clause names, names read before assignment) map
+        to an empty list. The mapping is computed once and shared by every
+        caller of a cached result.
+        """
+        if self._chains is not None:
+            return self._chains
+        chains = {}
+        definitions = self.definitions
+        variable_defs = self.variable_defs
+        for block in self.blocks:
+            reaching = self.reach_in[block.index]
+            # Within a block a use is reached by the block's own last
+            # definition of the name, if any, else by what reaches the block.
+            local = {}
+            for index in block.operations:
+                for name in self.op_uses[index]:
+                    if name in local:
+                        chains[(index, name)] = [local[name]]
+                    else:
+                        chains[(index, name)] = [definitions[bit][0]
+                                                 for bit in self._variable_bits(name, reaching)]
+                for name in self.op_defs[index]:
+                    local[name] = index
+        self._chains = chains
+        return chains
+
+    def dead_definitions(self):
+        """
+        Returns the (operation index, variable) definitions whose value no
+        path reads before it is overwritten or the function returns.
+        """
+        dead = []
+        variable_index = self.variable_index
+        for block in self.blocks:
+            live = self.live_out[block.index]
+            block_dead = []
+            for index in reversed(block.operations):
+                for name in self.op_defs[index]:
+                    if not live >> variable_index[name] & 1:
+                        block_dead.append((index, name))
+                live = self._live_before(index, live)
+            dead.extend(reversed(block_dead))
+        dead.sort(key=lambda definition: definition[0])
+        return dead
+
+    def _variable_bits(self, name, bits):
+        """
+        Yields the bits of a name's definitions that are set in bits.
+        """
+        first_bit = self.variable_first_bit.get(name)
+        if first_bit is None:
+            return
+        for bit in _iter_bits((bits & self.variable_defs[name]) >> first_bit):
+            yield first_bit + bit
+
+    def _reaching_bits(self, op_index):
+        block = self.blocks[self.op_block[op_index]]
+        position = block.operations.index(op_index)
+        gen, kill = self._gen_kill(block.operations[:position])
+        return gen | (self.reach_in[block.index] & ~kill)
+
+    def _gen_kill(self, operations):
+        """
+        Returns the definitions a run of operations leaves live and the ones
+        it overwrites, touching each whole-function mask once per name.
+        """
+        last = {}
+        for index in operations:
+            for name, bit in zip(self.op_defs[index], self.op_def_bits[index]):
+                last[name] = bit
+        gen = kill = 0
+        for name, bit in last.items():
+            gen |= 1 << bit
+            kill |= self.variable_defs[name]
+        return gen, kill
+
+    def _live_before(self, index, live):
+        variable_index = self.variable_index
+        for name in self.op_defs[index]:
+            live &= ~(1 << variable_index[name])
+        for name in self.op_uses[index]:
+            live |= 1 << variable_index[name]
+        return live
+
+    def _solve_reaching_definitions(self):
+        blocks = self.blocks
+        gen = [0] * len(blocks)
+        kill = [0] * len(blocks)
+        for block in blocks:
+            gen[block.index], kill[block.index] = self._gen_kill(block.operations)
+        # The parameters are defined by the empty entry block.
+        gen[0] = self.parameter_bits
+
+        reach_in = [0] * len(blocks)
+        reach_out = list(gen)
+        order = _reverse_postorder(blocks)
+        worklist = deque(order)
+        queued = [False] * len(blocks)
+        for index in order:
+            queued[index] = True
+        while worklist:
+            index = worklist.popleft()
+            queued[index] = False
+            block = blocks[index]
+            incoming = 0
+            for predecessor in block.predecessors:
+                incoming |= reach_out[predecessor]
+            reach_in[index] = incoming
+            outgoing = gen[index] | (incoming & ~kill[index])
+            if outgoing != reach_out[index]:
+                reach_out[index] = outgoing
+                for successor in block.successors:
+                    if not queued[successor]:
+                        queued[successor] = True
+                        worklist.append(successor)
+        return reach_in, reach_out
+
+    def _solve_liveness(self):
+        blocks = self.blocks
+        variable_index = self.variable_index
+        use = [0] * len(blocks)
+        define = [0] * len(blocks)
+        for block in blocks:
+            block_use = block_def = 0
+            for index in block.operations:
+                for name in self.op_uses[index]:
+                    bit = 1 << variable_index[name]
+                    if not block_def & bit:
+                        block_use |= bit
+                for name in self.op_defs[index]:
+                    block_def |= 1 << variable_index[name]
+            use[block.index] = block_use
+            define[block.index] = block_def
+
+        live_in = list(use)
+        live_out = [0] * len(blocks)
+        order = _reverse_postorder(blocks)
+        order.reverse()
+        worklist = deque(order)
+        queued = [False] * len(blocks)
+        for index in order:
+            queued[index] = True
+        while worklist:
+            index = worklist.popleft()
+            queued[index] = False
+            block = blocks[index]
+            outgoing = 0
+            for successor in block.successors:
+                outgoing |= live_in[successor]
+            live_out[index] = outgoing
+            incoming = use[index] | (outgoing & ~define[index])
+            if incoming != live_in[index]:
+                live_in[index] = incoming
+                for predecessor in block.predecessors:
+                    if not queued[predecessor]:
+                        queued[predecessor] = True
+                        worklist.append(predecessor)
+        return live_in, live_out
+
+class DataflowCache:
+    """
+    Bounded LRU cache of FunctionDataflow results keyed by the content hash
+    of the Holoform they were computed from, so an unchanged function is
+    analysed once however often it is regenerated or reloaded. The hash
+    leaves out the Holoform's id, so a hit returns a copy that carries the
+    requesting Holoform's id and operations.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def get(self, holoform):
+        key = holoform_content_hash(holoform)
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return result._for_holoform(holoform)
+        self.misses += 1
+        result = FunctionDataflow(holoform)
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+ANALYSIS_CACHE = DataflowCache()
+
+def analyze_function(holoform, cache=ANALYSIS_CACHE):
+    """
+    Returns the FunctionDataflow of a function Holoform, from cache when a
+    Holoform with the same parameters and operations was analysed before.
+    Pass cache=None to always recompute.
+    """
+    if cache is None:
+        return FunctionDataflow(holoform)
+    return cache.get(holoform)
+
+def holoform_content_hash(holoform):
+    """
+    Returns a hash of everything the analyses read from a Holoform: its
+    parameters and the kind, fields and nesting of every operation.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(holoform.get("input_parameters", [])).encode("utf-8"))
+    digest.update("\0".join(_content_tokens(holoform.get("operations", []))).encode("utf-8"))
+    return digest.hexdigest()
+
+def _content_tokens(operations):
+    """
+    Returns an unambiguous token list for nested operations, built without
+    recursing: strings are quoted with repr, and lists and mappings are
+    bracketed. A record gives the same tokens as its to_dict() form, so a
+    Holoform loaded from the store hashes like a freshly generated one.
+    """
+    tokens = []
+    append = tokens.append
+    stack = [operations]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is str:
+            append(repr(value))
+        elif value is _CLOSE:
+            append("]")
+        elif kind is list:
+            append("[")
+            push(_CLOSE)
+            stack.extend(reversed(value))
+        elif kind is dict:
+            append("{")
+            push(_CLOSE)
+            for key, item in reversed(value.items()):
+                push(item)
+                push(key)
+        else:
+            slots = _REVERSED_SLOTS.get(kind)
+            if slots is None and isinstance(value, OperationRecord):
+                slots = _REVERSED_SLOTS[kind] = tuple(reversed(kind.__slots__))
+            if slots is None:
+                append(repr(value))
+                continue
+            append("{")
+            push(_CLOSE)
+            for key in slots:
+                item = getattr(value, key, _CLOSE)
+                if item is not _CLOSE:
+                    push(item)
+                    push(key)
+    return tokens
+
+def _flatten_operations(operations):
+    """
+    Returns nested operations in the order _CFGBuilder numbers them: each
+    operation before its blocks, a match case before its body, and a try
+    statement by its blocks only.
+    """
+    flat = []
+    stack = [iter(operations)]
+    while stack:
+        operation = next(stack[-1], _CLOSE)
+        if operation is _CLOSE:
+            stack.pop()
+            continue
+        subtype = operation.get("subtype") if operation.get("op_type") == "control_flow" else None
+        if subtype == "try":
+            blocks = [operation["body"], *[handler["body"] for handler in operation["handlers"]],
+                      operation["finalbody"]]
+        else:
+            flat.append(operation)
+            if subtype == "if":
+                blocks = [operation["body"], operation["orelse"]]
+            elif subtype in ("for", "async_for"):
+                blocks = [operation["loop_body_operations"], operation["orelse"]]
+            elif subtype in ("while", "with", "async_with"):
+                blocks = [operation["body"]]
+            elif subtype == "match":
+                blocks = [[case, *case["body"]] for case in operation["cases"]]
+            else:
+                continue
+        stack.append(itertools.chain.from_iterable(blocks))
+    return flat
+
+class _CFGBuilder:
+    """
+    Flattens nested operations into basic blocks.
+
+    Every operation that is not a control-flow statement falls through to
+    the next, except a return, which jumps to the exit block. An exception
+    may be raised before or after any operation of a try body, so except
+    handlers are entered from the block before the try and from every
+    block of its body, and each operation of a try body starts a block of
+    its own. A return inside a try goes straight to the exit, skipping
+    the finally block.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.operations = []
+        self.op_defs = []
+        self.op_uses = []
+        self.try_depth = 0
+
+    def build(self, operations):
+        entry = self._new_block()
+        self.exit = self._new_block()
+        end = self._build_sequence(operations, self._branch(entry))
+        if end is not None:
+            self._link(end, self.exit)
+
+    def _new_block(self):
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        return block
+
+    def _link(self, source, target):
+        source.successors.append(target.index)
+        target.predecessors.append(source.index)
+
+    def _branch(self, source):
+        block = self._new_block()
+        self._link(source, block)
+        return block
+
+    def _join(self, ends):
+        ends = [end for end in ends if end is not None]
+        if not ends:
+            return None
+        block = self._new_block()
+        for end in ends:
+            self._link(end, block)
+        return block
+
+    def _add(self, block, operation):
+        def_use = operation.get("def_use")
+        if def_use is not None:
+            defs = def_use["defs"]
+            uses = def_use["uses"]
+        else:
+            assign_to_variable = operation.get("assign_to_variable")
+            defs = (assign_to_variable,) if assign_to_variable else ()
+            uses = ()
+        block.operations.append(len(self.operations))
+        self.operations.append(operation)
+        self.op_defs.append(defs)
+        self.op_uses.append(uses)
+
+    def _build_sequence(self, operations, block):
+        """
+        Adds operations to the CFG starting in block and returns the block
+        control falls out of, or None if every path has returned.
+        """
+        for operation in operations:
+            if block is None:
+                # Unreachable code after a return.
+                block = self._new_block()
+            elif self.try_depth and block.operations:
+                # Ends the block so its handlers see the state after it.
+                block = self._branch(block)
+            subtype = operation.get("subtype") if operation.get("op_type") == "control_flow" else None
+            if subtype == "if":
+                self._add(block, operation)
+                block = self._join([
+                    self._build_sequence(operation["body"], self._branch(block)),
+                    self._build_sequence(operation["orelse"], self._branch(block)),
+                ])
+            elif subtype == "while":
+                header = self._branch(block)
+                self._add(header, operation)
+                body_end = self._build_sequence(operation["body"], self._branch(header))
+                if body_end is not None:
+                    self._link(body_end, header)
+                block = self._branch(header)
+            elif subtype in ("for", "async_for"):
+                # The header binds the loop variable on every iteration.
+                header = self._branch(block)
+                self._add(header, operation)
+                body_end = self._build_sequence(operation["loop_body_operations"], self._branch(header))
+                if body_end is not None:
+                    self._link(body_end, header)
+                block = self._build_sequence(operation["orelse"], self._branch(header))
+            elif subtype in ("with", "async_with"):
+                self._add(block, operation)
+                block = self._build_sequence(operation["body"], block)
+            elif subtype == "match":
+                block = self._build_match(operation, block)
+            elif subtype == "try":
+                block = self._build_try(operation, block)
+            else:
+                self._add(block, operation)
+                if operation.get("op_type") == "return":
+                    self._link(block, self.exit)
+                    block = None
+        return block
+
+    def _build_match(self, operation, block):
+        """
+        Tests the cases in order: each case's pattern and guard run in a
+        block of their own, which enters the case body or moves on to the
+        next case; after the last case control may fall out unmatched.
+        """
+        self._add(block, operation)
+        ends = []
+        for case in operation["cases"]:
+            block = self._branch(block)
+            self._add(block, case)
+            ends.append(self._build_sequence(case["body"], self._branch(block)))
+        ends.append(block)
+        return self._join(ends)
+
+    def _build_try(self, operation, block):
+        first_body_block = len(self.blocks)
+        self.try_depth += 1
+        body_end = self._build_sequence(operation["body"], self._branch(block))
+        self.try_depth -= 1
+        # The block before the try stands for an exception raised before
+        # any operation of the body has run.
+        body_blocks = [block] + self.blocks[first_body_block:]
+
+        ends = [body_end]
+        for handler in operation["handlers"]:
+            handler_entry = self._new_block()
+            for body_block in body_blocks:
+                self._link(body_block, handler_entry)
+            ends.append(self._build_sequence(handler["body"], handler_entry))
+
+        if not operation["finalbody"]:
+            return self._join(ends)
+        final_entry = self._join(ends)
+        if final_entry is None:
+            final_entry = self._new_block()
+        return self._build_sequence(operation["finalbody"], final_entry)
+
+def _iter_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+def _reverse_postorder(blocks):
+    """
+    Returns the block indexes in reverse postorder from the entry, then
+    the unreachable ones, without recursing.
+    """
+    visited = [False] * len(blocks)
+    postorder = []
+    stack = [(0, iter(blocks[0].successors))]
+    visited[0] = True
+    while stack:
+        index, successors = stack[-1]
+        for successor in successors:
+            if not visited[successor]:
+                visited[successor] = True
+                stack.append((successor, iter(blocks[successor].successors)))
+                break
+        else:
+            stack.pop()
+            postorder.append(index)
+    postorder.reverse()
+    postorder.extend(index for index, seen in enumerate(visited) if not seen)
+    return postorder
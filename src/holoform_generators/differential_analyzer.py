@@ -1,6 +1,38 @@
 import ast
 from typing import Optional, List, Dict, Any, Union
 
+try:
+    from .expression_renderer import RenderProfile, render_expression
+    from .parse_cache import parse_source
+except ImportError:  # Run as a script or imported from this directory
+    from expression_renderer import RenderProfile, render_expression
+    from parse_cache import parse_source
+
+BINOP_CHARS = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/'}
+COMPARE_CHARS = {ast.Lt: '<', ast.Gt: '>', ast.Eq: '==', ast.NotEq: '!='}
+
+# Canonical HoloChain expression syntax used by DifferentialAnalyzer.
+DIFFERENTIAL_PROFILE = RenderProfile("differential", {
+    ast.Name: (None, lambda node, parts, context: node.id, lambda node: node.id),
+    ast.Constant: (None, lambda node, parts, context: repr(node.value), lambda node: repr(node.value)),
+    ast.BinOp: (lambda node: (node.left, node.right),
+                lambda node, parts, context: f"{parts[0]} {BINOP_CHARS.get(type(node.op), '?')} {parts[1]}",
+                lambda node: type(node.op)),
+    ast.Compare: (lambda node: (node.left, node.comparators[0]),
+                  lambda node, parts, context: f"{parts[0]} {COMPARE_CHARS.get(type(node.ops[0]), '?')} {parts[1]}",
+                  lambda node: type(node.ops[0])),
+    # Only `not` is supported; other unary operators render as "expr".
+    ast.UnaryOp: (lambda node: (node.operand,) if isinstance(node.op, ast.Not) else (),
+                  lambda node, parts, context: f"!{parts[0]}" if isinstance(node.op, ast.Not) else "expr",
+                  lambda node: type(node.op)),
+    ast.Attribute: (lambda node: (node.value,), lambda node, parts, context: f"{parts[0]}.{node.attr}",
+                    lambda node: node.attr),
+    ast.Call: (lambda node: (node.func, *node.args), lambda node, parts, context: f"{parts[0]}({', '.join(parts[1:])})",
+               None),
+    ast.Subscript: (lambda node: (node.value, node.slice), lambda node, parts, context: f"{parts[0]}[{parts[1]}]",
+                    None),
+}, fallback=(None, lambda node, parts, context: "expr", None))
+
 class ImperativeBlockAnalyzer(ast.NodeVisitor):
     """A dedicated visitor to analyze a block of statements and find a 'Selection' pattern.
     This is the core of our pattern recognition engine for imperative code."""
@@ -181,42 +213,12 @@ class DifferentialAnalyzer:
     
     @staticmethod
     def _format_expression(node: ast.expr) -> str:
-        # This is a simplified helper and can be expanded from ast_utils.py
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Constant):
-            return repr(node.value)
-        elif isinstance(node, ast.BinOp):
-            left = DifferentialAnalyzer._format_expression(node.left)
-            op_char = {ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/'}.get(type(node.op), '?')
-            right = DifferentialAnalyzer._format_expression(node.right)
-            return f"{left} {op_char} {right}"
-        elif isinstance(node, ast.Compare):
-            left = DifferentialAnalyzer._format_expression(node.left)
-            op_char = {ast.Lt: '<', ast.Gt: '>', ast.Eq: '==', ast.NotEq: '!='}.get(type(node.ops[0]), '?')
-            right = DifferentialAnalyzer._format_expression(node.comparators[0])
-            return f"{left} {op_char} {right}"
-        elif isinstance(node, ast.UnaryOp):
-            if isinstance(node.op, ast.Not):
-                operand = DifferentialAnalyzer._format_expression(node.operand)
-                return f"!{operand}"
-        elif isinstance(node, ast.Attribute):
-            value = DifferentialAnalyzer._format_expression(node.value)
-            return f"{value}.{node.attr}"
-        elif isinstance(node, ast.Call):
-            func = DifferentialAnalyzer._format_expression(node.func)
-            args = [DifferentialAnalyzer._format_expression(arg) for arg in node.args]
-            return f"{func}({', '.join(args)})"
-        elif isinstance(node, ast.Subscript):
-            value = DifferentialAnalyzer._format_expression(node.value)
-            slice_val = DifferentialAnalyzer._format_expression(node.slice)
-            return f"{value}[{slice_val}]"
-        return "expr"
+        return render_expression(node, DIFFERENTIAL_PROFILE)
     
     def analyze_selection_pattern(self, code_block: str) -> str:
         """Analyzes a block of code to find a selection pattern."""
         try:
-            tree = ast.parse(code_block.strip())
+            tree = parse_source(code_block.strip())
             
             # Attempt to find the complex "Imperative Selection" pattern first
             block_visitor = ImperativeBlockAnalyzer()
@@ -258,7 +260,7 @@ class DifferentialAnalyzer:
     def analyze_state_modification(self, code_block: str) -> str:
         """Analyzes a block of code to find state modification patterns."""
         try:
-            tree = ast.parse(code_block.strip())
+            tree = parse_source(code_block.strip())
             
             # Use the state modification analyzer
             visitor = StateModificationAnalyzer()
@@ -302,7 +304,7 @@ class DifferentialAnalyzer:
     def analyze_resource_management(self, code_block: str) -> str:
         """Analyzes a block of code to find resource management patterns."""
         try:
-            tree = ast.parse(code_block.strip())
+            tree = parse_source(code_block.strip())
             
             # Use the resource management analyzer
             visitor = ResourceManagementAnalyzer()
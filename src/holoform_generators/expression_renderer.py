@@ -0,0 +1,231 @@
+import ast
+import sys
+
+DEFAULT_CACHE_SIZE = 65536
+
+class RenderProfile:
+    """
+    One output dialect of render_expression.
+
+    handlers maps an AST node type to a (get_children, format, get_fields)
+    triple. get_children(node) returns the child nodes to render first
+    (None in place of the function for leaves), and format(node, parts,
+    context) builds the node's string from the node and its children's
+    strings. Nodes of any other type are rendered with the fallback triple.
+
+    get_fields(node) returns the hashable fields of the node itself that
+    format reads (None in place of the function when it reads none); it is
+    only called when rendering through a RenderCache, and format must then
+    depend on nothing else but the children's strings.
+    """
+
+    def __init__(self, name, handlers, fallback):
+        self.name = name
+        self.handlers = handlers
+        self.fallback = fallback
+
+class RenderCache:
+    """
+    Bounded cache of rendered expressions, keyed by expression structure.
+
+    A key is the node type plus its own fields plus the (interned) strings
+    of its children, so structurally equal expressions from different
+    trees and files share one key and one interned string. hits, misses,
+    evictions and bytes_saved (the size of the strings a hit did not have
+    to build) are kept for the caller to inspect. A cache must only be
+    shared by renders of one profile that do not depend on a context.
+
+    Eviction approximates LRU with two generations: entries live in
+    "recent" until it holds half of maxsize, then the whole generation
+    becomes "older" and the previous older one is dropped. A hit in older
+    moves the entry back to recent. Hits in recent, the common case, cost
+    a single dict lookup.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.recent = {}
+        self.older = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def __len__(self):
+        return len(self.recent) + len(self.older)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def clear(self):
+        """
+        Drops all entries and resets the counters.
+        """
+        self.recent = {}
+        self.older = {}
+        self.hits = self.misses = self.evictions = self.bytes_saved = 0
+
+    def lookup(self, key, render):
+        """
+        Returns the string cached for key, or interns and caches render(key).
+        """
+        result = self.recent.get(key)
+        if result is None:
+            return self._lookup_slow(key, render)
+        self.hits += 1
+        self.bytes_saved += sys.getsizeof(result)
+        return result
+
+    def _lookup_slow(self, key, render):
+        result = self.older.pop(key, None)
+        if result is not None:
+            self.hits += 1
+            self.bytes_saved += sys.getsizeof(result)
+        else:
+            self.misses += 1
+            result = sys.intern(render(key))
+        if len(self.recent) >= max(self.maxsize // 2, 1):
+            self.evictions += len(self.older)
+            self.older = self.recent
+            self.recent = {}
+        self.recent[key] = result
+        return result
+
+# Levels rendered by plain recursion before a subtree is handed to the
+# explicit stack; well below the interpreter's default recursion limit.
+RECURSION_BUDGET = 64
+
+def render_expression(node, profile, context=None, cache=None, names=None):
+    """
+    Renders an expression tree in a profile's dialect.
+
+    Nodes are dispatched on their exact type through the profile's handler
+    table, children before their parent. context is passed to every format
+    function (e.g. the parser whose abbreviations apply); cache, if given,
+    memoizes each node's string by structure.
+
+    The first RECURSION_BUDGET levels are rendered recursively, which is
+    the fastest walk in CPython for the shallow expressions met in
+    practice; deeper subtrees are walked with an explicit stack of frames,
+    so arbitrarily deep expressions never hit the recursion limit.
+
+    If names is a list, the id of every Name in the tree is appended to it
+    in source order during the same walk; subtrees the profile renders
+    with its fallback are scanned with collect_names. This is complete
+    when every handler's children cover all expression children of its
+    node, as in ast_utils.REPR_PROFILE.
+    """
+    if cache is None and names is None:
+        return _render_plain(node, profile.handlers, profile.fallback, context, RECURSION_BUDGET)
+    return _render_recursive(node, profile.handlers, profile.fallback, context, cache, names, RECURSION_BUDGET)
+
+def _render_plain(node, handlers, fallback, context, budget):
+    # _render_recursive without a cache or names, the common case, with
+    # the per-node work kept to a table lookup and the two handler calls.
+    get_children, format_node, _ = handlers.get(type(node), fallback)
+    if get_children is None:
+        return format_node(node, (), context)
+    children = get_children(node)
+    if not budget:
+        return _render_iterative(node, handlers.get(type(node), fallback), children, handlers, fallback,
+                                 context, None, None)
+    budget -= 1
+    parts = []
+    for child in children:
+        parts.append(_render_plain(child, handlers, fallback, context, budget))
+    return format_node(node, parts, context)
+
+def _render_recursive(node, handlers, fallback, context, cache, names, budget):
+    handler = handlers.get(type(node), fallback)
+    children = handler[0](node) if handler[0] is not None else ()
+    if not children:
+        if names is not None:
+            _collect_leaf_names(node, handler is fallback, names)
+        if cache is None:
+            return handler[1](node, (), context)
+        return _render_cached(node, handler, (), context, cache)
+    if not budget:
+        return _render_iterative(node, handler, children, handlers, fallback, context, cache, names)
+
+    budget -= 1
+    parts = []
+    for child in children:
+        parts.append(_render_recursive(child, handlers, fallback, context, cache, names, budget))
+    if cache is None:
+        return handler[1](node, parts, context)
+    return _render_cached(node, handler, parts, context, cache)
+
+def _render_iterative(node, handler, children, handlers, fallback, context, cache, names):
+    # Each frame holds a node, its handler, its children and the strings
+    # of the children rendered so far; leaf children are rendered in place
+    # without a frame of their own.
+    stack = [(node, handler, children, [])]
+    while True:
+        node, handler, children, parts = stack[-1]
+        if len(parts) < len(children):
+            child = children[len(parts)]
+            child_handler = handlers.get(type(child), fallback)
+            grandchildren = child_handler[0](child) if child_handler[0] is not None else ()
+            if grandchildren:
+                stack.append((child, child_handler, grandchildren, []))
+                continue
+            if names is not None:
+                _collect_leaf_names(child, child_handler is fallback, names)
+            if cache is None:
+                parts.append(child_handler[1](child, (), context))
+            else:
+                parts.append(_render_cached(child, child_handler, (), context, cache))
+            continue
+
+        stack.pop()
+        if cache is None:
+            result = handler[1](node, parts, context)
+        else:
+            result = _render_cached(node, handler, parts, context, cache)
+        if not stack:
+            return result
+        stack[-1][3].append(result)
+
+def collect_names(node, names):
+    """
+    Appends the id of every Name in a tree to names, in source order.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if type(node) is ast.Name:
+            names.append(node.id)
+        else:
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+def _collect_leaf_names(node, is_fallback, names):
+    if type(node) is ast.Name:
+        names.append(node.id)
+    elif is_fallback:
+        collect_names(node, names)
+
+def _render_cached(node, handler, parts, context, cache):
+    """
+    Looks a node's string up by structure, formatting it on a miss.
+    """
+    key = (type(node), handler[2](node) if handler[2] is not None else None, tuple(parts))
+    # Inlined hit path of cache.lookup, which most nodes take.
+    result = cache.recent.get(key)
+    if result is None:
+        return cache._lookup_slow(key, lambda key: handler[1](node, parts, context))
+    cache.hits += 1
+    cache.bytes_saved += sys.getsizeof(result)
+    return result
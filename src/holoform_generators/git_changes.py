@@ -0,0 +1,31 @@
+import subprocess
+
+CHANGE_ADDED = "A"
+CHANGE_MODIFIED = "M"
+CHANGE_DELETED = "D"
+
+def get_changed_files(repo_path, base, head=None):
+    """
+    Returns the (status, path) changes between two commits of a local git
+    repository, or between base and the working tree if head is None, with
+    status "A", "M" or "D". Renames are a deletion plus an addition; any
+    other status (type change, unmerged) counts as a modification.
+
+    repo_path may be a subdirectory of the repository: only changes under
+    it are returned, with paths relative to it, as update_project expects.
+    """
+    command = ["git", "-C", repo_path, "diff", "--name-status", "--no-renames", "--relative", "-z", base]
+    if head is not None:
+        command.append(head)
+    command.append("--")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+
+    # With -z every entry is "<status>\0<path>\0" and paths are never quoted.
+    fields = output.split("\0")
+    changes = []
+    for status, path in zip(fields[0::2], fields[1::2]):
+        status = status[0]
+        if status not in (CHANGE_ADDED, CHANGE_DELETED):
+            status = CHANGE_MODIFIED
+        changes.append((status, path))
+    return changes
@@ -8,6 +8,36 @@ import ast
 import re
 from typing import List, Dict, Optional, Tuple
 
+try:
+    from .expression_renderer import RenderProfile, render_expression
+    from .parse_cache import parse_source
+except ImportError:  # Run as a script or imported from this directory
+    from expression_renderer import RenderProfile, render_expression
+    from parse_cache import parse_source
+
+BINOP_SYMBOLS = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/",
+    ast.Mod: "%", ast.Pow: "**"
+}
+
+def _format_constant(node, parts, parser) -> str:
+    if isinstance(node.value, str):
+        return f'"{node.value}"'
+    return str(node.value)
+
+# HoloChain expression syntax; the context is the HoloChainParser whose
+# abbreviations apply to names and attributes.
+HOLOCHAIN_PROFILE = RenderProfile("holochain", {
+    ast.Name: (None, lambda node, parts, parser: parser._abbreviate(node.id), None),
+    ast.Constant: (None, _format_constant, None),
+    ast.Subscript: (lambda node: (node.value, node.slice), lambda node, parts, parser: f"{parts[0]}[{parts[1]}]", None),
+    ast.Attribute: (lambda node: (node.value,),
+                    lambda node, parts, parser: f"{parts[0]}.{parser._abbreviate(node.attr)}", None),
+    ast.BinOp: (lambda node: (node.left, node.right),
+                lambda node, parts, parser: f"{parts[0]}{BINOP_SYMBOLS.get(type(node.op), '+')}{parts[1]}", None),
+    ast.Call: (lambda node: (node.func, *node.args), lambda node, parts, parser: f"{parts[0]}({','.join(parts[1:])})", None),
+}, fallback=(None, lambda node, parts, parser: "expr", None))
+
 class HoloChainParser:
     """Parser that converts Python AST into HoloChain v0 symbolic representation."""
     
@@ -40,7 +70,7 @@ class HoloChainParser:
     def parse_code(self, code: str, filename: str = "code.py") -> str:
         """Parse Python code and return HoloChain representation."""
         try:
-            tree = ast.parse(code)
+            tree = parse_source(code, filename)
             self.records = []
             
             for node in tree.body:
@@ -207,43 +237,7 @@ class HoloChainParser:
     
     def _format_expression(self, node: ast.expr) -> str:
         """Format an expression into HoloChain syntax."""
-        if isinstance(node, ast.Name):
-            return self._abbreviate(node.id)
-        
-        elif isinstance(node, ast.Constant):
-            value = node.value
-        elif hasattr(ast, 'Num') and isinstance(node, ast.Num):  # Python < 3.8 compatibility
-            value = node.n
-            if isinstance(value, str):
-                return f'"{value}"' if value else '""'
-            return str(value)
-        
-        elif isinstance(node, ast.Subscript):
-            obj = self._format_expression(node.value)
-            key = self._format_expression(node.slice)
-            return f"{obj}[{key}]"
-        
-        elif isinstance(node, ast.Attribute):
-            obj = self._format_expression(node.value)
-            attr = self._abbreviate(node.attr)
-            return f"{obj}.{attr}"
-        
-        elif isinstance(node, ast.BinOp):
-            left = self._format_expression(node.left)
-            right = self._format_expression(node.right)
-            op_map = {
-                ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/",
-                ast.Mod: "%", ast.Pow: "**"
-            }
-            op = op_map.get(type(node.op), "+")
-            return f"{left}{op}{right}"
-        
-        elif isinstance(node, ast.Call):
-            func = self._format_expression(node.func)
-            args = [self._format_expression(arg) for arg in node.args]
-            return f"{func}({','.join(args)})"
-        
-        return "expr"
+        return render_expression(node, HOLOCHAIN_PROFILE, context=self)
     
     def _is_selection_pattern(self, body: List[ast.stmt]) -> bool:
         """Check if body contains a selection pattern (append/add to collection)."""
@@ -0,0 +1,639 @@
+import json
+import mmap
+import struct
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from .symbol_table import (
+    RECORD_TYPES, RECORD_TYPE_INDEX, SymbolTable, TAG_BITS,
+    TAG_DICT, TAG_FALSE, TAG_INT, TAG_LIST, TAG_NONE, TAG_RECORD, TAG_STR, TAG_TRUE,
+)
+
+# File layout, all integers little-endian:
+#
+#   header       MAGIC, FORMAT_VERSION as uint32
+#   records      one encoded value per Holoform, back to back
+#   string data  the UTF-8 bytes of every string, back to back
+#   string index uint64 start offsets of each string, plus the end of the last
+#   id index     (id string id uint32, record offset uint64) sorted by id
+#   schema       JSON [[record type name, [slot names]], ...] of the record
+#                types, in the order their indexes in record tokens refer to
+#   footer       FOOTER: string data offset, string index offset, string
+#                count, id index offset, id count, schema offset, MAGIC
+#
+# A value is a varint token, payload << TAG_BITS | tag, with the tags and
+# payloads of symbol_table (a string's payload is its string id). A list or
+# dict token is followed by the varint byte length of its items, and a
+# record token by the varint bitmask of its set slots and then the byte
+# length, so a reader can skip any value without decoding it. Record type
+# indexes and slot bits refer to the file's own schema, which a reader maps
+# to the current record classes by name.
+MAGIC = b"HLF1"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sI")
+FOOTER = struct.Struct("<QQQQQQ4s")
+STRING_OFFSET = struct.Struct("<Q")
+INDEX_ENTRY = struct.Struct("<IQ")
+
+# The set slot names of a record of the current schema, by (record type
+# index, slot bitmask).
+_RECORD_NAMES = {}
+RECORD_SCHEMA = [[record_type.__name__, list(record_type.__slots__)] for record_type in RECORD_TYPES]
+_RECORD_TYPES_BY_NAME = {record_type.__name__: record_type for record_type in RECORD_TYPES}
+
+class HoloformFileWriter:
+    """
+    Writes Holoforms to a binary Holoform file one at a time.
+
+    Each Holoform is encoded and written as soon as it is given, so only
+    the string table and the id index are held until close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.table = SymbolTable()
+        self.index = []
+        self.offset = self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, holoform):
+        holoform_id = holoform.get("id")
+        if holoform_id is not None:
+            self.index.append((holoform_id, self.table.intern(holoform_id), self.offset))
+        self.offset += self.file.write(encode_value(holoform, self.table))
+
+    def close(self):
+        """
+        Writes the string table, the id index and the footer, and closes
+        the file.
+        """
+        if self.file.closed:
+            return
+        strings_offset = self.offset
+        string_offsets = bytearray()
+        position = strings_offset
+        for string in self.table.strings:
+            string_offsets += STRING_OFFSET.pack(position)
+            position += self.file.write(string.encode("utf-8", "surrogatepass"))
+        string_offsets += STRING_OFFSET.pack(position)
+        string_index_offset = position
+        position += self.file.write(string_offsets)
+
+        # Like HoloformStore.get_holoform, an id that occurs more than once
+        # finds the first Holoform written with it.
+        self.index.sort()
+        entries = [entry for ordinal, entry in enumerate(self.index)
+                   if ordinal == 0 or entry[0] != self.index[ordinal - 1][0]]
+        index_offset = position
+        schema_offset = index_offset + self.file.write(
+            b"".join(INDEX_ENTRY.pack(string_id, offset) for _, string_id, offset in entries))
+        self.file.write(json.dumps(RECORD_SCHEMA).encode("utf-8"))
+        self.file.write(FOOTER.pack(strings_offset, string_index_offset, len(self.table),
+                                    index_offset, len(entries), schema_offset, MAGIC))
+        self.file.close()
+
+def write_holoform_file(path, holoforms):
+    """
+    Writes an iterable of Holoforms to a binary Holoform file and returns
+    how many were written.
+    """
+    count = 0
+    with HoloformFileWriter(path) as writer:
+        for holoform in holoforms:
+            writer.write(holoform)
+            count += 1
+    return count
+
+class HoloformFile(Mapping):
+    """
+    Read-only access to a binary Holoform file by id, through mmap.
+
+    Opening reads only the header and footer. Looking up a Holoform binary
+    searches the id index and decodes that one record, resolving only the
+    strings it uses, so the cost does not depend on the size of the file.
+    Decoded Holoforms have the same lists, dicts and operation records as
+    the ones written. Iterating gives the ids in sorted order.
+
+    view() and iter_views() give lazy HoloformViews instead, for readers
+    that need only a few fields of many Holoforms. All reads go through
+    one memoryview of the mapping, so no view may be used after close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if (len(self.buffer) < HEADER.size + FOOTER.size
+                or HEADER.unpack_from(self.buffer, 0) != (MAGIC, FORMAT_VERSION)):
+            self.buffer.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} Holoform file")
+        (self.strings_offset, self.string_index_offset, string_count,
+         self.index_offset, self.id_count, schema_offset, _) = FOOTER.unpack_from(self.buffer, len(self.buffer) - FOOTER.size)
+        self.strings = [None] * string_count
+        try:
+            self.record_schema = _load_schema(self.buffer[schema_offset:len(self.buffer) - FOOTER.size])
+        except ValueError as e:
+            self.buffer.close()
+            raise ValueError(f"{path}: {e}") from None
+        self._record_names = {}
+        self.memory = memoryview(self.buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.memory.release()
+        self.buffer.close()
+
+    def __len__(self):
+        return self.id_count
+
+    def __iter__(self):
+        for position in range(self.id_count):
+            yield self.string(INDEX_ENTRY.unpack_from(self.buffer, self.index_offset + position * INDEX_ENTRY.size)[0])
+
+    def __contains__(self, holoform_id):
+        return self.record_offset(holoform_id) is not None
+
+    def __getitem__(self, holoform_id):
+        offset = self.record_offset(holoform_id)
+        if offset is None:
+            raise KeyError(holoform_id)
+        return decode_value(self.memory, offset, self.string, self.record_names)[0]
+
+    def view(self, holoform_id):
+        """
+        Returns a lazy HoloformView of the Holoform with an id.
+        """
+        offset = self.record_offset(holoform_id)
+        if offset is None:
+            raise KeyError(holoform_id)
+        return _view_value(self, offset)[0]
+
+    def iter_views(self):
+        """
+        Yields a HoloformView of every Holoform in the order they were
+        written, skipping over each one without decoding it.
+        """
+        offset = HEADER.size
+        while offset < self.strings_offset:
+            view, offset = _view_value(self, offset)
+            yield view
+
+    def string(self, string_id):
+        """
+        Returns a string of the string table, decoding it on first use.
+        """
+        string = self.strings[string_id]
+        if string is None:
+            start, end = struct.unpack_from("<QQ", self.buffer, self.string_index_offset + string_id * STRING_OFFSET.size)
+            string = self.strings[string_id] = str(self.memory[start:end], "utf-8", "surrogatepass")
+        return string
+
+    def record_names(self, type_index, mask):
+        """
+        Returns the record class and the set slot names of a record token
+        of this file, by the file's schema.
+        """
+        names = self._record_names.get((type_index, mask))
+        if names is None:
+            record_type, slots = self.record_schema[type_index]
+            names = self._record_names[type_index, mask] = (
+                record_type, tuple(name for index, name in enumerate(slots) if mask >> index & 1))
+        return names
+
+    def record_offset(self, holoform_id):
+        """
+        Returns the file offset of the record of a Holoform id, or None.
+        """
+        entries = _IndexIds(self)
+        position = bisect_left(entries, holoform_id)
+        if position < self.id_count and entries[position] == holoform_id:
+            return INDEX_ENTRY.unpack_from(self.buffer, self.index_offset + position * INDEX_ENTRY.size)[1]
+        return None
+
+    def iter_holoforms(self):
+        """
+        Yields every Holoform in the order they were written, ids or not.
+        """
+        offset = HEADER.size
+        while offset < self.strings_offset:
+            holoform, offset = decode_value(self.memory, offset, self.string, self.record_names)
+            yield holoform
+
+class _IndexIds:
+    """
+    The sorted ids of a HoloformFile's index as a sequence for bisect.
+    """
+
+    __slots__ = ("holoform_file",)
+
+    def __init__(self, holoform_file):
+        self.holoform_file = holoform_file
+
+    def __len__(self):
+        return self.holoform_file.id_count
+
+    def __getitem__(self, position):
+        holoform_file = self.holoform_file
+        string_id = INDEX_ENTRY.unpack_from(holoform_file.buffer, holoform_file.index_offset + position * INDEX_ENTRY.size)[0]
+        return holoform_file.string(string_id)
+
+class HoloformView(Mapping):
+    """
+    A read-only view of a dict of a HoloformFile, a whole Holoform or a
+    nested one such as a parameter_mapping, decoded on access.
+
+    Looking up a key walks the encoded keys, jumping over the values of the
+    others by their byte length. Nested dicts, lists and operation records
+    come back as views of their own, and only strings, numbers and None
+    become Python objects, so what a reader never touches is never built.
+    Keys can also be read as attributes, e.g. view.id. decode() returns the
+    plain value.
+    """
+
+    __slots__ = ("holoform_file", "offset", "items_offset", "count")
+
+    def __init__(self, holoform_file, offset, items_offset, count):
+        self.holoform_file = holoform_file
+        self.offset = offset
+        self.items_offset = items_offset
+        self.count = count
+
+    def __getitem__(self, key):
+        position = self._find(key)
+        if position is None:
+            raise KeyError(key)
+        return _view_value(self.holoform_file, position)[0]
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def _find(self, key):
+        """
+        Returns the position of the value of key, or None.
+        """
+        holoform_file = self.holoform_file
+        memory = holoform_file.memory
+        strings = holoform_file.strings
+        position = self.items_offset
+        for _ in range(self.count):
+            start = position
+            token, position = read_varint(memory, position)
+            if token & 7 == TAG_STR:
+                string = strings[token >> TAG_BITS]
+                if string is None:
+                    string = holoform_file.string(token >> TAG_BITS)
+                if string == key:
+                    return position
+            else:
+                # Other keys, e.g. the None key of a **kwargs argument.
+                other, position = decode_value(memory, start, holoform_file.string, holoform_file.record_names)
+                if other == key:
+                    return position
+            position = skip_value(memory, position)
+        return None
+
+    def __getattr__(self, name):
+        return _get_field(self, name)
+
+    def __iter__(self):
+        memory = self.holoform_file.memory
+        position = self.items_offset
+        for _ in range(self.count):
+            key, position = _view_value(self.holoform_file, position)
+            position = skip_value(memory, position)
+            yield key
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"HoloformView({self.holoform_file.path!r}, offset={self.offset})"
+
+    def decode(self):
+        return decode_value(self.holoform_file.memory, self.offset, self.holoform_file.string,
+                            self.holoform_file.record_names)[0]
+
+class OperationView(Mapping):
+    """
+    A read-only view of an operation record of a HoloformFile, decoded on
+    access like a HoloformView. Fields read as keys or attributes, as on
+    the record itself: op["op_type"] or op.target_function_name.
+    """
+
+    __slots__ = ("holoform_file", "offset", "items_offset", "record_type", "names")
+
+    def __init__(self, holoform_file, offset, items_offset, record_type, names):
+        self.holoform_file = holoform_file
+        self.offset = offset
+        self.items_offset = items_offset
+        self.record_type = record_type
+        self.names = names
+
+    def __getitem__(self, key):
+        try:
+            index = self.names.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        memory = self.holoform_file.memory
+        position = self.items_offset
+        for _ in range(index):
+            position = skip_value(memory, position)
+        return _view_value(self.holoform_file, position)[0]
+
+    def __getattr__(self, name):
+        return _get_field(self, name)
+
+    def __contains__(self, key):
+        return key in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"OperationView({self.record_type.__name__}, offset={self.offset})"
+
+    def decode(self):
+        return decode_value(self.holoform_file.memory, self.offset, self.holoform_file.string,
+                            self.holoform_file.record_names)[0]
+
+class ListView(Sequence):
+    """
+    A read-only view of a list of a HoloformFile, decoded on access like a
+    HoloformView. The item offsets are found on the first indexed access.
+    """
+
+    __slots__ = ("holoform_file", "offset", "items_offset", "count", "item_offsets")
+
+    def __init__(self, holoform_file, offset, items_offset, count):
+        self.holoform_file = holoform_file
+        self.offset = offset
+        self.items_offset = items_offset
+        self.count = count
+        self.item_offsets = None
+
+    def __getitem__(self, index):
+        if self.item_offsets is None:
+            memory = self.holoform_file.memory
+            item_offsets = []
+            position = self.items_offset
+            for _ in range(self.count):
+                item_offsets.append(position)
+                position = skip_value(memory, position)
+            self.item_offsets = item_offsets
+        if isinstance(index, slice):
+            return [_view_value(self.holoform_file, position)[0] for position in self.item_offsets[index]]
+        return _view_value(self.holoform_file, self.item_offsets[index])[0]
+
+    def __iter__(self):
+        position = self.items_offset
+        for _ in range(self.count):
+            item, position = _view_value(self.holoform_file, position)
+            yield item
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        if isinstance(other, (list, ListView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ListView({self.holoform_file.path!r}, offset={self.offset}, {self.count} items)"
+
+    def decode(self):
+        return decode_value(self.holoform_file.memory, self.offset, self.holoform_file.string,
+                            self.holoform_file.record_names)[0]
+
+def _get_field(view, name):
+    if name.startswith("__") or name in type(view).__slots__:
+        raise AttributeError(name)
+    try:
+        return view[name]
+    except KeyError:
+        raise AttributeError(f"{type(view).__name__} has no field {name!r}") from None
+
+def _view_value(holoform_file, position):
+    """
+    Returns a view of the container at position, or the decoded value of
+    anything else, with the position after it.
+    """
+    memory = holoform_file.memory
+    token, items_offset = read_varint(memory, position)
+    tag = token & 7
+    if tag == TAG_LIST or tag == TAG_DICT:
+        length, items_offset = read_varint(memory, items_offset)
+        view_type = ListView if tag == TAG_LIST else HoloformView
+        return view_type(holoform_file, position, items_offset, token >> TAG_BITS), items_offset + length
+    if tag == TAG_RECORD:
+        mask, items_offset = read_varint(memory, items_offset)
+        length, items_offset = read_varint(memory, items_offset)
+        record_type, names = holoform_file.record_names(token >> TAG_BITS, mask)
+        return OperationView(holoform_file, position, items_offset, record_type, names), items_offset + length
+    return decode_value(memory, position, holoform_file.string, holoform_file.record_names)
+
+def encode_value(value, table):
+    """
+    Returns the bytes of a value, interning its strings in table. Nested
+    containers are encoded on an explicit stack and prefixed with their
+    byte length when they are complete.
+    """
+    root = bytearray()
+    # Each frame is [items, next item, output, token bytes of the container].
+    stack = [[(value,), 0, root, None]]
+    while True:
+        frame = stack[-1]
+        items, position, output, head = frame
+        if position == len(items):
+            stack.pop()
+            if not stack:
+                return bytes(root)
+            parent_output = stack[-1][2]
+            parent_output += head
+            _append_varint(parent_output, len(output))
+            parent_output += output
+            continue
+        frame[1] = position + 1
+        value = items[position]
+        kind = type(value)
+        if kind is str:
+            _append_varint(output, table.intern(value) << TAG_BITS | TAG_STR)
+        elif value is None:
+            output.append(TAG_NONE)
+        elif kind is list:
+            stack.append([value, 0, bytearray(), _varint(len(value) << TAG_BITS | TAG_LIST)])
+        elif kind is bool:
+            output.append(TAG_TRUE if value else TAG_FALSE)
+        elif kind is int and value >= 0:
+            _append_varint(output, value << TAG_BITS | TAG_INT)
+        elif kind in RECORD_TYPE_INDEX:
+            mask = 0
+            values = []
+            for index, name in enumerate(kind.__slots__):
+                item = getattr(value, name, _UNSET)
+                if item is not _UNSET:
+                    mask |= 1 << index
+                    values.append(item)
+            head = _varint(RECORD_TYPE_INDEX[kind] << TAG_BITS | TAG_RECORD)
+            _append_varint(head, mask)
+            stack.append([values, 0, bytearray(), head])
+        elif isinstance(value, Mapping):
+            pairs = [item for pair in value.items() for item in pair]
+            stack.append([pairs, 0, bytearray(), _varint(len(value) << TAG_BITS | TAG_DICT)])
+        else:
+            raise TypeError(f"Cannot encode {kind.__name__} values in a Holoform file")
+
+def decode_value(buffer, position, string, record_names=None):
+    """
+    Decodes the value at position of buffer, resolving string ids with the
+    string function, and returns it with the position after it. Record
+    tokens are resolved with record_names (see HoloformFile.record_names),
+    by default against the current record classes.
+    """
+    if record_names is None:
+        record_names = _record_names
+    # Each frame is [tag, record type or None, slot names, remaining, items].
+    stack = []
+    while True:
+        token = buffer[position]
+        if token < 0x80:
+            position += 1
+        else:
+            token, position = read_varint(buffer, position)
+        tag = token & 7
+        payload = token >> TAG_BITS
+        if tag == TAG_STR:
+            value = string(payload)
+        elif tag == TAG_NONE:
+            value = None
+        elif tag == TAG_LIST or tag == TAG_DICT:
+            position = _skip_varint(buffer, position)
+            remaining = payload if tag == TAG_LIST else 2 * payload
+            if remaining:
+                stack.append([tag, None, None, remaining, []])
+                continue
+            value = [] if tag == TAG_LIST else {}
+        elif tag == TAG_RECORD:
+            mask, position = read_varint(buffer, position)
+            position = _skip_varint(buffer, position)
+            record_type, names = record_names(payload, mask)
+            if names:
+                stack.append([tag, record_type, names, len(names), []])
+                continue
+            value = record_type.__new__(record_type)
+        elif tag == TAG_INT:
+            value = payload
+        else:
+            value = tag == TAG_TRUE
+
+        while stack:
+            frame = stack[-1]
+            frame[4].append(value)
+            frame[3] -= 1
+            if frame[3]:
+                break
+            stack.pop()
+            value = _build(frame)
+        else:
+            return value, position
+
+def skip_value(buffer, position):
+    """
+    Returns the position after the value at position, without decoding it.
+    """
+    token = buffer[position]
+    if token < 0x80:
+        position += 1
+    else:
+        token, position = read_varint(buffer, position)
+    tag = token & 7
+    if tag == TAG_LIST or tag == TAG_DICT or tag == TAG_RECORD:
+        if tag == TAG_RECORD:
+            position = _skip_varint(buffer, position)
+        length, position = read_varint(buffer, position)
+        position += length
+    return position
+
+def read_varint(buffer, position):
+    """
+    Reads an unsigned LEB128 varint and returns it with the position after it.
+    """
+    byte = buffer[position]
+    if byte < 0x80:
+        return byte, position + 1
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        position += 1
+        byte = buffer[position]
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position + 1
+        shift += 7
+
+def _record_names(type_index, mask):
+    names = _RECORD_NAMES.get((type_index, mask))
+    if names is None:
+        record_type = RECORD_TYPES[type_index]
+        names = _RECORD_NAMES[type_index, mask] = (
+            record_type, tuple(name for index, name in enumerate(record_type.__slots__) if mask >> index & 1))
+    return names
+
+def _load_schema(data):
+    """
+    Returns (record class, slot names) per record type index of a file
+    schema. A type or slot the current classes no longer have would decode
+    wrongly, so it is an error; new slots are simply never set.
+    """
+    schema = []
+    for name, slots in json.loads(bytes(data)):
+        record_type = _RECORD_TYPES_BY_NAME.get(name)
+        if record_type is None:
+            raise ValueError(f"unknown record type {name}")
+        missing = [slot for slot in slots if slot not in record_type.__slots__]
+        if missing:
+            raise ValueError(f"record type {name} has no slots {', '.join(missing)}")
+        schema.append((record_type, tuple(slots)))
+    return schema
+
+def _skip_varint(buffer, position):
+    while buffer[position] >= 0x80:
+        position += 1
+    return position + 1
+
+def _varint(value):
+    output = bytearray()
+    _append_varint(output, value)
+    return output
+
+def _append_varint(output, value):
+    while value > 0x7F:
+        output.append(value & 0x7F | 0x80)
+        value >>= 7
+    output.append(value)
+
+def _build(frame):
+    kind, record_type, names, _, items = frame
+    if kind == TAG_LIST:
+        return items
+    if kind == TAG_DICT:
+        return dict(zip(items[::2], items[1::2]))
+    record = record_type.__new__(record_type)
+    for name, item in zip(names, items):
+        setattr(record, name, item)
+    return record
+
+_UNSET = object()
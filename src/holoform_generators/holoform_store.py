@@ -0,0 +1,178 @@
+import json
+import sqlite3
+from .operation_records import to_json_value
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    mtime_ns INTEGER,
+    size INTEGER,
+    inode INTEGER,
+    generator_version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS holoforms (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    id TEXT,
+    holoform_type TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (path, ordinal)
+);
+CREATE INDEX IF NOT EXISTS idx_holoforms_id ON holoforms(id);
+CREATE TABLE IF NOT EXISTS call_edges (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    holoform_ordinal INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    caller_id TEXT NOT NULL,
+    callee_id TEXT NOT NULL,
+    PRIMARY KEY (path, holoform_ordinal, ordinal)
+);
+CREATE INDEX IF NOT EXISTS idx_call_edges_caller ON call_edges(caller_id);
+CREATE INDEX IF NOT EXISTS idx_call_edges_callee ON call_edges(callee_id);
+"""
+
+class HoloformStore:
+    """
+    Embedded SQLite store for per-file Holoforms and call edges.
+
+    The database runs in WAL mode so concurrent readers never block a writer,
+    and every file is replaced in its own transaction, so a crashed or
+    concurrent run can never leave a half-written file behind.
+    """
+
+    def __init__(self, db_path, timeout=30.0):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=timeout)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_file(self, path):
+        """
+        Returns the stored hash, stat and generator version of a file, or None.
+        """
+        row = self.conn.execute(
+            "SELECT hash, mtime_ns, size, inode, generator_version FROM files WHERE path = ?",
+            (path,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "hash": row[0],
+            "stat": [row[1], row[2], row[3]],
+            "generator_version": row[4],
+        }
+
+    def upsert_file(self, path, file_hash, file_stat, generator_version, holoforms, call_edges):
+        """
+        Atomically replaces everything stored for one file.
+
+        call_edges is a list of (holoform_ordinal, caller_id, callee_id) tuples,
+        in call order.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self.conn.execute(
+                "INSERT INTO files (path, hash, mtime_ns, size, inode, generator_version) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, file_hash, *file_stat, generator_version),
+            )
+            self.conn.executemany(
+                "INSERT INTO holoforms (path, ordinal, id, holoform_type, data) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (path, ordinal, holoform.get("id"), holoform.get("holoform_type"), json.dumps(holoform, default=to_json_value))
+                    for ordinal, holoform in enumerate(holoforms)
+                ),
+            )
+            self.conn.executemany(
+                "INSERT INTO call_edges (path, holoform_ordinal, ordinal, caller_id, callee_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (path, holoform_ordinal, ordinal, caller_id, callee_id)
+                    for ordinal, (holoform_ordinal, caller_id, callee_id) in enumerate(call_edges)
+                ),
+            )
+
+    def update_file_stat(self, path, file_stat):
+        """
+        Records new stat fields for a file whose content did not change.
+        """
+        with self.conn:
+            self.conn.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, inode = ? WHERE path = ?",
+                (*file_stat, path),
+            )
+
+    def delete_files(self, paths):
+        """
+        Removes files together with their Holoforms and call edges.
+        """
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in paths))
+
+    def iter_paths(self):
+        """
+        Yields every stored file path.
+        """
+        for (path,) in self.conn.execute("SELECT path FROM files ORDER BY path"):
+            yield path
+
+    def get_file_holoforms(self, path):
+        """
+        Returns the Holoforms of one file in generation order.
+        """
+        rows = self.conn.execute(
+            "SELECT data FROM holoforms WHERE path = ? ORDER BY ordinal", (path,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_holoforms(self):
+        """
+        Yields all stored Holoforms one at a time, ordered by path.
+        """
+        for (data,) in self.conn.execute("SELECT data FROM holoforms ORDER BY path, ordinal"):
+            yield json.loads(data)
+
+    def get_holoform(self, holoform_id):
+        """
+        Returns the first Holoform with the given id, using the id index.
+        """
+        row = self.conn.execute(
+            "SELECT data FROM holoforms WHERE id = ? ORDER BY path, ordinal LIMIT 1", (holoform_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_function_callees(self):
+        """
+        Yields (caller_id, callee_id) for every function Holoform in path
+        order. callee_id is None for functions that make no calls.
+        """
+        rows = self.conn.execute(
+            "SELECT h.id, e.callee_id FROM holoforms h "
+            "LEFT JOIN call_edges e ON e.path = h.path AND e.holoform_ordinal = h.ordinal "
+            "WHERE h.holoform_type = 'function' "
+            "ORDER BY h.path, h.ordinal, e.ordinal"
+        )
+        yield from rows
+
+    def get_callers(self, callee_id):
+        """
+        Returns the ids of all Holoforms that call callee_id, using the callee index.
+        """
+        rows = self.conn.execute(
+            "SELECT caller_id FROM call_edges WHERE callee_id = ? ORDER BY path, holoform_ordinal",
+            (callee_id,),
+        )
+        return list(dict.fromkeys(caller_id for (caller_id,) in rows))
@@ -0,0 +1,154 @@
+import os
+import re
+
+# Directories that never hold project source worth a Holoform. Generic
+# names like build/ are anchored to the project root, since a package of
+# that name deeper in the tree (e.g. src/myapp/build/) is often real source.
+DEFAULT_IGNORE_PATTERNS = [
+    ".git/", ".hg/", ".svn/",
+    "__pycache__/", ".mypy_cache/", ".pytest_cache/", ".ruff_cache/",
+    ".venv/", "venv/", ".tox/", ".nox/", "site-packages/",
+    "node_modules/",
+    "/build/", "/dist/", "*.egg-info/",
+    "/vendor/", "_vendor/",
+]
+
+GITIGNORE_FILE = ".gitignore"
+
+class IgnoreRules:
+    """
+    gitignore-style path rules, evaluated on "/"-separated paths relative to
+    the project root.
+
+    Supports comments, "!" negation, trailing "/" for directory-only rules,
+    patterns anchored by a leading or inner "/", and the *, ?, [...] and **
+    wildcards. As in git, the last matching rule wins, and a file inside an
+    ignored directory cannot be re-included because the walker never
+    descends into that directory.
+    """
+
+    def __init__(self, patterns=(), use_defaults=True):
+        self.rules = []
+        if use_defaults:
+            self.add_patterns(DEFAULT_IGNORE_PATTERNS)
+        self.add_patterns(patterns)
+
+    @classmethod
+    def from_project(cls, project_path, patterns=(), use_defaults=True):
+        """
+        Builds the rules for a project: the defaults, then the project's
+        top-level .gitignore if any, then the given patterns.
+        """
+        rules = cls(use_defaults=use_defaults)
+        gitignore_path = os.path.join(project_path, GITIGNORE_FILE)
+        if os.path.isfile(gitignore_path):
+            with open(gitignore_path, 'r') as f:
+                rules.add_patterns(f.read().splitlines())
+        rules.add_patterns(patterns)
+        return rules
+
+    def add_patterns(self, patterns):
+        for pattern in patterns:
+            rule = _compile_pattern(pattern)
+            if rule is not None:
+                self.rules.append(rule)
+
+    def is_ignored(self, relpath, is_dir=False):
+        ignored = False
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relpath):
+                ignored = not negate
+        return ignored
+
+    def is_ignored_path(self, relpath):
+        """
+        Checks a file path and each of its parent directories, giving the
+        same answer as walking down to the file with pruning.
+        """
+        parts = relpath.split("/")
+        for depth in range(1, len(parts)):
+            if self.is_ignored("/".join(parts[:depth]), is_dir=True):
+                return True
+        return self.is_ignored(relpath)
+
+class WalkStats:
+    """
+    Counts what the project walker scanned and skipped during one run.
+
+    Files inside pruned directories are never listed, so they are counted
+    only as part of skipped_dirs.
+    """
+
+    def __init__(self):
+        self.scanned_files = 0
+        self.skipped_dirs = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+
+    def report(self):
+        return (f"Scanned {self.scanned_files} files; skipped {self.skipped_dirs} directories "
+                f"and {self.skipped_files} files ({self.skipped_bytes} bytes)")
+
+def _compile_pattern(pattern):
+    """
+    Turns one gitignore line into a (regex, negate, dir_only) rule, or None
+    for blank lines and comments.
+    """
+    pattern = pattern.rstrip()
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    elif pattern.startswith("\\"):
+        pattern = pattern[1:]
+
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+
+    regex = _translate(pattern)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return re.compile(f"^{regex}$"), negate, dir_only
+
+def _translate(pattern):
+    """
+    Translates gitignore wildcards into a regex over "/"-separated paths.
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
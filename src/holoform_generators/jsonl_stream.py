@@ -0,0 +1,255 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import struct
+import zlib
+from .holoform_store import HoloformStore
+from .operation_records import to_json_value
+
+# Compressed streams are written in independently compressed frames of about
+# this many bytes of JSON, so seeking to a line decompresses one frame.
+FRAME_SIZE = 64 * 1024
+
+INDEX_SUFFIX = ".idx"
+# One entry per line: the file offset of its frame and its offset within
+# the uncompressed frame. For uncompressed files a line is its own frame.
+INDEX_ENTRY = struct.Struct("<QI")
+
+# Suffix -> (compress, open a reader on a file object positioned at a frame,
+# new decompressor for a single frame). Every frame is a complete gzip
+# member, bz2 stream or xz stream, so whole files stay readable by zcat,
+# bzcat and xzcat.
+COMPRESSIONS = {
+    ".gz": (gzip.compress, lambda raw: gzip.GzipFile(fileobj=raw, mode="rb"),
+            lambda: zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)),
+    ".bz2": (bz2.compress, bz2.BZ2File, bz2.BZ2Decompressor),
+    ".xz": (lzma.compress, lzma.LZMAFile, lzma.LZMADecompressor),
+}
+
+class JsonlWriter:
+    """
+    Writes JSON Lines, one JSON value per line, e.g. Holoforms, call edges
+    or HoloChain records, and a sidecar line-offset index next to them.
+
+    A path ending in .gz, .bz2 or .xz is compressed in frames. With
+    append=True, lines are added to an existing file and index, the index
+    being rebuilt first if the file has none; frames written before are
+    never rewritten. Lines are durable, and visible to
+    readers, once their frame is written: at flush(), close(), or whenever
+    FRAME_SIZE bytes of a compressed frame have accumulated.
+    """
+
+    def __init__(self, path, append=False, frame_size=FRAME_SIZE):
+        self.path = path
+        self.compress = COMPRESSIONS[_suffix(path)][0] if _suffix(path) else None
+        self.frame_size = frame_size
+        mode = "ab" if append else "wb"
+        if append and os.path.exists(path) and not os.path.exists(path + INDEX_SUFFIX):
+            # The new entries must follow those of the lines already there.
+            rebuild_index(path)
+        self.file = open(path, mode)
+        self.index_file = open(path + INDEX_SUFFIX, mode)
+        self.offset = self.file.seek(0, os.SEEK_END)
+        self.frame = bytearray()
+        self.frame_lines = []
+        self.count = self.index_file.seek(0, os.SEEK_END) // INDEX_ENTRY.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, value):
+        line = json.dumps(value, default=to_json_value, separators=(",", ":")).encode("utf-8") + b"\n"
+        self.count += 1
+        if self.compress is None:
+            self.file.write(line)
+            self.index_file.write(INDEX_ENTRY.pack(self.offset, 0))
+            self.offset += len(line)
+            return
+        self.frame_lines.append(len(self.frame))
+        self.frame += line
+        if len(self.frame) >= self.frame_size:
+            self._write_frame()
+
+    def write_all(self, values):
+        for value in values:
+            self.write(value)
+
+    def flush(self):
+        if self.compress is not None:
+            self._write_frame()
+        self.file.flush()
+        self.index_file.flush()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        self.index_file.close()
+
+    def _write_frame(self):
+        if not self.frame_lines:
+            return
+        # The frame goes to disk before the index entries pointing into it.
+        frame_offset = self.offset
+        self.offset += self.file.write(self.compress(bytes(self.frame)))
+        self.index_file.write(b"".join(INDEX_ENTRY.pack(frame_offset, line_offset)
+                                       for line_offset in self.frame_lines))
+        self.frame = bytearray()
+        self.frame_lines = []
+
+class JsonlReader:
+    """
+    Reads a JSON Lines file written by JsonlWriter, as a whole or from any
+    line on, through its sidecar index.
+
+    len() and indexing use the index, which is built by scanning the file
+    if it is missing (e.g. for files written by other tools). Iterating
+    streams the file without the index.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.new_decompressor = COMPRESSIONS[_suffix(path)][2] if _suffix(path) else None
+        if not os.path.exists(path + INDEX_SUFFIX):
+            rebuild_index(path)
+        with open(path + INDEX_SUFFIX, "rb") as f:
+            self.index = f.read()
+
+    def __len__(self):
+        return len(self.index) // INDEX_ENTRY.size
+
+    def __iter__(self):
+        return read_jsonl(self.path)
+
+    def __getitem__(self, line_number):
+        if line_number < 0:
+            line_number += len(self)
+        if not 0 <= line_number < len(self):
+            raise IndexError(line_number)
+        return next(self.iter_from(line_number))
+
+    def iter_from(self, line_number):
+        """
+        Yields the values from a line number to the last indexed line.
+        Reading starts at the frame holding the line, decompressing one
+        frame at a time.
+        """
+        remaining = len(self) - line_number
+        if remaining <= 0:
+            return
+        frame_offset, line_offset = INDEX_ENTRY.unpack_from(self.index, line_number * INDEX_ENTRY.size)
+        with open(self.path, "rb") as raw:
+            raw.seek(frame_offset)
+            while remaining:
+                if self.new_decompressor is None:
+                    lines = raw
+                else:
+                    frame = _read_frame(raw, self.new_decompressor())
+                    if frame is None:
+                        return
+                    lines = io.BytesIO(frame)
+                    lines.seek(line_offset)
+                    line_offset = 0
+                for line in lines:
+                    yield json.loads(line)
+                    remaining -= 1
+                    if not remaining:
+                        return
+                if lines is raw:
+                    return
+
+def write_jsonl(path, values, append=False):
+    """
+    Writes an iterable of values to a JSON Lines file and returns how many
+    lines the file holds afterwards.
+    """
+    with JsonlWriter(path, append=append) as writer:
+        writer.write_all(values)
+    return writer.count
+
+def read_jsonl(path):
+    """
+    Yields the values of a JSON Lines file, compressed or not, one at a time.
+    """
+    with open(path, "rb") as raw:
+        lines = COMPRESSIONS[_suffix(path)][1](raw) if _suffix(path) else raw
+        for line in lines:
+            yield json.loads(line)
+
+def rebuild_index(path):
+    """
+    Writes the sidecar index of a JSON Lines file by scanning it. Each
+    frame of a compressed file starts where the previous one's compressed
+    data ended; a truncated last frame, from an interrupted writer, is
+    left out.
+    """
+    entries = bytearray()
+    with open(path, "rb") as raw:
+        if not _suffix(path):
+            offset = 0
+            for line in raw:
+                entries += INDEX_ENTRY.pack(offset, 0)
+                offset += len(line)
+        else:
+            new_decompressor = COMPRESSIONS[_suffix(path)][2]
+            while True:
+                frame_offset = raw.tell()
+                frame = _read_frame(raw, new_decompressor())
+                if frame is None:
+                    break
+                line_offset = 0
+                for line in io.BytesIO(frame):
+                    entries += INDEX_ENTRY.pack(frame_offset, line_offset)
+                    line_offset += len(line)
+    with open(path + INDEX_SUFFIX, "wb") as f:
+        f.write(entries)
+
+def call_edge_records(call_graph):
+    """
+    Yields {"caller_id", "callee_id"} records for the edges of a call graph,
+    or of a HoloformStore's indexed call edges.
+    """
+    if isinstance(call_graph, HoloformStore):
+        for caller_id, callee_id in call_graph.iter_function_callees():
+            if callee_id is not None:
+                yield {"caller_id": caller_id, "callee_id": callee_id}
+        return
+    for caller_id, callees in call_graph.items():
+        for callee_id in callees:
+            yield {"caller_id": caller_id, "callee_id": callee_id}
+
+def holochain_records(parser, filename="code.py"):
+    """
+    Yields {"filename", "record"} records for the HoloChain records of a
+    HoloChainParser after parse_code.
+    """
+    for record in parser.records:
+        yield {"filename": filename, "record": record}
+
+def _suffix(path):
+    suffix = os.path.splitext(path)[1]
+    return suffix if suffix in COMPRESSIONS else None
+
+def _read_frame(raw, decompressor):
+    """
+    Decompresses the frame at the position of raw, leaving raw just after
+    it. Returns None at the end of the file or of the complete frames.
+    """
+    start = raw.tell()
+    chunks = []
+    consumed = 0
+    while not decompressor.eof:
+        chunk = raw.read(FRAME_SIZE)
+        if not chunk:
+            return None
+        chunks.append(decompressor.decompress(chunk))
+        consumed += len(chunk)
+    raw.seek(start + consumed - len(decompressor.unused_data))
+    return b"".join(chunks)
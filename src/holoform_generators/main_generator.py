@@ -1,7 +1,9 @@
 # AIResearchProject/src/holoform_generators/main_generator.py
 import ast
 import json
-from .ast_visitor import HoloformGeneratorVisitor # Import local visitor
+from .ast_visitor import HoloformGeneratorVisitor, get_block_definitions # Import local visitor
+from .parse_cache import parse_source
+from . import constants as C
 
 def generate_holoform_from_code_string(code_str, target_name=None):
     """ 
@@ -9,7 +11,7 @@ def generate_holoform_from_code_string(code_str, target_name=None):
     for a specific function or class, or the first one found.
     """
     try:
-        parsed_ast = ast.parse(code_str)
+        parsed_ast = parse_source(code_str)
     except SyntaxError as e:
         print(f"ERROR parsing code string: {e}")
         return None
@@ -17,8 +19,26 @@ def generate_holoform_from_code_string(code_str, target_name=None):
     source_lines = code_str.splitlines()
     
     visitor = HoloformGeneratorVisitor(source_lines)
-    for node in parsed_ast.body:
-        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-            if target_name is None or node.name == target_name:
-                return visitor.visit(node)
+    for node in get_block_definitions(parsed_ast.body):
+        if target_name is None or node.name == target_name:
+            return visitor.visit(node)
+    if target_name is not None:
+        # Methods and nested functions are looked up by qualified name,
+        # e.g. "Class.method" or "outer.<locals>.inner".
+        for holoform in generate_holoforms_from_tree(parsed_ast, source_lines):
+            if holoform[C.KEY_ID] == f"{target_name}_auto_v1":
+                return holoform
     return None
+
+def generate_holoforms_from_tree(parsed_ast, source_lines):
+    """
+    Generates Holoforms for every function, method, nested function and
+    class of an already parsed module in a single walk of the tree.
+    Outer definitions come before the ones nested in them. Definitions
+    under module-level if or try blocks, e.g. an ImportError fallback,
+    are included.
+    """
+    visitor = HoloformGeneratorVisitor(source_lines)
+    for node in get_block_definitions(parsed_ast.body):
+        visitor.visit(node)
+    return visitor.holoforms
@@ -1,11 +1,12 @@
 import json
+from .operation_records import to_json_value
 
 def calculate_semantic_compression_ratio(source_code, holoform):
     """
     Calculates the Semantic Compression Ratio (SCR) of a Holoform.
     """
     source_tokens = len(source_code.split())
-    holoform_tokens = len(json.dumps(holoform).split())
+    holoform_tokens = len(json.dumps(holoform, default=to_json_value).split())
 
     if source_tokens == 0:
         return 0
@@ -0,0 +1,286 @@
+import json
+import os
+import sys
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import and_, eq
+from .symbol_table import SymbolTable
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; columns are plain arrays without it
+    numpy = None
+
+# Dictionary-encoded columns: each row holds a code into the column's own
+# dictionary, in which code 0 always stands for a missing value (None).
+DICTIONARY_COLUMNS = ("holoform", "op_type", "subtype", "target_function_name", "assign_to_variable")
+
+# Numeric columns and their array typecodes. parent is the row of the
+# enclosing operation, or -1 for a top-level one; num_args is the size of
+# parameter_mapping; num_children counts the directly nested operations.
+NUMERIC_COLUMNS = (
+    ("parent", "q"), ("depth", "H"), ("num_args", "H"), ("num_defs", "H"), ("num_uses", "H"),
+    ("num_children", "I"),
+)
+
+# Keys of the operation lists nested in an operation, and of the clauses
+# (match cases, except handlers) whose bodies are nested in it.
+NESTED_OPERATION_KEYS = ("body", "loop_body_operations", "orelse", "finalbody")
+NESTED_CLAUSE_KEYS = ("cases", "handlers")
+
+MANIFEST_FILE = "columns.json"
+
+class OperationColumns:
+    """
+    Every operation of a set of Holoforms, nested ones included, as typed
+    columns with one row per operation in preorder.
+
+    String fields are dictionary-encoded into array("I") codes, so a
+    column of a million rows is 4 MB and grouping by it compares ints.
+    column() returns NumPy arrays sharing the columns' memory when NumPy
+    is installed (and use_numpy is not False), and the arrays themselves
+    otherwise. The aggregations, value_counts(), sum() and mean(), run as
+    whole-column operations either way: NumPy's bincount, or Counter and
+    zip passes over the arrays, without a Python loop per row.
+    """
+
+    def __init__(self, holoforms=(), use_numpy=None):
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self.codes = {name: array("I") for name in DICTIONARY_COLUMNS}
+        self.dictionaries = {name: _new_dictionary() for name in DICTIONARY_COLUMNS}
+        self.numbers = {name: array(typecode) for name, typecode in NUMERIC_COLUMNS}
+        self.extend(holoforms)
+
+    def __len__(self):
+        return len(self.numbers["parent"])
+
+    @property
+    def names(self):
+        return DICTIONARY_COLUMNS + tuple(name for name, _ in NUMERIC_COLUMNS)
+
+    def extend(self, holoforms):
+        """
+        Appends the operations of Holoforms as rows.
+        """
+        codes = self.codes
+        interns = {name: self.dictionaries[name].intern for name in DICTIONARY_COLUMNS}
+        parents = self.numbers["parent"]
+        depths = self.numbers["depth"]
+        num_args = self.numbers["num_args"]
+        num_defs = self.numbers["num_defs"]
+        num_uses = self.numbers["num_uses"]
+        num_children = self.numbers["num_children"]
+        for holoform in holoforms:
+            holoform_code = interns["holoform"](holoform.get("id"))
+            # Each entry is (operation, parent row, depth), in preorder.
+            stack = [(operation, -1, 0) for operation in reversed(holoform.get("operations", []))]
+            while stack:
+                operation, parent, depth = stack.pop()
+                row = len(parents)
+                codes["holoform"].append(holoform_code)
+                for name in DICTIONARY_COLUMNS[1:]:
+                    codes[name].append(interns[name](operation.get(name)))
+                parents.append(parent)
+                depths.append(depth)
+                num_args.append(len(operation.get("parameter_mapping") or ()))
+                def_use = operation.get("def_use")
+                num_defs.append(len(def_use["defs"]) if def_use is not None else 0)
+                num_uses.append(len(def_use["uses"]) if def_use is not None else 0)
+                num_children.append(0)
+                if parent >= 0:
+                    num_children[parent] += 1
+
+                nested = []
+                for key in NESTED_OPERATION_KEYS:
+                    nested.extend(operation.get(key) or ())
+                for key in NESTED_CLAUSE_KEYS:
+                    for clause in operation.get(key) or ():
+                        nested.extend(clause.get("body") or ())
+                stack.extend((child, row, depth + 1) for child in reversed(nested))
+
+    def column(self, name):
+        """
+        Returns a column: the codes of a dictionary-encoded one, or the
+        numbers of a numeric one, as a NumPy array when NumPy is used.
+        """
+        values = self.codes[name] if name in self.codes else self.numbers[name]
+        if self.use_numpy:
+            return numpy.frombuffer(values, dtype=values.typecode)
+        return values
+
+    def strings(self, name):
+        """
+        Returns the values of a dictionary-encoded column, decoded.
+        """
+        dictionary = self.dictionaries[name].strings
+        return [dictionary[code] for code in self.codes[name]]
+
+    def value_counts(self, name, where=None):
+        """
+        Returns {value: number of rows} for a column, most frequent first,
+        over the rows matching where (see _mask).
+        """
+        mask = self._mask(where)
+        if name in self.codes:
+            dictionary = self.dictionaries[name].strings
+            if self.use_numpy:
+                codes = self.column(name) if mask is None else self.column(name)[mask]
+                counts = numpy.bincount(codes, minlength=len(dictionary))
+                counted = ((dictionary[code], int(counts[code])) for code in numpy.flatnonzero(counts))
+            else:
+                codes = self.codes[name] if mask is None else compress(self.codes[name], mask)
+                counted = ((dictionary[code], count) for code, count in Counter(codes).items())
+        elif self.use_numpy:
+            values = self.column(name) if mask is None else self.column(name)[mask]
+            unique, counts = numpy.unique(values, return_counts=True)
+            counted = zip(unique.tolist(), counts.tolist())
+        else:
+            values = self.numbers[name] if mask is None else compress(self.numbers[name], mask)
+            counted = Counter(values).items()
+        return dict(sorted(counted, key=lambda item: -item[1]))
+
+    def sum(self, name, by=None, where=None):
+        """
+        Returns the total of a numeric column over the rows matching where,
+        or {value of by: total} when grouped by a dictionary-encoded column.
+        """
+        return self._aggregate(name, by, where)[0]
+
+    def mean(self, name, by=None, where=None):
+        """
+        Returns the mean of a numeric column like sum(). Groups and
+        selections without rows are left out, or give None.
+        """
+        totals, counts = self._aggregate(name, by, where)
+        if by is None:
+            return totals / counts if counts else None
+        return {group: totals[group] / counts[group] for group in totals}
+
+    def _aggregate(self, name, by, where):
+        """
+        Returns the total and the number of rows, or both per group.
+        """
+        mask = self._mask(where)
+        if self.use_numpy:
+            values = self.column(name).astype(numpy.int64)
+            groups = None if by is None else self.column(by)
+            if mask is not None:
+                values = values[mask]
+                groups = None if groups is None else groups[mask]
+            if groups is None:
+                return int(values.sum()), len(values)
+            dictionary = self.dictionaries[by].strings
+            counts = numpy.bincount(groups, minlength=len(dictionary))
+            totals = numpy.bincount(groups, weights=values, minlength=len(dictionary))
+            present = numpy.flatnonzero(counts)
+            return ({dictionary[code]: int(round(totals[code])) for code in present},
+                    {dictionary[code]: int(counts[code]) for code in present})
+
+        values = self.numbers[name]
+        if by is None:
+            selected = values if mask is None else list(compress(values, mask))
+            return sum(selected), len(selected)
+        dictionary = self.dictionaries[by].strings
+        pairs = zip(self.codes[by], values)
+        # Counting distinct (group, value) pairs runs in C; the Python loop
+        # is only over the distinct pairs, a few per group for count columns.
+        pair_counts = Counter(pairs if mask is None else compress(pairs, mask))
+        totals = {}
+        counts = {}
+        for (code, value), count in pair_counts.items():
+            group = dictionary[code]
+            totals[group] = totals.get(group, 0) + value * count
+            counts[group] = counts.get(group, 0) + count
+        return totals, counts
+
+    def _mask(self, where):
+        """
+        Returns the row selection for where, a {column: value} dict of
+        equality conditions, all of which must hold: None for all rows,
+        else a NumPy bool array or a list of bools. A value that is not a
+        number matches no row of a numeric column.
+        """
+        if not where:
+            return None
+        mask = None
+        for name, value in where.items():
+            if name in self.codes:
+                code = self.dictionaries[name].lookup(value)
+                if code is None:
+                    code = -1
+            elif isinstance(value, (int, float)):
+                code = value
+            else:
+                code = None
+            if self.use_numpy:
+                if code is None:
+                    selected = numpy.zeros(len(self), dtype=bool)
+                else:
+                    selected = self.column(name) == code
+                mask = selected if mask is None else mask & selected
+            else:
+                if code is None:
+                    selected = [False] * len(self)
+                else:
+                    column = self.codes[name] if name in self.codes else self.numbers[name]
+                    selected = list(map(eq, column, repeat(code)))
+                mask = selected if mask is None else list(map(and_, mask, selected))
+        return mask
+
+    def write(self, directory):
+        """
+        Exports the columns to a directory: one raw binary file per column,
+        readable with array.fromfile or numpy.fromfile, and a JSON manifest
+        with the typecodes, byte order and dictionaries.
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"rows": len(self), "byteorder": sys.byteorder, "columns": {}, "dictionaries": {}}
+        for name in self.names:
+            values = self.codes[name] if name in self.codes else self.numbers[name]
+            manifest["columns"][name] = values.typecode
+            with open(os.path.join(directory, f"{name}.bin"), "wb") as f:
+                values.tofile(f)
+        for name in DICTIONARY_COLUMNS:
+            manifest["dictionaries"][name] = self.dictionaries[name].strings
+        with open(os.path.join(directory, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f)
+
+def read_operation_columns(directory, use_numpy=None):
+    """
+    Loads columns exported by OperationColumns.write.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    columns = OperationColumns(use_numpy=use_numpy)
+    for name, typecode in manifest["columns"].items():
+        values = array(typecode)
+        with open(os.path.join(directory, f"{name}.bin"), "rb") as f:
+            values.fromfile(f, manifest["rows"])
+        if manifest["byteorder"] != sys.byteorder:
+            values.byteswap()
+        if name in columns.codes:
+            columns.codes[name] = values
+        else:
+            columns.numbers[name] = values
+    for name, strings in manifest["dictionaries"].items():
+        dictionary = SymbolTable()
+        for string in strings:
+            dictionary.intern(string)
+        columns.dictionaries[name] = dictionary
+    return columns
+
+def export_operation_columns(holoforms, directory=None, use_numpy=None):
+    """
+    Returns the OperationColumns of Holoforms, also written to directory
+    if one is given.
+    """
+    columns = OperationColumns(holoforms, use_numpy=use_numpy)
+    if directory is not None:
+        columns.write(directory)
+    return columns
+
+def _new_dictionary():
+    dictionary = SymbolTable()
+    dictionary.intern(None)
+    return dictionary
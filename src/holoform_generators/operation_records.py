@@ -0,0 +1,348 @@
+from collections.abc import Mapping, Sequence
+from json.encoder import JSONEncoder, c_make_encoder, encode_basestring_ascii
+
+class OperationRecord(Mapping):
+    """
+    Base class for the compact operation records built by
+    HoloformGeneratorVisitor.
+
+    Each field is a slot named after its Holoform key, so a record takes a
+    fraction of the memory of the equivalent dict while still reading like
+    one: op["op_type"], op.get("def_use"), "target_object" in op and
+    comparisons with plain dicts all work. Optional fields are left unset
+    and are then missing from the mapping. Records are turned into plain
+    dicts only where Holoforms leave the process, with to_dict or by
+    passing to_json_value as json.dumps(default=...).
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        # Mapping.get goes through __getitem__ and a KeyError per missing key.
+        if key in self.__slots__:
+            return getattr(self, key, default)
+        return default
+
+    def __iter__(self):
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        """
+        Returns the record, and any records nested in it, as plain dicts
+        with the keys in Holoform order.
+        """
+        return {key: _to_plain(self[key]) for key in self}
+
+class DefUse(OperationRecord):
+    __slots__ = ("defs", "uses")
+
+    def __init__(self, defs, uses):
+        self.defs = defs
+        self.uses = uses
+
+class CallOperation(OperationRecord):
+    # callee_id is only set when the callee resolves to a method or nested
+    # definition; see operation_callee_id.
+    __slots__ = ("step_id", "op_type", "assign_to_variable", "target_function_name",
+                 "parameter_mapping", "target_object", "callee_id", "def_use")
+
+    def __init__(self, step_id, op_type, assign_to_variable, target_function_name, parameter_mapping):
+        self.step_id = step_id
+        self.op_type = op_type
+        self.assign_to_variable = assign_to_variable
+        self.target_function_name = target_function_name
+        self.parameter_mapping = parameter_mapping
+
+class AssignmentOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "assign_to_variable", "value", "def_use")
+
+    def __init__(self, step_id, assign_to_variable, value):
+        self.step_id = step_id
+        self.op_type = "assignment"
+        self.assign_to_variable = assign_to_variable
+        self.value = value
+
+class AttributeAssignmentOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "subtype", "target_object", "attribute", "value", "def_use")
+
+    def __init__(self, step_id, target_object, attribute, value):
+        self.step_id = step_id
+        self.op_type = "state_modification"
+        self.subtype = "attribute_assignment"
+        self.target_object = target_object
+        self.attribute = attribute
+        self.value = value
+
+class SubscriptAssignmentOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "subtype", "target_dict", "key", "value", "def_use")
+
+    def __init__(self, step_id, target_dict, key, value):
+        self.step_id = step_id
+        self.op_type = "state_modification"
+        self.subtype = "dict_key_assignment"
+        self.target_dict = target_dict
+        self.key = key
+        self.value = value
+
+class ReturnOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "value", "def_use")
+
+    def __init__(self, step_id, value, def_use):
+        self.step_id = step_id
+        self.op_type = "return"
+        self.value = value
+        self.def_use = def_use
+
+class IfOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "subtype", "test", "body", "orelse", "def_use")
+
+    def __init__(self, step_id, test, body, orelse):
+        self.step_id = step_id
+        self.op_type = "control_flow"
+        self.subtype = "if"
+        self.test = test
+        self.body = body
+        self.orelse = orelse
+
+class WhileOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "subtype", "test", "body", "def_use")
+
+    def __init__(self, step_id, test, body):
+        self.step_id = step_id
+        self.op_type = "control_flow"
+        self.subtype = "while"
+        self.test = test
+        self.body = body
+
+class ForOperation(OperationRecord):
+    # target_variable, iterable_source_repr and loop_body_operations are the
+    # KEY_OP_LOOP_* keys of constants.py.
+    __slots__ = ("step_id", "op_type", "subtype", "target_variable", "iterable_source_repr",
+                 "loop_body_operations", "orelse", "def_use")
+
+    def __init__(self, step_id, subtype, target_variable, iterable_source_repr, loop_body_operations, orelse):
+        self.step_id = step_id
+        self.op_type = "control_flow"
+        self.subtype = subtype
+        self.target_variable = target_variable
+        self.iterable_source_repr = iterable_source_repr
+        self.loop_body_operations = loop_body_operations
+        self.orelse = orelse
+
+class WithItem(OperationRecord):
+    __slots__ = ("context_expr", "optional_vars")
+
+    def __init__(self, context_expr, optional_vars):
+        self.context_expr = context_expr
+        self.optional_vars = optional_vars
+
+class WithOperation(OperationRecord):
+    # "with_items", not "items", which would hide Mapping.items().
+    __slots__ = ("step_id", "op_type", "subtype", "with_items", "body", "def_use")
+
+    def __init__(self, step_id, subtype, with_items, body):
+        self.step_id = step_id
+        self.op_type = "control_flow"
+        self.subtype = subtype
+        self.with_items = with_items
+        self.body = body
+
+class MatchCase(OperationRecord):
+    __slots__ = ("pattern", "guard", "body", "def_use")
+
+    def __init__(self, pattern, guard, body):
+        self.pattern = pattern
+        self.guard = guard
+        self.body = body
+
+class MatchOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "subtype", "subject", "cases", "def_use")
+
+    def __init__(self, step_id, subject, cases):
+        self.step_id = step_id
+        self.op_type = "control_flow"
+        self.subtype = "match"
+        self.subject = subject
+        self.cases = cases
+
+class ExceptHandler(OperationRecord):
+    __slots__ = ("type", "name", "body")
+
+    def __init__(self, type, name, body):
+        self.type = type
+        self.name = name
+        self.body = body
+
+class TryOperation(OperationRecord):
+    __slots__ = ("step_id", "op_type", "subtype", "body", "handlers", "finalbody")
+
+    def __init__(self, step_id, body, handlers, finalbody):
+        self.step_id = step_id
+        self.op_type = "control_flow"
+        self.subtype = "try"
+        self.body = body
+        self.handlers = handlers
+        self.finalbody = finalbody
+
+def operation_callee_id(operation):
+    """
+    Returns the Holoform id a call operation refers to: the callee_id the
+    visitor resolved against the enclosing class or function scopes, or
+    else that of a module-level function of the called name.
+    """
+    return operation.get("callee_id") or f"{operation.get('target_function_name')}_auto_v1"
+
+def to_json_value(obj):
+    """
+    json.dumps default hook that encodes operation records, and other
+    Holoform mappings, as objects.
+    """
+    if isinstance(obj, OperationRecord):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        # Read-only Holoform views such as symbol_table.CompactHoloform.
+        return dict(obj)
+    if not isinstance(obj, (str, bytes)) and isinstance(obj, Sequence):
+        # e.g. the lazy lists of holoform_file.HoloformView.
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class _Text(str):
+    """
+    Encoded JSON text waiting on write_json's stack, as opposed to a str
+    value still to be encoded.
+    """
+
+    __slots__ = ()
+
+_COMMA = _Text(", ")
+_CLOSE_LIST = _Text("]")
+_CLOSE_OBJECT = _Text("}")
+_UNSET = object()
+
+# Record type -> ((slot, encoded '"slot": ' key), ...), filled on first use.
+_RECORD_KEYS = {}
+
+if c_make_encoder is not None:
+    # The C encoder json.dumps(value, default=to_json_value) uses, built once
+    # rather than per call. Holoforms hold no reference cycles, so it skips
+    # the circular reference check.
+    _plain_encoder = c_make_encoder(None, to_json_value, encode_basestring_ascii, None,
+                                    ": ", ", ", False, False, True)
+
+    def _encode_plain(value):
+        return "".join(_plain_encoder(value, 0))
+else:
+    _encode_plain = JSONEncoder(default=to_json_value).encode
+
+def write_json(value, write):
+    """
+    Writes value as the exact text of json.dumps(value, default=to_json_value)
+    through write, e.g. a StringIO's or a text file's write. Records, and
+    lists holding them, are encoded straight from their slots, with their
+    keys encoded once per record type, on an explicit stack of values and
+    already-encoded text. Dicts and lists of plain values are handed whole
+    to the C encoder.
+    """
+    stack = [value]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        value = pop()
+        kind = type(value)
+        if kind is _Text:
+            write(value)
+        elif kind is str:
+            write(encode_basestring_ascii(value))
+        elif value is None:
+            write("null")
+        elif value is True:
+            write("true")
+        elif value is False:
+            write("false")
+        elif kind is int:
+            write(int.__repr__(value))
+        elif isinstance(value, OperationRecord):
+            keys = _RECORD_KEYS.get(kind)
+            if keys is None:
+                keys = _RECORD_KEYS[kind] = tuple(
+                    (name, _Text(encode_basestring_ascii(name) + ": ")) for name in kind.__slots__)
+            fields = []
+            for name, key in keys:
+                item = getattr(value, name, _UNSET)
+                if item is not _UNSET:
+                    fields.append((key, item))
+            _push_fields(fields, write, push)
+        elif isinstance(value, (list, tuple)):
+            if not any(isinstance(item, OperationRecord) for item in value):
+                write(_encode_plain(value))
+                continue
+            write("[")
+            push(_CLOSE_LIST)
+            for index in range(len(value) - 1, 0, -1):
+                push(value[index])
+                push(_COMMA)
+            push(value[0])
+        elif isinstance(value, dict):
+            write(_encode_plain(value))
+        elif isinstance(value, str):
+            write(encode_basestring_ascii(value))
+        elif isinstance(value, int):
+            write(int.__repr__(value))
+        elif isinstance(value, float):
+            write(_float_text(value))
+        else:
+            push(to_json_value(value))
+
+def _push_fields(fields, write, push):
+    if not fields:
+        write("{}")
+        return
+    write("{")
+    push(_CLOSE_OBJECT)
+    for index in range(len(fields) - 1, -1, -1):
+        key, item = fields[index]
+        push(item)
+        push(key)
+        if index:
+            push(_COMMA)
+
+def _float_text(value):
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+def holoform_to_dict(holoform):
+    """
+    Returns a copy of a Holoform whose operations are plain dicts.
+    """
+    return _to_plain(holoform)
+
+def _to_plain(value):
+    if isinstance(value, OperationRecord):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, list) or not isinstance(value, (str, bytes)) and isinstance(value, Sequence):
+        return [_to_plain(item) for item in value]
+    return value
@@ -0,0 +1,132 @@
+import ast
+import hashlib
+import time
+from collections import OrderedDict
+
+# A parsed module takes roughly this many bytes of AST objects per character
+# of source (measured with tracemalloc on this package's own modules).
+TREE_BYTES_PER_SOURCE_CHAR = 34
+
+DEFAULT_MAX_TREE_BYTES = 64 * 1024 * 1024
+
+class ParseCache:
+    """
+    Bounded LRU cache of parsed modules, so that every analysis of the same
+    source (the Holoform generator, HoloChainParser, the three passes of
+    DifferentialAnalyzer, ...) shares a single parse.
+
+    Entries are keyed by a hash of the source together with the parse
+    options, and the cache is bounded by the estimated memory of the trees
+    it holds rather than by their number, so one huge module does not
+    count the same as a one-line snippet. hits, misses, evictions and
+    parse_seconds (the time spent in the parser itself) are kept for the
+    caller to inspect.
+
+    Cached trees are shared: callers must treat them as read-only.
+    """
+
+    def __init__(self, max_tree_bytes=DEFAULT_MAX_TREE_BYTES):
+        self.max_tree_bytes = max_tree_bytes
+        self.entries = OrderedDict()
+        self.tree_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.parse_seconds = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "size": len(self),
+            "tree_bytes": self.tree_bytes,
+            "max_tree_bytes": self.max_tree_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "parse_seconds": self.parse_seconds,
+        }
+
+    def clear(self):
+        """
+        Drops all entries and resets the counters.
+        """
+        self.entries.clear()
+        self.tree_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self.parse_seconds = 0.0
+
+    def parse(self, source, filename="<unknown>", feature_version=None, type_comments=False):
+        """
+        Returns the module tree of source, parsing it only if the same
+        source was not parsed with the same options before. Raises
+        SyntaxError like ast.parse; failed parses are not cached.
+        """
+        key = (_source_hash(source), _feature_minor(feature_version), type_comments)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        started = time.perf_counter()
+        try:
+            tree = compile_module(source, filename, feature_version, type_comments)
+        finally:
+            self.parse_seconds += time.perf_counter() - started
+        size = len(source) * TREE_BYTES_PER_SOURCE_CHAR
+        if size <= self.max_tree_bytes:
+            self.entries[key] = (tree, size)
+            self.tree_bytes += size
+            while self.tree_bytes > self.max_tree_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.tree_bytes -= evicted_size
+                self.evictions += 1
+        return tree
+
+PARSE_CACHE = ParseCache()
+
+def parse_source(source, filename="<unknown>", feature_version=None, type_comments=False, cache=PARSE_CACHE):
+    """
+    Parses Python source into a module tree through the shared parse cache.
+    feature_version is a (3, minor) tuple or a minor version int, as for
+    ast.parse. Pass cache=None to always parse, e.g. for sources that are
+    parsed only once.
+    """
+    if cache is None:
+        return compile_module(source, filename, feature_version, type_comments)
+    return cache.parse(source, filename, feature_version, type_comments)
+
+def compile_module(source, filename="<unknown>", feature_version=None, type_comments=False):
+    """
+    Parses source with compile() and PyCF_ONLY_AST directly, which is what
+    ast.parse does underneath, without the extra call.
+    """
+    flags = ast.PyCF_ONLY_AST
+    if type_comments:
+        flags |= ast.PyCF_TYPE_COMMENTS
+    return compile(source, filename, "exec", flags, dont_inherit=True,
+                   _feature_version=_feature_minor(feature_version))
+
+def _feature_minor(feature_version):
+    """
+    Returns the minor version of a feature_version, -1 for the current one.
+    """
+    if feature_version is None:
+        return -1
+    if isinstance(feature_version, tuple):
+        return feature_version[1]
+    return feature_version
+
+def _source_hash(source):
+    if isinstance(source, str):
+        source = source.encode("utf-8", "surrogatepass")
+    return hashlib.sha256(source).digest()
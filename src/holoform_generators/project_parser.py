@@ -1,85 +1,383 @@
 import os
-import ast
-from .main_generator import generate_holoform_from_code_string
+import importlib.util
+import itertools
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .main_generator import generate_holoforms_from_tree
+from .holoform_store import HoloformStore
+from .git_changes import CHANGE_DELETED
+from .ignore_rules import IgnoreRules, WalkStats
+from .parse_cache import parse_source
+from .operation_records import operation_callee_id
+from . import constants as C
 
 import hashlib
 
-CACHE_FILE = ".holoform_cache.json"
+CACHE_FILE = ".holoform_cache.sqlite"
 
-def parse_project(project_path):
+logger = logging.getLogger(__name__)
+
+# Each worker receives roughly this many batches, so that one slow file does
+# not stall a whole worker while the per-batch IPC cost stays amortised.
+BATCHES_PER_WORKER = 4
+
+def parse_project(project_path, workers=1, chunksize=None, cache_path=CACHE_FILE, paranoid=False, store=None,
+                  ignore_rules=None, walk_stats=None):
     """
     Parses all Python files in a project directory and returns a list of Holoforms.
+
+    This materialises iter_project_holoforms; see there for the options.
+    The scanned and skipped counts are logged at INFO level after the run;
+    pass a WalkStats as walk_stats to read them.
+    """
+    if walk_stats is None:
+        walk_stats = WalkStats()
+    builder = CallGraphBuilder()
+    holoforms = list(builder.consume(iter_project_holoforms(
+        project_path, workers, chunksize, cache_path=cache_path, paranoid=paranoid, store=store,
+        ignore_rules=ignore_rules, walk_stats=walk_stats)))
+    logger.info(walk_stats.report())
+    return holoforms, builder.call_graph
+
+def iter_project_holoforms(project_path, workers=1, chunksize=None, cache_path=CACHE_FILE, paranoid=False, store=None,
+                           ignore_rules=None, walk_stats=None):
     """
-    holoforms = []
-    cache = _load_cache()
+    Yields the Holoforms of all Python files in a project directory as each
+    file completes, so only one file's Holoforms need to be held at a time.
+
+    With workers > 1 (or None for one per CPU) files are parsed in a process
+    pool. Results are yielded in walk order, so the output is identical to the
+    serial mode. Files whose content hash and generator version match the
+    store are not parsed again; their stored Holoforms are replayed instead.
+
+    A file is only read and hashed when its (st_mtime_ns, st_size, st_ino)
+    differ from the stored stat. Pass paranoid=True to always hash.
+
+    Directories and files matching ignore_rules (by default
+    IgnoreRules.from_project: built-in defaults plus the project .gitignore)
+    are pruned before descent; pass a WalkStats as walk_stats to get the
+    skipped counts.
+
+    Results are kept in a HoloformStore, either the one passed as store or
+    one opened at cache_path while the generator runs. Files that disappeared
+    from the project are pruned from the store once iteration completes.
+    """
+    if store is None:
+        with HoloformStore(cache_path) as store:
+            yield from iter_project_holoforms(project_path, workers, chunksize, paranoid=paranoid, store=store,
+                                              ignore_rules=ignore_rules, walk_stats=walk_stats)
+        return
+
+    # First pass: decide per file whether the store is still valid by its
+    # stat. Only paths, stat tuples and stored hashes are kept, never
+    # Holoforms or file contents.
+    plan = []
+    for filepath in _walk_python_files(project_path, ignore_rules, walk_stats):
+        file_stat = _get_file_stat(filepath)
+
+        entry = _get_current_entry(store, filepath)
+        if entry is not None and not paranoid and entry["stat"] == file_stat:
+            plan.append((filepath, None, None, None))
+            continue
+        if entry is None:
+            plan.append((filepath, file_stat, None, None))
+        else:
+            plan.append((filepath, file_stat, entry["hash"], entry["stat"]))
+
+    # Second pass: replay each file, or read it once to hash it and, if its
+    # content changed, parse those same bytes, in walk order.
+    parsed = _iter_parsed_files([(filepath, stored_hash) for filepath, file_stat, stored_hash, _ in plan
+                                 if file_stat is not None], workers, chunksize)
+    for filepath, file_stat, _, stored_stat in plan:
+        if file_stat is None:
+            yield from store.get_file_holoforms(filepath)
+            continue
+
+        file_hash, file_holoforms = next(parsed)
+        if file_holoforms is None:
+            # Touched but unchanged: keep the Holoforms, refresh the stat.
+            if stored_stat != file_stat:
+                store.update_file_stat(filepath, file_stat)
+            yield from store.get_file_holoforms(filepath)
+            continue
+
+        _store_file(store, filepath, file_stat, file_hash, file_holoforms)
+        yield from file_holoforms
+
+    seen = {filepath for filepath, _, _, _ in plan}
+    project_prefix = os.path.join(project_path, "")
+    store.delete_files([path for path in store.iter_paths()
+                        if path.startswith(project_prefix) and path not in seen])
+
+def update_project(project_path, changes, cache_path=CACHE_FILE, store=None, ignore_rules=None):
+    """
+    Updates a store for a known list of changed files without walking or
+    hashing the rest of the project, so the cost is proportional to the
+    size of the change.
+
+    changes is an iterable of (status, path) pairs with status "A", "M" or
+    "D" and "/"-separated paths relative to project_path, e.g. from
+    git_changes.get_changed_files(project_path, base, head), which also
+    works when project_path is a subdirectory of the repository. Returns a dict
+    with the "updated" and "deleted" file paths. The call graph can then be
+    read with _build_call_graph(store). Paths matching ignore_rules are
+    skipped, as in iter_project_holoforms.
+    """
+    if store is None:
+        with HoloformStore(cache_path) as store:
+            return update_project(project_path, changes, store=store, ignore_rules=ignore_rules)
+
+    if ignore_rules is None:
+        ignore_rules = IgnoreRules.from_project(project_path)
+
+    updated = []
+    deleted = []
+    for status, path in changes:
+        if not path.endswith(".py") or ignore_rules.is_ignored_path(path):
+            continue
+        # git reports "/"-separated paths; the store uses os.walk's separators.
+        filepath = os.path.join(project_path, *path.split("/"))
+        try:
+            file_stat = _get_file_stat(filepath) if status != CHANGE_DELETED else None
+        except FileNotFoundError:
+            file_stat = None
+        if file_stat is None:
+            store.delete_files([filepath])
+            deleted.append(filepath)
+            continue
+
+        entry = _get_current_entry(store, filepath)
+        file_hash, file_holoforms = _hash_and_parse_file(filepath, entry["hash"] if entry is not None else None)
+        if file_holoforms is None:
+            if entry["stat"] != file_stat:
+                store.update_file_stat(filepath, file_stat)
+            continue
+
+        _store_file(store, filepath, file_stat, file_hash, file_holoforms)
+        updated.append(filepath)
+
+    return {"updated": updated, "deleted": deleted}
+
+def _walk_python_files(project_path, ignore_rules=None, walk_stats=None):
+    """
+    Yields the .py files of a project in os.walk order, pruning ignored
+    directories before descending into them.
+    """
+    if ignore_rules is None:
+        ignore_rules = IgnoreRules.from_project(project_path)
+    if walk_stats is None:
+        walk_stats = WalkStats()
+
+    for root, dirs, files in os.walk(project_path):
+        rel_root = os.path.relpath(root, project_path).replace(os.sep, "/")
+        rel_prefix = "" if rel_root == "." else rel_root + "/"
+
+        kept_dirs = []
+        for directory in dirs:
+            if ignore_rules.is_ignored(rel_prefix + directory, is_dir=True):
+                walk_stats.skipped_dirs += 1
+            else:
+                kept_dirs.append(directory)
+        dirs[:] = kept_dirs
 
-    for root, _, files in os.walk(project_path):
         for file in files:
             if file.endswith(".py"):
                 filepath = os.path.join(root, file)
-                file_hash = _get_file_hash(filepath)
-
-                if filepath in cache and cache[filepath] == file_hash:
+                if ignore_rules.is_ignored(rel_prefix + file):
+                    walk_stats.skipped_files += 1
+                    walk_stats.skipped_bytes += os.path.getsize(filepath)
                     continue
+                walk_stats.scanned_files += 1
+                yield filepath
 
-                with open(filepath, 'r') as f:
-                    source_code = f.read()
+def _get_current_entry(store, filepath):
+    """
+    Returns the store entry of a file, or None if it is missing or was
+    generated by another generator version.
+    """
+    entry = store.get_file(filepath)
+    if entry is not None and entry["generator_version"] != C.GENERATOR_VERSION:
+        return None
+    return entry
 
-                try:
-                    parsed_ast = ast.parse(source_code)
-                    for node in parsed_ast.body:
-                        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                            holoform = generate_holoform_from_code_string(source_code, target_name=node.name)
-                            if holoform:
-                                holoforms.append(holoform)
-                except SyntaxError as e:
-                    print(f"ERROR parsing {filepath}: {e}")
+def _store_file(store, filepath, file_stat, file_hash, file_holoforms):
+    """
+    Replaces a file's Holoforms and call edges in the store.
+    """
+    store.upsert_file(filepath, file_hash, file_stat, C.GENERATOR_VERSION,
+                      file_holoforms, _get_call_edges(file_holoforms))
+
+def _iter_parsed_files(files, workers=1, chunksize=None):
+    """
+    Hashes and parses the given (filepath, stored hash) files, serially or
+    in a process pool, and yields the results of _hash_and_parse_file in
+    the same order as files.
 
-                cache[filepath] = file_hash
+    In pool mode files are sent in batches of chunksize, with at most two
+    batches per worker in flight, so results never pile up ahead of the
+    consumer.
+    """
+    if workers == 1 or len(files) < 2:
+        for filepath, stored_hash in files:
+            yield _hash_and_parse_file(filepath, stored_hash)
+        return
 
-    _save_cache(cache)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(files) // (workers * BATCHES_PER_WORKER))
+    batches = (files[i:i + chunksize] for i in range(0, len(files), chunksize))
 
-    call_graph = _build_call_graph(holoforms)
-    return holoforms, call_graph
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Batches are consumed in submission order regardless of which worker
+        # finishes first, which keeps the merge deterministic.
+        in_flight = deque(executor.submit(_parse_file_batch, batch)
+                          for batch in itertools.islice(batches, workers * 2))
+        while in_flight:
+            batch_results = in_flight.popleft().result()
+            next_batch = next(batches, None)
+            if next_batch is not None:
+                in_flight.append(executor.submit(_parse_file_batch, next_batch))
+            yield from batch_results
 
-def _load_cache():
+def _parse_file_batch(files):
     """
-    Loads the file hash cache from disk.
+    Hashes and parses a batch of files in a pool worker.
     """
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        return {}
+    return [_hash_and_parse_file(filepath, stored_hash) for filepath, stored_hash in files]
 
-def _save_cache(cache):
+def _hash_and_parse_file(filepath, stored_hash=None):
     """
-    Saves the file hash cache to disk.
+    Reads a file once and returns its hash and its Holoforms, parsed from
+    the same bytes, or None instead of the Holoforms if the hash is
+    stored_hash and the stored ones are still valid.
     """
-    with open(CACHE_FILE, 'w') as f:
-        json.dump(cache, f)
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    file_hash = _get_file_hash(data)
+    if file_hash == stored_hash:
+        return file_hash, None
+    return file_hash, _parse_file(filepath, data)
 
-def _get_file_hash(filepath):
+def _parse_file(filepath, data=None):
     """
-    Calculates the SHA256 hash of a file.
+    Parses a single Python file once and returns the Holoforms of all its
+    functions, methods and classes, nested ones included. data is the
+    file's bytes if they were already read.
     """
-    with open(filepath, 'rb') as f:
-        return hashlib.sha256(f.read()).hexdigest()
+    if data is None:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    # Decodes like the interpreter: PEP 263 coding lines, universal newlines.
+    source_code = importlib.util.decode_source(data)
+
+    try:
+        # Each project file is parsed once, so the shared cache would only
+        # hold its tree and hash its source for nothing.
+        parsed_ast = parse_source(source_code, filepath, cache=None)
+    except SyntaxError as e:
+        print(f"ERROR parsing {filepath}: {e}")
+        return []
+
+    return generate_holoforms_from_tree(parsed_ast, source_code.splitlines())
+
+def _get_file_stat(filepath):
+    """
+    Returns the stat fields used to detect a changed file without reading it.
+    """
+    st = os.stat(filepath)
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+def _get_file_hash(data):
+    """
+    Calculates the SHA256 hash of a file's bytes.
+    """
+    return hashlib.sha256(data).hexdigest()
 
 def _build_call_graph(holoforms):
     """
-    Builds a call graph from a list of Holoforms.
+    Builds a call graph from an iterable of Holoforms, or directly from the
+    call edges of a HoloformStore without loading any Holoform.
     """
-    call_graph = {}
-    for holoform in holoforms:
+    builder = CallGraphBuilder()
+    if isinstance(holoforms, HoloformStore):
+        for caller_id, callee_id in holoforms.iter_function_callees():
+            builder.add_edges(caller_id, [] if callee_id is None else [callee_id])
+    else:
+        for holoform in holoforms:
+            builder.add(holoform)
+    return builder.call_graph
+
+class CallGraphBuilder:
+    """
+    Builds a call graph incrementally from a stream of Holoforms, so callers
+    of iter_project_holoforms never need the whole project in memory.
+
+    Holoforms added with add() can later be taken out again with remove(),
+    which is how watch mode patches the graph when a file changes.
+    """
+
+    def __init__(self):
+        self.call_graph = {}
+        # Number of added function Holoforms per caller id; the same id can
+        # be defined in several files.
+        self._definitions = {}
+
+    def add(self, holoform):
         if holoform.get("holoform_type") == "function":
             caller_id = holoform.get("id")
-            if caller_id not in call_graph:
-                call_graph[caller_id] = []
+            self._definitions[caller_id] = self._definitions.get(caller_id, 0) + 1
+            self.add_edges(caller_id, _get_callee_ids(holoform))
+
+    def add_edges(self, caller_id, callee_ids):
+        self.call_graph.setdefault(caller_id, []).extend(callee_ids)
 
-            for op in holoform.get("operations", []):
-                if op.get("op_type") in ["function_call", "constructor_call"]:
-                    callee_id = f"{op.get('target_function_name')}_auto_v1"
-                    call_graph[caller_id].append(callee_id)
+    def remove(self, holoform):
+        """
+        Removes the edges contributed by a previously added Holoform, and
+        its caller entry once no other definition of that id is left.
+        """
+        if holoform.get("holoform_type") != "function":
+            return
+        caller_id = holoform.get("id")
+        callees = self.call_graph.get(caller_id, [])
+        for callee_id in _get_callee_ids(holoform):
+            if callee_id in callees:
+                callees.remove(callee_id)
 
-    return call_graph
+        remaining = self._definitions.get(caller_id, 0) - 1
+        if remaining > 0:
+            self._definitions[caller_id] = remaining
+        else:
+            self._definitions.pop(caller_id, None)
+            self.call_graph.pop(caller_id, None)
+
+    def consume(self, holoforms):
+        """
+        Adds each Holoform to the graph and passes it through unchanged.
+        """
+        for holoform in holoforms:
+            self.add(holoform)
+            yield holoform
+
+def _get_callee_ids(holoform):
+    """
+    Returns the ids of the Holoforms called by a function Holoform, in call order.
+    """
+    callee_ids = []
+    for op in holoform.get("operations", []):
+        if op.get("op_type") in ["function_call", "constructor_call"]:
+            callee_ids.append(operation_callee_id(op))
+    return callee_ids
+
+def _get_call_edges(holoforms):
+    """
+    Returns the (holoform_ordinal, caller_id, callee_id) call edges of one
+    file's Holoforms, as stored by HoloformStore.upsert_file.
+    """
+    call_edges = []
+    for ordinal, holoform in enumerate(holoforms):
+        if holoform.get("holoform_type") == "function":
+            for callee_id in _get_callee_ids(holoform):
+                call_edges.append((ordinal, holoform.get("id"), callee_id))
+    return call_edges
@@ -0,0 +1,193 @@
+import os
+import time
+from collections import Counter
+from .holoform_store import HoloformStore
+from .ignore_rules import IgnoreRules
+from . import project_parser
+from .project_parser import CACHE_FILE, CallGraphBuilder
+
+CHANGE_ADDED = "added"
+CHANGE_MODIFIED = "modified"
+CHANGE_DELETED = "deleted"
+
+class ProjectWatcher:
+    """
+    Keeps a project's Holoforms and call graph up to date while files change.
+
+    Each poll stats every known directory and re-lists only those whose
+    mtime changed (files were added, removed or renamed), then stats every
+    known file. Only files whose stat changed are hashed, and only files
+    whose content changed are regenerated; their old edges are removed from
+    the in-memory call graph and the new ones added. Ignored directories
+    are never entered, as in iter_project_holoforms.
+    """
+
+    def __init__(self, project_path, cache_path=CACHE_FILE, store=None, poll_interval=0.5, ignore_rules=None):
+        self.project_path = project_path
+        self.poll_interval = poll_interval
+        self.ignore_rules = IgnoreRules.from_project(project_path) if ignore_rules is None else ignore_rules
+        self._owns_store = store is None
+        self.store = HoloformStore(cache_path) if store is None else store
+        self.dir_mtimes = {}
+        self.file_stats = {}
+
+        # Snapshot before generating, so anything that changes meanwhile is
+        # picked up by the first poll.
+        for filepath in self._scan_dirs(project_path):
+            self.file_stats[filepath] = project_parser._get_file_stat(filepath)
+
+        self.builder = CallGraphBuilder()
+        for _ in self.builder.consume(project_parser.iter_project_holoforms(
+                project_path, store=self.store, ignore_rules=self.ignore_rules)):
+            pass
+
+    @property
+    def call_graph(self):
+        return self.builder.call_graph
+
+    def close(self):
+        if self._owns_store:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def watch(self, max_polls=None):
+        """
+        Yields change events as they are detected, polling every
+        poll_interval seconds, forever or for max_polls polls.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            yield from self.poll()
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(self.poll_interval)
+
+    def poll(self):
+        """
+        Checks the tree once and returns a list of per-file change events.
+
+        Each event is a dict with the file "path", its "change_type"
+        (added, modified or deleted), its new "holoforms", the
+        "removed_holoform_ids" and the "added_call_edges" /
+        "removed_call_edges" as (caller_id, callee_id) pairs.
+        """
+        new_files = []
+        for dirpath, mtime in list(self.dir_mtimes.items()):
+            try:
+                current_mtime = os.stat(dirpath).st_mtime_ns
+            except FileNotFoundError:
+                del self.dir_mtimes[dirpath]
+                continue
+            if current_mtime != mtime:
+                new_files.extend(self._scan_dirs(dirpath))
+
+        events = []
+        for filepath, old_stat in list(self.file_stats.items()):
+            try:
+                file_stat = project_parser._get_file_stat(filepath)
+            except FileNotFoundError:
+                events.append(self._remove_file(filepath))
+                continue
+            if file_stat != old_stat:
+                event = self._refresh_file(filepath, file_stat, CHANGE_MODIFIED)
+                if event is not None:
+                    events.append(event)
+
+        for filepath in new_files:
+            try:
+                file_stat = project_parser._get_file_stat(filepath)
+            except FileNotFoundError:
+                continue
+            event = self._refresh_file(filepath, file_stat, CHANGE_ADDED)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _scan_dirs(self, dirpath):
+        """
+        Records the mtime of dirpath and of every directory below it that is
+        not known yet, and returns the .py files not known yet.
+        """
+        new_files = []
+        stack = [dirpath]
+        while stack:
+            current = stack.pop()
+            try:
+                # Record the mtime before listing: a change in between is
+                # then seen again on the next poll instead of being lost.
+                self.dir_mtimes[current] = os.stat(current).st_mtime_ns
+                entries = list(os.scandir(current))
+            except FileNotFoundError:
+                self.dir_mtimes.pop(current, None)
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in self.dir_mtimes and not self._is_ignored(entry.path, is_dir=True):
+                        stack.append(entry.path)
+                elif (entry.name.endswith(".py") and entry.path not in self.file_stats
+                        and not self._is_ignored(entry.path)):
+                    new_files.append(entry.path)
+        return new_files
+
+    def _is_ignored(self, path, is_dir=False):
+        relpath = os.path.relpath(path, self.project_path).replace(os.sep, "/")
+        return self.ignore_rules.is_ignored(relpath, is_dir)
+
+    def _refresh_file(self, filepath, file_stat, change_type):
+        """
+        Regenerates a file whose stat changed, unless its content did not.
+        """
+        entry = project_parser._get_current_entry(self.store, filepath)
+        try:
+            file_hash, new_holoforms = project_parser._hash_and_parse_file(
+                filepath, entry["hash"] if entry is not None else None)
+        except FileNotFoundError:
+            # Deleted since it was stat'ed: a known file is removed, a new
+            # one was never reported.
+            return self._remove_file(filepath) if filepath in self.file_stats else None
+        self.file_stats[filepath] = file_stat
+        if new_holoforms is None:
+            self.store.update_file_stat(filepath, file_stat)
+            return None
+
+        old_holoforms = self.store.get_file_holoforms(filepath) if entry is not None else []
+        project_parser._store_file(self.store, filepath, file_stat, file_hash, new_holoforms)
+        return self._apply_delta(filepath, change_type, old_holoforms, new_holoforms)
+
+    def _remove_file(self, filepath):
+        del self.file_stats[filepath]
+        old_holoforms = self.store.get_file_holoforms(filepath)
+        self.store.delete_files([filepath])
+        return self._apply_delta(filepath, CHANGE_DELETED, old_holoforms, [])
+
+    def _apply_delta(self, filepath, change_type, old_holoforms, new_holoforms):
+        """
+        Patches the call graph from the old to the new version of a file and
+        returns the corresponding change event.
+        """
+        for holoform in old_holoforms:
+            self.builder.remove(holoform)
+        for holoform in new_holoforms:
+            self.builder.add(holoform)
+
+        old_edges = Counter(_iter_edges(old_holoforms))
+        new_edges = Counter(_iter_edges(new_holoforms))
+        new_ids = {holoform.get("id") for holoform in new_holoforms}
+        return {
+            "path": filepath,
+            "change_type": change_type,
+            "holoforms": new_holoforms,
+            "removed_holoform_ids": [holoform.get("id") for holoform in old_holoforms
+                                     if holoform.get("id") not in new_ids],
+            "added_call_edges": list((new_edges - old_edges).elements()),
+            "removed_call_edges": list((old_edges - new_edges).elements()),
+        }
+
+def _iter_edges(holoforms):
+    for _, caller_id, callee_id in project_parser._get_call_edges(holoforms):
+        yield caller_id, callee_id
@@ -1,8 +1,10 @@
 import re
+from .holoform_store import HoloformStore
 
 def execute_query(query, call_graph):
     """
-    Executes an HQL query on a call graph.
+    Executes an HQL query on a call graph, or directly on the indexed call
+    edges of a HoloformStore.
     """
     match = re.match(r"MATCH \((\w+)\)-\[:CALLS\]->\((\w+)\) WHERE (\w+)\.id == \"(.*)\" RETURN (\w+)\.id", query)
 
@@ -14,6 +16,8 @@ def execute_query(query, call_graph):
         return_var = match.group(5)
 
         if where_var == callee_var and return_var == caller_var:
+            if isinstance(call_graph, HoloformStore):
+                return call_graph.get_callers(callee_id)
             results = []
             for caller, callees in call_graph.items():
                 if callee_id in callees:
@@ -1,4 +1,5 @@
-import json
+import io
+from .operation_records import write_json
 
 def serialize_holoform(holoform):
     """
@@ -14,19 +15,37 @@ def serialize_holoform(holoform):
     else:
         return "Unknown Holoform type"
 
+def write_holoform(holoform, file):
+    """
+    Writes the text of serialize_holoform(holoform) to a text file object,
+    streaming a function Holoform's operations instead of building it.
+    """
+    if holoform and holoform.get("holoform_type") == "function":
+        _write_function_holoform(holoform, file.write)
+    else:
+        file.write(serialize_holoform(holoform))
+
 def _serialize_function_holoform(holoform):
     """
     Serializes a function Holoform.
     """
-    lines = []
-    lines.append(f"Function: {holoform.get('id')}")
-    lines.append(f"Description: {holoform.get('description')}")
-    lines.append(f"Inputs: {', '.join(holoform.get('input_parameters', []))}")
-    lines.append(f"Output: {holoform.get('output_variable_name')}")
-    lines.append("Operations:")
+    buffer = io.StringIO()
+    _write_function_holoform(holoform, buffer.write)
+    return buffer.getvalue()
+
+def _write_function_holoform(holoform, write):
+    """
+    Writes a serialized function Holoform in one pass, each operation as
+    the JSON text json.dumps(op, default=to_json_value) would give.
+    """
+    write(f"Function: {holoform.get('id')}\n"
+          f"Description: {holoform.get('description')}\n"
+          f"Inputs: {', '.join(holoform.get('input_parameters', []))}\n"
+          f"Output: {holoform.get('output_variable_name')}\n"
+          "Operations:")
     for op in holoform.get("operations", []):
-        lines.append(f"  - {json.dumps(op)}")
-    return "\n".join(lines)
+        write("\n  - ")
+        write_json(op, write)
 
 def _serialize_class_holoform(holoform):
     """
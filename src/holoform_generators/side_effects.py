@@ -0,0 +1,346 @@
+import re
+from collections import deque
+from .dataflow import FunctionDataflow, holoform_content_hash
+from .operation_records import operation_callee_id
+
+# Operation values that are a bare variable, as rendered by ast_node_to_repr_str.
+NAME_REPR_PATTERN = re.compile(r"Name\(id='(\w+)'\)")
+
+# Paths already split by _split_path; there are few distinct ones per project.
+_SPLIT_PATHS = {}
+
+class SideEffectSummary:
+    """
+    The parameter paths a function reads and writes, itself or through the
+    functions it calls.
+
+    A path is a parameter name, optionally followed by ".attribute" or
+    "[*]" (some item; Holoforms do not keep subscript keys), e.g. "user",
+    "self.name" or "user[*]". Reads are tracked per parameter only.
+    """
+
+    __slots__ = ("reads", "writes")
+
+    def __init__(self, reads, writes):
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+
+    def __eq__(self, other):
+        return (isinstance(other, SideEffectSummary)
+                and self.reads == other.reads and self.writes == other.writes)
+
+    def __repr__(self):
+        return f"SideEffectSummary(reads={sorted(self.reads)}, writes={sorted(self.writes)})"
+
+    def to_dict(self):
+        return {"reads": sorted(self.reads), "writes": sorted(self.writes)}
+
+class SideEffectSummaries:
+    """
+    Interprocedural side-effect summaries for the functions of a project.
+
+    Each function's own reads and writes are found once per version of its
+    Holoform: uses and state modifications are traced back to parameters
+    through the function's def-use chains, so aliases such as "u = user"
+    are followed and reassigned parameters are not. Call sites bind the
+    callee's parameters (by position, or by keyword) to the caller's
+    parameters in the same way, a method called through self or cls
+    binding its first parameter to the target object, and callees are
+    resolved like _build_call_graph does.
+
+    Summaries are propagated bottom-up over the strongly connected
+    components of the call graph, callees first, iterating each component
+    with a worklist until it stops changing. update() recomputes only the
+    components whose functions changed, whose membership changed, or whose
+    callees' summaries changed; last_recomputed_components counts them.
+    """
+
+    def __init__(self, holoforms=()):
+        self.summaries = {}
+        self.last_recomputed_components = 0
+        self._hashes = {}
+        self._local = {}
+        self._parameters = {}
+        self._components = {}
+        self._order = []
+        self.update(holoforms)
+
+    def __getitem__(self, holoform_id):
+        return self.summaries[holoform_id]
+
+    def __contains__(self, holoform_id):
+        return holoform_id in self.summaries
+
+    def update(self, holoforms=(), removed_ids=()):
+        """
+        Adds or replaces function Holoforms, drops removed_ids, and brings
+        the summaries up to date. Returns the ids whose summary changed,
+        removed ones included. Takes a ProjectWatcher event's "holoforms"
+        and "removed_holoform_ids" as they are.
+        """
+        changed_functions = set()
+        graph_changed = False
+        for holoform_id in removed_ids:
+            if holoform_id in self._local:
+                for table in (self._hashes, self._local, self._parameters):
+                    del table[holoform_id]
+                changed_functions.add(holoform_id)
+                graph_changed = True
+
+        for holoform in holoforms:
+            if holoform.get("holoform_type") != "function":
+                continue
+            holoform_id = holoform.get("id")
+            content_hash = holoform_content_hash(holoform)
+            if self._hashes.get(holoform_id) == content_hash:
+                continue
+            self._hashes[holoform_id] = content_hash
+            old_local = self._local.get(holoform_id)
+            self._local[holoform_id] = _local_summary(FunctionDataflow(holoform))
+            if old_local is None or _callee_ids(old_local) != _callee_ids(self._local[holoform_id]):
+                graph_changed = True
+            self._parameters[holoform_id] = list(holoform.get("input_parameters", []))
+            changed_functions.add(holoform_id)
+
+        changed_summaries = set()
+        for holoform_id in changed_functions:
+            if holoform_id not in self._local and self.summaries.pop(holoform_id, None) is not None:
+                changed_summaries.add(holoform_id)
+
+        self.last_recomputed_components = 0
+        if graph_changed:
+            self._order = _strongly_connected_components(self._local)
+        components = {}
+        for component in self._order:
+            members = frozenset(component)
+            for holoform_id in component:
+                components[holoform_id] = members
+            if not self._is_dirty(component, members, changed_functions, changed_summaries):
+                continue
+            self.last_recomputed_components += 1
+            for holoform_id, summary in self._solve_component(component, members).items():
+                if self.summaries.get(holoform_id) != summary:
+                    self.summaries[holoform_id] = summary
+                    changed_summaries.add(holoform_id)
+        self._components = components
+        return changed_summaries
+
+    def _is_dirty(self, component, members, changed_functions, changed_summaries):
+        for holoform_id in component:
+            if holoform_id in changed_functions or self._components.get(holoform_id) != members:
+                return True
+            for callee_id, _ in self._local[holoform_id].calls:
+                if callee_id in changed_summaries and callee_id not in members:
+                    return True
+        return False
+
+    def _solve_component(self, component, members):
+        """
+        Iterates one component's summaries to a fixpoint, starting from the
+        functions' own effects so that summaries can shrink as well as grow.
+        """
+        current = {}
+        callers = {holoform_id: [] for holoform_id in component}
+        for holoform_id in component:
+            local = self._local[holoform_id]
+            current[holoform_id] = SideEffectSummary(local.reads, local.writes)
+            for callee_id, _ in local.calls:
+                if callee_id in members and holoform_id not in callers[callee_id]:
+                    callers[callee_id].append(holoform_id)
+
+        worklist = deque(component)
+        queued = set(component)
+        while worklist:
+            holoform_id = worklist.popleft()
+            queued.discard(holoform_id)
+            local = self._local[holoform_id]
+            reads = set(local.reads)
+            writes = set(local.writes)
+            for callee_id, bindings in local.calls:
+                callee = current.get(callee_id) if callee_id in members else self.summaries.get(callee_id)
+                if callee is None:
+                    continue
+                parameter_roots = _bind_parameters(self._parameters[callee_id], bindings)
+                reads.update(_translate_paths(callee.reads, parameter_roots))
+                writes.update(_translate_paths(callee.writes, parameter_roots))
+            summary = SideEffectSummary(reads, writes)
+            if summary != current[holoform_id]:
+                current[holoform_id] = summary
+                for caller_id in callers[holoform_id]:
+                    if caller_id not in queued:
+                        queued.add(caller_id)
+                        worklist.append(caller_id)
+        return current
+
+class _LocalSummary:
+    """
+    A function's own parameter reads and writes, and its call sites as
+    (callee id, {argument key: parameter roots}) pairs.
+    """
+
+    __slots__ = ("reads", "writes", "calls")
+
+    def __init__(self, reads, writes, calls):
+        self.reads = reads
+        self.writes = writes
+        self.calls = calls
+
+def _local_summary(dataflow):
+    chains = dataflow.def_use_chains()
+    operations = dataflow.operations
+
+    def parameter_roots(op_index, name):
+        """
+        Returns the parameters whose value name may hold at an operation,
+        following assignments of one variable to another.
+        """
+        roots = set()
+        stack = [(op_index, name)]
+        seen = set(stack)
+        while stack:
+            use = stack.pop()
+            for def_index in chains.get(use, ()):
+                if def_index is None:
+                    roots.add(use[1])
+                    continue
+                operation = operations[def_index]
+                match = NAME_REPR_PATTERN.fullmatch(operation.get("value") or "")
+                if operation.get("op_type") == "assignment" and match:
+                    alias = (def_index, match.group(1))
+                    if alias not in seen:
+                        seen.add(alias)
+                        stack.append(alias)
+        return roots
+
+    def expression_roots(op_index, expression):
+        match = NAME_REPR_PATTERN.fullmatch(expression or "")
+        return parameter_roots(op_index, match.group(1)) if match else set()
+
+    reads = set()
+    writes = set()
+    calls = []
+    for op_index, operation in enumerate(operations):
+        for name in dataflow.op_uses[op_index]:
+            reads.update(parameter_roots(op_index, name))
+
+        op_type = operation.get("op_type")
+        subtype = operation.get("subtype")
+        if subtype == "attribute_assignment":
+            suffix = "." + operation["attribute"]
+            writes.update(root + suffix for root in expression_roots(op_index, operation["target_object"]))
+        elif subtype == "dict_key_assignment":
+            writes.update(root + "[*]" for root in expression_roots(op_index, operation["target_dict"]))
+        elif op_type in ("function_call", "constructor_call"):
+            bindings = {}
+            # A method resolved through self or cls is called with its target
+            # object as the first parameter, ahead of the positional arguments.
+            is_method = operation.get("callee_id") is not None and operation.get("target_object") is not None
+            if is_method:
+                roots = expression_roots(op_index, operation["target_object"])
+                if roots:
+                    bindings["arg0"] = roots
+            for key, argument in operation["parameter_mapping"].items():
+                roots = expression_roots(op_index, argument)
+                if not roots:
+                    continue
+                if is_method and isinstance(key, str) and key.startswith("arg") and key[3:].isdigit():
+                    key = f"arg{int(key[3:]) + 1}"
+                bindings[key] = roots
+            calls.append((operation_callee_id(operation), bindings))
+    return _LocalSummary(frozenset(reads), frozenset(writes), calls)
+
+def _callee_ids(local_summary):
+    return [callee_id for callee_id, _ in local_summary.calls]
+
+def _bind_parameters(parameters, bindings):
+    """
+    Maps a callee's parameter names to the caller parameters bound to them.
+    """
+    parameter_roots = {}
+    for key, roots in bindings.items():
+        if not isinstance(key, str):
+            # The None key of a **kwargs splat names no parameter.
+            continue
+        if key.startswith("arg") and key[3:].isdigit():
+            position = int(key[3:])
+            if position < len(parameters):
+                parameter_roots[parameters[position]] = roots
+        elif key in parameters:
+            parameter_roots[key] = roots
+    return parameter_roots
+
+def _translate_paths(paths, parameter_roots):
+    """
+    Rewrites callee paths onto the caller parameters bound to their roots,
+    dropping paths on parameters the call does not bind to one.
+    """
+    for path in paths:
+        split = _SPLIT_PATHS.get(path)
+        if split is None:
+            split = _SPLIT_PATHS[path] = _split_path(path)
+        root, suffix = split
+        for caller_root in parameter_roots.get(root, ()):
+            yield caller_root + suffix
+
+def _split_path(path):
+    """
+    Splits a path into its parameter and the rest, e.g. "user.name" into
+    ("user", ".name").
+    """
+    end = len(path)
+    for separator in (".", "["):
+        position = path.find(separator)
+        if position != -1 and position < end:
+            end = position
+    return path[:end], path[end:]
+
+def _strongly_connected_components(local_summaries):
+    """
+    Returns the components of the call graph between the summarized
+    functions with Tarjan's algorithm, without recursing. Each component
+    comes after every component it calls.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for start in local_summaries:
+        if start in index:
+            continue
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(local_summaries[start].calls))]
+        while work:
+            node, calls = work[-1]
+            for callee_id, _ in calls:
+                if callee_id not in local_summaries:
+                    continue
+                if callee_id not in index:
+                    index[callee_id] = lowlink[callee_id] = counter
+                    counter += 1
+                    stack.append(callee_id)
+                    on_stack.add(callee_id)
+                    work.append((callee_id, iter(local_summaries[callee_id].calls)))
+                    break
+                if callee_id in on_stack:
+                    lowlink[node] = min(lowlink[node], index[callee_id])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.reverse()
+                    components.append(component)
+    return components
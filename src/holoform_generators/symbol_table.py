@@ -0,0 +1,268 @@
+from array import array
+from collections.abc import Mapping
+from . import operation_records
+from .operation_records import OperationRecord
+
+# Every token of an encoded value is one unsigned 32-bit int: a tag in the
+# low bits and a payload above them. Lists and dicts are followed by their
+# items, records by a bitmask of their set slots and then the slot values.
+TAG_BITS = 3
+TAG_NONE = 0
+TAG_STR = 1     # payload: symbol id
+TAG_LIST = 2    # payload: number of items
+TAG_DICT = 3    # payload: number of key/value pairs
+TAG_RECORD = 4  # payload: index in RECORD_TYPES
+TAG_INT = 5     # payload: the int itself
+TAG_FALSE = 6
+TAG_TRUE = 7
+MAX_PAYLOAD = (1 << (32 - TAG_BITS)) - 1
+
+RECORD_TYPES = tuple(
+    value for value in vars(operation_records).values()
+    if isinstance(value, type) and issubclass(value, OperationRecord) and value is not OperationRecord
+)
+RECORD_TYPE_INDEX = {record_type: index for index, record_type in enumerate(RECORD_TYPES)}
+# Record field names are slots, not interned dict keys.
+RECORD_FIELDS = frozenset(name for record_type in RECORD_TYPES for name in record_type.__slots__)
+
+class SymbolTable:
+    """
+    Assigns small consecutive integer ids to strings.
+
+    One table is meant to be shared by all the Holoforms of a project, so
+    an identifier or repr string that occurs a thousand times is stored
+    once and every occurrence, and every comparison, is an int.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __contains__(self, string):
+        return string in self.ids
+
+    def intern(self, string):
+        """
+        Returns the id of string, assigning the next free one if it is new.
+        """
+        symbol_id = self.ids.get(string)
+        if symbol_id is None:
+            symbol_id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+        return symbol_id
+
+    def lookup(self, string):
+        """
+        Returns the id of string, or None if it was never interned.
+        """
+        return self.ids.get(string)
+
+    def resolve(self, symbol_id):
+        return self.strings[symbol_id]
+
+class CompactHoloform(Mapping):
+    """
+    A read-only Holoform stored as one array of symbol-table tokens.
+
+    Reads like the Holoform it was built from: each key's value is decoded,
+    and its strings resolved, only when it is accessed, into fresh lists,
+    dicts and operation records. symbol_ids() answers questions about the
+    operations with integer ids, without resolving anything.
+    """
+
+    __slots__ = ("table", "tokens", "offsets")
+
+    def __init__(self, holoform, table):
+        self.table = table
+        self.tokens = array("I")
+        self.offsets = {}
+        for key, value in holoform.items():
+            self.offsets[key] = len(self.tokens)
+            _encode(value, table, self.tokens)
+
+    def __getitem__(self, key):
+        return _decode(self.tokens, self.offsets[key], self.table.strings)[0]
+
+    def __iter__(self):
+        return iter(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __repr__(self):
+        return f"CompactHoloform({self.get('id')!r}, {len(self.tokens)} tokens)"
+
+    def to_dict(self):
+        """
+        Returns the Holoform with every value decoded.
+        """
+        return dict(self.items())
+
+    def symbol_ids(self, field):
+        """
+        Returns the symbol ids of the string values of a field, e.g.
+        "target_function_name", in every operation and nested operation,
+        in one scan of the tokens and without resolving any string.
+        """
+        position = self.offsets.get("operations")
+        if position is None:
+            return []
+        field_id = self.table.lookup(field)
+        if field_id is None and field not in RECORD_FIELDS:
+            # No dict key or record slot has this name.
+            return []
+        tokens = self.tokens
+        symbol_ids = []
+        # Each frame is [tag, slot names, items read, items in total, last dict key].
+        stack = []
+        while True:
+            token = tokens[position]
+            position += 1
+            tag = token & 7
+            payload = token >> TAG_BITS
+            if stack:
+                frame = stack[-1]
+                if frame[0] == TAG_RECORD:
+                    matches = frame[1][frame[2]] == field
+                elif frame[0] == TAG_DICT and frame[2] % 2 == 0:
+                    frame[4] = payload if tag == TAG_STR else None
+                    matches = False
+                else:
+                    # A key that is not a string, like **kwargs' None, has
+                    # frame[4] None and must not match a field never interned.
+                    matches = frame[0] == TAG_DICT and field_id is not None and frame[4] == field_id
+                frame[2] += 1
+                if matches and tag == TAG_STR:
+                    symbol_ids.append(payload)
+
+            if tag == TAG_LIST and payload:
+                stack.append([tag, None, 0, payload, None])
+            elif tag == TAG_DICT and payload:
+                stack.append([tag, None, 0, 2 * payload, None])
+            elif tag == TAG_RECORD:
+                mask = tokens[position]
+                position += 1
+                names = [name for index, name in enumerate(RECORD_TYPES[payload].__slots__) if mask >> index & 1]
+                if names:
+                    stack.append([tag, names, 0, len(names), None])
+
+            while stack and stack[-1][2] == stack[-1][3]:
+                stack.pop()
+            if not stack:
+                return symbol_ids
+
+def compact_holoforms(holoforms, table=None):
+    """
+    Returns a project's Holoforms as CompactHoloforms sharing one symbol
+    table, and the table.
+    """
+    table = SymbolTable() if table is None else table
+    return [CompactHoloform(holoform, table) for holoform in holoforms], table
+
+def _encode(value, table, tokens):
+    """
+    Appends the tokens of a value to tokens, in preorder and without
+    recursing.
+    """
+    append = tokens.append
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str:
+            append(_payload(table.intern(value)) << TAG_BITS | TAG_STR)
+        elif value is None:
+            append(TAG_NONE)
+        elif kind is list:
+            append(_payload(len(value)) << TAG_BITS | TAG_LIST)
+            stack.extend(reversed(value))
+        elif kind is bool:
+            append(TAG_TRUE if value else TAG_FALSE)
+        elif kind is int and value >= 0:
+            append(_payload(value) << TAG_BITS | TAG_INT)
+        elif kind in RECORD_TYPE_INDEX:
+            append(RECORD_TYPE_INDEX[kind] << TAG_BITS | TAG_RECORD)
+            mask = 0
+            values = []
+            for index, name in enumerate(kind.__slots__):
+                item = getattr(value, name, _UNSET)
+                if item is not _UNSET:
+                    mask |= 1 << index
+                    values.append(item)
+            append(mask)
+            stack.extend(reversed(values))
+        elif isinstance(value, Mapping):
+            append(_payload(len(value)) << TAG_BITS | TAG_DICT)
+            for key, item in reversed(list(value.items())):
+                stack.append(item)
+                stack.append(key)
+        else:
+            raise TypeError(f"Cannot encode {kind.__name__} values in a CompactHoloform")
+
+def _payload(value):
+    if value > MAX_PAYLOAD:
+        raise ValueError(f"{value} does not fit in a CompactHoloform token")
+    return value
+
+def _decode(tokens, position, strings):
+    """
+    Decodes the value starting at position and returns it with the
+    position after it, building containers on an explicit stack.
+    """
+    # Each frame is [kind, record type or None, slot names, remaining, items].
+    stack = []
+    while True:
+        token = tokens[position]
+        position += 1
+        tag = token & 7
+        payload = token >> TAG_BITS
+        if tag == TAG_STR:
+            value = strings[payload]
+        elif tag == TAG_NONE:
+            value = None
+        elif tag == TAG_LIST or tag == TAG_DICT:
+            remaining = payload if tag == TAG_LIST else 2 * payload
+            if remaining:
+                stack.append([tag, None, None, remaining, []])
+                continue
+            value = [] if tag == TAG_LIST else {}
+        elif tag == TAG_RECORD:
+            record_type = RECORD_TYPES[payload]
+            mask = tokens[position]
+            position += 1
+            names = [name for index, name in enumerate(record_type.__slots__) if mask >> index & 1]
+            if names:
+                stack.append([tag, record_type, names, len(names), []])
+                continue
+            value = record_type.__new__(record_type)
+        elif tag == TAG_INT:
+            value = payload
+        else:
+            value = tag == TAG_TRUE
+
+        while stack:
+            frame = stack[-1]
+            frame[4].append(value)
+            frame[3] -= 1
+            if frame[3]:
+                break
+            stack.pop()
+            value = _build(frame)
+        else:
+            return value, position
+
+def _build(frame):
+    kind, record_type, names, _, items = frame
+    if kind == TAG_LIST:
+        return items
+    if kind == TAG_DICT:
+        return dict(zip(items[::2], items[1::2]))
+    record = record_type.__new__(record_type)
+    for name, item in zip(names, items):
+        setattr(record, name, item)
+    return record
+
+_UNSET = object()
@@ -0,0 +1,52 @@
+import unittest
+import ast
+from .ast_utils import REPR_CACHE, RenderCache, ast_node_to_repr_str
+
+def parse_expr(code):
+    return ast.parse(code, mode="eval").body
+
+class TestRenderCache(unittest.TestCase):
+    def test_cached_output_matches_uncached(self):
+        cache = RenderCache()
+        for code in ("x", "1.5", "'s'", "[]", "[a, 1]", "a + b * 2", "f(x, k=[], **kw)", "obj.attr", "a < b"):
+            node = parse_expr(code)
+            self.assertEqual(ast_node_to_repr_str(node, cache), ast_node_to_repr_str(node, None), code)
+
+    def test_structurally_equal_expressions_share_one_string(self):
+        cache = RenderCache()
+        first = ast_node_to_repr_str(parse_expr("save(self, a + 1)"), cache)
+        self.assertEqual(cache.misses, 6)
+
+        second = ast_node_to_repr_str(parse_expr("save(self, a + 1)"), cache)
+        self.assertIs(first, second)
+        # The call's key is built from its children, so they are hits too.
+        self.assertEqual(cache.hits, 6)
+        self.assertEqual(cache.hit_rate, 0.5)
+        self.assertGreater(cache.bytes_saved, len(first))
+
+        ast_node_to_repr_str(parse_expr("save(self, b + 1)"), cache)
+        self.assertEqual(cache.stats()["misses"], 9)
+
+    def test_cache_is_opt_in(self):
+        stats = REPR_CACHE.stats()
+        ast_node_to_repr_str(parse_expr("save(self, a + 1)"))
+        self.assertEqual(REPR_CACHE.stats(), stats)
+
+    def test_lru_is_bounded(self):
+        cache = RenderCache(maxsize=2)
+        for name in ("a", "b", "a", "c"):
+            ast_node_to_repr_str(parse_expr(name), cache)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+
+        ast_node_to_repr_str(parse_expr("a"), cache)
+        self.assertEqual(cache.hits, 2)
+        ast_node_to_repr_str(parse_expr("b"), cache)
+        self.assertEqual(cache.misses, 4)
+
+        cache.clear()
+        self.assertEqual(cache.stats()["size"], 0)
+        self.assertEqual(cache.hits, 0)
+
+if __name__ == '__main__':
+    unittest.main()
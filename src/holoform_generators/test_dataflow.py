@@ -0,0 +1,145 @@
+import unittest
+import ast
+from .main_generator import generate_holoform_from_code_string
+from .dataflow import DataflowCache, analyze_function
+from .operation_records import holoform_to_dict
+
+CODE = """
+def accumulate(items, flag):
+    total = 0
+    index = 0
+    while index:
+        total = total + index
+        index = advance(index)
+    if flag:
+        total = 1
+    else:
+        log(total)
+    try:
+        result = finish(total)
+    except ValueError:
+        result = 0
+    unused = 5
+    return result
+"""
+
+class TestDataflow(unittest.TestCase):
+    # Flat operation indexes: 0 total = 0, 1 index = 0, 2 while, 3 total =
+    # total + index, 4 index = advance(), 5 if, 6 total = 1, 7 log(),
+    # 8 result = finish(), 9 result = 0, 10 unused = 5, 11 return.
+    def setUp(self):
+        self.holoform = generate_holoform_from_code_string(CODE)
+        self.dataflow = analyze_function(self.holoform, cache=None)
+
+    def test_operations_are_flattened_in_holoform_order(self):
+        self.assertEqual([op["step_id"] for op in self.dataflow.operations], [
+            "s_assign_0", "s_assign_1", "s_while_2", "s_assign_0", "s_function_call_1", "s_if_3",
+            "s_assign_0", "s_function_call_0", "s_function_call_0", "s_assign_0", "s_assign_5", "s_return_6"])
+
+    def test_reaching_definitions_follow_loops_and_branches(self):
+        chains = self.dataflow.def_use_chains()
+        # The loop body sees the definitions from before the loop and its own.
+        self.assertEqual(chains[(3, "total")], [0, 3])
+        self.assertEqual(chains[(4, "index")], [1, 4])
+        # Only the else branch lets the loop's total reach the try.
+        self.assertEqual(chains[(8, "total")], [0, 3, 6])
+        # The handler is entered from the try body, whose definition it overwrites.
+        self.assertEqual(chains[(11, "result")], [8, 9])
+        self.assertEqual(chains[(5, "flag")], [None])
+        self.assertEqual(chains[(8, "finish")], [])
+        self.assertEqual(self.dataflow.reaching_definitions(7), [
+            (None, "items"), (None, "flag"), (0, "total"), (1, "index"), (3, "total"), (4, "index")])
+        self.assertEqual(self.dataflow.reaching_definitions(7, "total"), [(0, "total"), (3, "total")])
+
+    def test_liveness_and_dead_definitions(self):
+        self.assertEqual(self.dataflow.dead_definitions(), [(10, "unused")])
+        self.assertEqual(self.dataflow.live_variables(10), ["result"])
+        self.assertEqual(self.dataflow.live_variables(0),
+                         ["advance", "finish", "flag", "log"])
+
+    @unittest.skipUnless(hasattr(ast, "Match"), "match statements need Python 3.10")
+    def test_loops_with_and_match_blocks(self):
+        code = """
+def walk(items, mode):
+    count = 0
+    for item in items:
+        count = count + item
+    with lock(mode) as guard:
+        total = count
+    match mode:
+        case "fast":
+            total = 0
+        case other:
+            log(other)
+    return total
+"""
+        holoform = generate_holoform_from_code_string(code)
+        dataflow = analyze_function(holoform, cache=None)
+        # 0 count = 0, 1 for, 2 count = count + item, 3 with, 4 total = count,
+        # 5 match, 6 case "fast", 7 total = 0, 8 case other, 9 log(), 10 return.
+        cache = DataflowCache()
+        analyze_function(holoform, cache=cache)
+        hit = analyze_function(holoform, cache=cache)
+        self.assertEqual([id(op) for op in hit.operations], [id(op) for op in dataflow.operations])
+        chains = dataflow.def_use_chains()
+        self.assertEqual(chains[(2, "item")], [1])
+        self.assertEqual(chains[(4, "count")], [0, 2])
+        self.assertEqual(chains[(9, "other")], [8])
+        # An unmatched subject falls through every case.
+        self.assertEqual(chains[(10, "total")], [4, 7])
+        self.assertEqual(dataflow.dead_definitions(), [(3, "guard")])
+
+    def test_handlers_see_the_state_before_and_within_the_try_body(self):
+        code = """
+def load(path):
+    x = 1
+    try:
+        x = compute(path)
+        x = parse(x)
+    except ValueError:
+        y = x
+    return y
+"""
+        dataflow = analyze_function(generate_holoform_from_code_string(code), cache=None)
+        # 0 x = 1, 1 x = compute(), 2 x = parse(), 3 y = x, 4 return.
+        chains = dataflow.def_use_chains()
+        self.assertEqual(chains[(3, "x")], [0, 1, 2])
+        self.assertEqual(dataflow.dead_definitions(), [])
+
+    def test_results_are_cached_by_content(self):
+        cache = DataflowCache(maxsize=2)
+        first = analyze_function(self.holoform, cache=cache)
+        regenerated = generate_holoform_from_code_string(CODE)
+        self.assertIs(analyze_function(regenerated, cache=cache).reach_in, first.reach_in)
+        plain = holoform_to_dict(regenerated)
+        self.assertIs(analyze_function(plain, cache=cache).live_in, first.live_in)
+        changed = generate_holoform_from_code_string(CODE.replace("unused = 5", "unused = total"))
+        self.assertIsNot(analyze_function(changed, cache=cache).reach_in, first.reach_in)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 2, 2))
+
+    def test_cache_hit_carries_the_requesting_holoform(self):
+        cache = DataflowCache()
+        analyze_function(self.holoform, cache=cache)
+        renamed = holoform_to_dict(generate_holoform_from_code_string(CODE.replace("def ", "def renamed_", 1)))
+        hit = analyze_function(renamed, cache=cache)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(hit.holoform_id, renamed["id"])
+        uncached = analyze_function(renamed, cache=None)
+        self.assertEqual(len(hit.operations), len(uncached.operations))
+        for operation, expected in zip(hit.operations, uncached.operations):
+            self.assertIs(operation, expected)
+        self.assertEqual(hit.def_use_chains(), uncached.def_use_chains())
+
+    def test_large_function_does_not_recurse(self):
+        lines = ["def big(x):"]
+        for i in range(3000):
+            lines.append(f"    if x:\n        v{i} = x\n    x = v{i}")
+        lines.append("    return x")
+        dataflow = analyze_function(generate_holoform_from_code_string("\n".join(lines)), cache=None)
+        chains = dataflow.def_use_chains()
+        ret = len(dataflow.operations) - 1
+        self.assertEqual(chains[(ret, "x")], [ret - 1])
+        self.assertEqual(dataflow.dead_definitions(), [])
+
+if __name__ == '__main__':
+    unittest.main()
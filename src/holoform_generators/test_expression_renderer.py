@@ -0,0 +1,59 @@
+import unittest
+import ast
+from .ast_utils import ast_node_to_repr_str
+from .differential_analyzer import DifferentialAnalyzer
+from .expression_renderer import RenderCache, RenderProfile, render_expression
+from .holochain_parser import HoloChainParser
+
+def parse_expr(code):
+    return ast.parse(code, mode="eval").body
+
+class TestExpressionRenderer(unittest.TestCase):
+    def test_each_dialect_renders_through_its_profile(self):
+        node = parse_expr("customer.tier[k] + f(x, 2) * 3")
+        self.assertEqual(
+            ast_node_to_repr_str(node, None),
+            "BinOp(UnsupportedASTNode(Subscript), Add, "
+            "BinOp(Call(func=Name(id='f'), args=[Name(id='x'), Constant(value_type='number')]), Mult, "
+            "Constant(value_type='number')))")
+        self.assertEqual(DifferentialAnalyzer._format_expression(node), "customer.tier[k] + f(x, 2) * 3")
+        self.assertEqual(HoloChainParser()._format_expression(node), "cust.tier[k]+f(x,2)*3")
+
+    def test_dialect_quirks_are_kept(self):
+        self.assertEqual(DifferentialAnalyzer._format_expression(parse_expr("not a > 'b'")), "!a > 'b'")
+        self.assertEqual(DifferentialAnalyzer._format_expression(parse_expr("-a")), "expr")
+        self.assertEqual(DifferentialAnalyzer._format_expression(parse_expr("a // b")), "a ? b")
+        self.assertEqual(HoloChainParser()._format_expression(parse_expr("a // b")), "a+b")
+        self.assertEqual(HoloChainParser()._format_expression(parse_expr("rate == 'gold'")), "expr")
+
+    def test_holochain_constants_render_their_value(self):
+        parser = HoloChainParser()
+        self.assertEqual(parser._format_expression(parse_expr("0.15")), "0.15")
+        self.assertEqual(parser._format_expression(parse_expr("'gold'")), '"gold"')
+        records = parser.parse_code("def f(cust):\n    gold_rate = 0.15\n", "f.py").splitlines()
+        self.assertIn("C:gold_rate=0.15#f.py@L2", records)
+
+    def test_deep_expressions_do_not_recurse(self):
+        node = ast.Name(id="a")
+        for _ in range(5000):
+            node = ast.BinOp(left=node, op=ast.Add(), right=ast.Name(id="b"))
+
+        rendered = DifferentialAnalyzer._format_expression(node)
+        self.assertEqual(rendered, "a" + " + b" * 5000)
+        cache = RenderCache()
+        self.assertEqual(ast_node_to_repr_str(node, cache), ast_node_to_repr_str(node, None))
+        self.assertEqual(cache.misses, 5002)
+        names = []
+        ast_node_to_repr_str(node, names=names)
+        self.assertEqual(names, ["a"] + ["b"] * 5000)
+
+    def test_custom_profile_with_context(self):
+        profile = RenderProfile("upper", {
+            ast.Name: (None, lambda node, parts, suffix: node.id.upper() + suffix, None),
+            ast.Tuple: (lambda node: node.elts, lambda node, parts, suffix: "|".join(parts), None),
+        }, fallback=(None, lambda node, parts, suffix: "?", None))
+
+        self.assertEqual(render_expression(parse_expr("(a, b, 1)"), profile, context="!"), "A!|B!|?")
+
+if __name__ == '__main__':
+    unittest.main()
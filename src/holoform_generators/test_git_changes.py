@@ -0,0 +1,97 @@
+import unittest
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest import mock
+from . import project_parser
+from .git_changes import get_changed_files
+from .holoform_store import HoloformStore
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestGitIncrementalUpdate(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self._tmp.name, "repo")
+        os.makedirs(os.path.join(self.repo, "pkg"))
+        self._git("init", "-q")
+        self._write("pkg/main.py", "def main(x):\n    return helper(x)\n")
+        self._write("pkg/helper.py", "def helper(a):\n    return a\n")
+        self._write("pkg/untouched.py", "def untouched():\n    return 0\n")
+        self._commit("base")
+        self.store = HoloformStore(os.path.join(self._tmp.name, "store.sqlite"))
+        project_parser.parse_project(self.repo, store=self.store)
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def _git(self, *args):
+        return subprocess.run(["git", "-C", self.repo, "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                              check=True, capture_output=True, text=True).stdout.strip()
+
+    def _write(self, relpath, code):
+        with open(os.path.join(self.repo, relpath), "w") as f:
+            f.write(code)
+
+    def _commit(self, message):
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", message)
+        return self._git("rev-parse", "HEAD")
+
+    def test_update_project_touches_only_changed_files(self):
+        base = self._git("rev-parse", "HEAD")
+        self._write("pkg/main.py", "def main(x):\n    return report(x)\n")
+        os.rename(os.path.join(self.repo, "pkg/helper.py"), os.path.join(self.repo, "pkg/helpers.py"))
+        self._write("pkg/new.py", "def new():\n    main(1)\n")
+        self._write("README.txt", "not python\n")
+        head = self._commit("change")
+
+        changes = get_changed_files(self.repo, base, head)
+        with mock.patch.object(project_parser, "_parse_file", wraps=project_parser._parse_file) as parse_file:
+            result = project_parser.update_project(self.repo, changes, store=self.store)
+
+        self.assertEqual(parse_file.call_count, 3)
+        self.assertEqual(result["deleted"], [os.path.join(self.repo, "pkg", "helper.py")])
+        self.assertEqual(sorted(result["updated"]), sorted(
+            os.path.join(self.repo, "pkg", name) for name in ("helpers.py", "main.py", "new.py")))
+
+        fresh_store = HoloformStore(os.path.join(self._tmp.name, "fresh.sqlite"))
+        self.addCleanup(fresh_store.close)
+        _, call_graph = project_parser.parse_project(self.repo, store=fresh_store)
+        self.assertEqual(project_parser._build_call_graph(self.store), call_graph)
+
+    def test_changed_files_are_parsed_from_git(self):
+        base = self._git("rev-parse", "HEAD")
+        self._write("pkg/main.py", "def main(x):\n    return x\n")
+        os.remove(os.path.join(self.repo, "pkg/untouched.py"))
+        os.rename(os.path.join(self.repo, "pkg/helper.py"), os.path.join(self.repo, "pkg/help er\u00e9.py"))
+        os.symlink("main.py", os.path.join(self.repo, "pkg/link.py"))
+        head = self._commit("change")
+        os.remove(os.path.join(self.repo, "pkg/link.py"))
+        self._write("pkg/link.py", "def link():\n    return 1\n")
+
+        self.assertEqual(sorted(get_changed_files(self.repo, base, head)), [
+            ("A", "pkg/help er\u00e9.py"), ("A", "pkg/link.py"),
+            ("D", "pkg/helper.py"), ("D", "pkg/untouched.py"), ("M", "pkg/main.py"),
+        ])
+        # Against the working tree the symlink is now a file: a type change.
+        self.assertEqual(get_changed_files(self.repo, head), [("M", "pkg/link.py")])
+
+    def test_subdirectory_project_gets_paths_relative_to_it(self):
+        project = os.path.join(self.repo, "pkg")
+        store = HoloformStore(os.path.join(self._tmp.name, "pkg.sqlite"))
+        self.addCleanup(store.close)
+        project_parser.parse_project(project, store=store)
+        base = self._git("rev-parse", "HEAD")
+        self._write("top.py", "def top():\n    return 1\n")
+        self._write("pkg/helper.py", "def helper(a):\n    return a + 1\n")
+        head = self._commit("change")
+
+        changes = get_changed_files(project, base, head)
+        self.assertEqual(changes, [("M", "helper.py")])
+        result = project_parser.update_project(project, changes, store=store)
+        self.assertEqual(result["updated"], [os.path.join(project, "helper.py")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import ast
+import json
+import os
+import tempfile
+from unittest import mock
+from . import holoform_file as holoform_file_module
+from .main_generator import generate_holoforms_from_tree
+from .operation_records import OperationRecord, to_json_value
+from .holoform_file import HoloformFile, HoloformFileWriter, HoloformView, ListView, OperationView, write_holoform_file
+
+CODE = """
+def load(path, retries):
+    data = read(path)
+    for attempt in attempts(retries):
+        if data:
+            data = read(path)
+    cache["last"] = data
+    return data
+
+class Loader:
+    def run(self, path):
+        self.result = load(path, 3)
+        self.log(path, **options)
+"""
+
+class TestHoloformFile(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "project.hlf")
+        self.holoforms = generate_holoforms_from_tree(ast.parse(CODE), CODE.splitlines())
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_by_id_and_in_order(self):
+        self.assertEqual(write_holoform_file(self.path, self.holoforms), 3)
+        with HoloformFile(self.path) as holoform_file:
+            self.assertEqual(list(holoform_file), ["Loader.run_auto_v1", "Loader_auto_v1", "load_auto_v1"])
+            for holoform in self.holoforms:
+                loaded = holoform_file[holoform["id"]]
+                self.assertEqual(json.dumps(loaded, default=to_json_value), json.dumps(holoform, default=to_json_value))
+            self.assertIsInstance(holoform_file["load_auto_v1"]["operations"][0], OperationRecord)
+            self.assertEqual(json.dumps(list(holoform_file.iter_holoforms()), default=to_json_value),
+                             json.dumps(self.holoforms, default=to_json_value))
+            self.assertNotIn("missing_auto_v1", holoform_file)
+            self.assertIsNone(holoform_file.get("missing_auto_v1"))
+
+    def test_lookup_resolves_only_the_strings_it_needs(self):
+        write_holoform_file(self.path, self.holoforms)
+        with HoloformFile(self.path) as holoform_file:
+            holoform_file["Loader_auto_v1"]
+            resolved = {string for string in holoform_file.strings if string is not None}
+        self.assertIn("Loader_auto_v1", resolved)
+        self.assertNotIn("attempts", resolved)
+        self.assertNotIn("retries", resolved)
+
+    def test_views_decode_only_what_is_read(self):
+        write_holoform_file(self.path, self.holoforms)
+        with HoloformFile(self.path) as holoform_file:
+            view = holoform_file.view("load_auto_v1")
+            self.assertIsInstance(view, HoloformView)
+            self.assertIsInstance(view.operations, ListView)
+            call = view.operations[0]
+            self.assertIsInstance(call, OperationView)
+            self.assertEqual((call.op_type, call["target_function_name"]), ("function_call", "read"))
+            self.assertIn("def_use", call)
+            self.assertNotIn("target_object", call)
+            self.assertEqual(call.parameter_mapping, {"arg0": "Name(id='path')"})
+            resolved = {string for string in holoform_file.strings if string is not None}
+            self.assertNotIn("attempts", resolved)
+            self.assertNotIn("Auto-generated Holoform (default description).", resolved)
+
+            views = list(holoform_file.iter_views())
+            self.assertEqual(views, self.holoforms)
+            self.assertEqual(json.dumps(views, default=to_json_value), json.dumps(self.holoforms, default=to_json_value))
+            self.assertEqual(views[0].operations.decode(), self.holoforms[0]["operations"])
+            # parameter_mapping has a None key for **options.
+            log_arguments = holoform_file.view("Loader.run_auto_v1").operations[-1].parameter_mapping
+            self.assertEqual(dict(log_arguments), {"arg0": "Name(id='path')", None: "Name(id='options')"})
+            self.assertEqual(log_arguments[None], "Name(id='options')")
+            with self.assertRaises(AttributeError):
+                view.no_such_field
+        with self.assertRaises(ValueError):
+            view.id
+
+    def test_first_holoform_wins_for_a_repeated_id(self):
+        with HoloformFileWriter(self.path) as writer:
+            writer.write({"id": "main_auto_v1", "holoform_type": "function", "description": "first"})
+            writer.write({"description": "no id"})
+            writer.write({"id": "main_auto_v1", "holoform_type": "function", "description": "second"})
+        with HoloformFile(self.path) as holoform_file:
+            self.assertEqual(len(holoform_file), 1)
+            self.assertEqual(holoform_file["main_auto_v1"]["description"], "first")
+            self.assertEqual(len(list(holoform_file.iter_holoforms())), 3)
+
+    def test_records_decode_by_the_schema_they_were_written_with(self):
+        # A file written when the record classes were defined in another
+        # order still decodes by name.
+        reordered = list(reversed(holoform_file_module.RECORD_TYPES))
+        with mock.patch.object(holoform_file_module, "RECORD_TYPE_INDEX",
+                               {record_type: index for index, record_type in enumerate(reordered)}), \
+                mock.patch.object(holoform_file_module, "RECORD_SCHEMA",
+                                  [[record_type.__name__, list(record_type.__slots__)] for record_type in reordered]):
+            write_holoform_file(self.path, self.holoforms)
+        with HoloformFile(self.path) as holoform_file:
+            self.assertEqual(json.dumps(list(holoform_file.iter_holoforms()), default=to_json_value),
+                             json.dumps(self.holoforms, default=to_json_value))
+
+        # A slot that no longer exists cannot be decoded.
+        schema = [[name, [slot.replace("target_function_name", "callee_name") for slot in slots]]
+                  for name, slots in holoform_file_module.RECORD_SCHEMA]
+        with mock.patch.object(holoform_file_module, "RECORD_SCHEMA", schema):
+            write_holoform_file(self.path, self.holoforms)
+        with self.assertRaisesRegex(ValueError, "callee_name"):
+            HoloformFile(self.path)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "w") as f:
+            json.dump(self.holoforms, f, default=to_json_value)
+        with self.assertRaises(ValueError):
+            HoloformFile(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
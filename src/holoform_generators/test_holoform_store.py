@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+from . import project_parser
+from .holoform_store import HoloformStore
+from .query_api import execute_query
+
+MAIN_CODE = """
+def main(x):
+    total = helper(x, 1)
+    report(total)
+    return total
+
+def idle():
+    return 0
+"""
+
+HELPER_CODE = """
+def helper(a, b):
+    return a + b
+
+def report(value):
+    log = helper(value, 0)
+    return log
+"""
+
+class TestHoloformStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project_dir = os.path.join(self._tmp.name, "project")
+        os.makedirs(self.project_dir)
+        for name, code in (("main.py", MAIN_CODE), ("helper.py", HELPER_CODE)):
+            with open(os.path.join(self.project_dir, name), "w") as f:
+                f.write(code)
+        self.store = HoloformStore(os.path.join(self._tmp.name, "store.sqlite"))
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_store_uses_wal_journal(self):
+        (mode,) = self.store.conn.execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode, "wal")
+
+    def test_call_graph_from_store_matches_in_memory(self):
+        holoforms, call_graph = project_parser.parse_project(self.project_dir, store=self.store)
+
+        self.assertEqual(project_parser._build_call_graph(self.store), call_graph)
+        self.assertEqual(sorted(h["id"] for h in self.store.iter_holoforms()), sorted(h["id"] for h in holoforms))
+
+    def test_lookup_by_id_and_callers_query(self):
+        project_parser.parse_project(self.project_dir, store=self.store)
+
+        self.assertEqual(self.store.get_holoform("report_auto_v1")["input_parameters"], ["value"])
+        self.assertIsNone(self.store.get_holoform("missing_auto_v1"))
+        query = 'MATCH (caller)-[:CALLS]->(callee) WHERE callee.id == "helper_auto_v1" RETURN caller.id'
+        self.assertEqual(sorted(execute_query(query, self.store)), ["main_auto_v1", "report_auto_v1"])
+
+    def test_upsert_replaces_file_and_deleted_files_are_pruned(self):
+        project_parser.parse_project(self.project_dir, store=self.store)
+        os.remove(os.path.join(self.project_dir, "helper.py"))
+        with open(os.path.join(self.project_dir, "main.py"), "w") as f:
+            f.write("def main(x):\n    return x\n")
+
+        project_parser.parse_project(self.project_dir, store=self.store)
+
+        self.assertEqual(list(self.store.iter_paths()), [os.path.join(self.project_dir, "main.py")])
+        self.assertEqual(project_parser._build_call_graph(self.store), {"main_auto_v1": []})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import contextlib
+import io
+import os
+import tempfile
+from . import project_parser
+from .ignore_rules import IgnoreRules, WalkStats
+
+class TestIgnoreRules(unittest.TestCase):
+    def test_gitignore_pattern_semantics(self):
+        rules = IgnoreRules([
+            "# comment",
+            "*.gen.py",
+            "/generated/",
+            "docs/**/examples",
+            "tmp_[0-9].py",
+            "!keep.gen.py",
+        ], use_defaults=False)
+
+        self.assertTrue(rules.is_ignored("a/b/model.gen.py"))
+        self.assertFalse(rules.is_ignored("a/b/keep.gen.py"))
+        self.assertTrue(rules.is_ignored("generated", is_dir=True))
+        self.assertFalse(rules.is_ignored("src/generated", is_dir=True))
+        self.assertFalse(rules.is_ignored("generated"))
+        self.assertTrue(rules.is_ignored("docs/examples", is_dir=True))
+        self.assertTrue(rules.is_ignored("docs/a/b/examples", is_dir=True))
+        self.assertTrue(rules.is_ignored("pkg/tmp_3.py"))
+        self.assertFalse(rules.is_ignored("pkg/tmp_x.py"))
+
+    def test_defaults_cover_common_non_source_trees(self):
+        rules = IgnoreRules()
+        for directory in (".git", "venv", "a/.venv", "node_modules", "build", "pkg.egg-info", "x/__pycache__"):
+            self.assertTrue(rules.is_ignored(directory, is_dir=True), directory)
+        self.assertFalse(rules.is_ignored("src", is_dir=True))
+        for directory in ("dist", "vendor"):
+            self.assertTrue(rules.is_ignored(directory, is_dir=True), directory)
+        for directory in ("src/myapp/build", "pkg/dist", "app/vendor"):
+            self.assertFalse(rules.is_ignored(directory, is_dir=True), directory)
+        self.assertTrue(rules.is_ignored_path("lib/node_modules/x/setup.py"))
+        self.assertFalse(rules.is_ignored_path("lib/app/setup.py"))
+
+class TestProjectWalkPruning(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project_dir = os.path.join(self._tmp.name, "project")
+        files = {
+            "app.py": "def app():\n    return 1\n",
+            "generated_model.py": "def generated():\n    return 2\n",
+            ".venv/lib/site.py": "def site():\n    return 3\n",
+            "node_modules/pkg/gyp.py": "def gyp():\n    return 4\n",
+            "pkg/core.py": "def core():\n    return 5\n",
+            ".gitignore": "generated_*.py\n",
+        }
+        for relpath, code in files.items():
+            filepath = os.path.join(self.project_dir, relpath)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as f:
+                f.write(code)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_ignored_directories_are_pruned_and_counted(self):
+        walk_stats = WalkStats()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), self.assertLogs(project_parser.logger, "INFO") as logs:
+            holoforms, _ = project_parser.parse_project(
+                self.project_dir, cache_path=os.path.join(self._tmp.name, "store.sqlite"), walk_stats=walk_stats)
+
+        self.assertEqual(sorted(h["id"] for h in holoforms), ["app_auto_v1", "core_auto_v1"])
+        self.assertEqual(walk_stats.scanned_files, 2)
+        self.assertEqual(walk_stats.skipped_dirs, 2)
+        self.assertEqual(walk_stats.skipped_files, 1)
+        self.assertEqual(walk_stats.skipped_bytes, len("def generated():\n    return 2\n"))
+        self.assertEqual(logs.output, [f"INFO:{project_parser.logger.name}:{walk_stats.report()}"])
+        self.assertEqual(output.getvalue(), "")
+
+    def test_custom_rules_replace_defaults(self):
+        rules = IgnoreRules(["/pkg/"], use_defaults=False)
+        holoforms, _ = project_parser.parse_project(
+            self.project_dir, cache_path=os.path.join(self._tmp.name, "store.sqlite"), ignore_rules=rules)
+
+        self.assertEqual(sorted(h["id"] for h in holoforms),
+                         ["app_auto_v1", "generated_auto_v1", "gyp_auto_v1", "site_auto_v1"])
+
+if __name__ == '__main__':
+    unittest.main()
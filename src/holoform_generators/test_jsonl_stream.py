@@ -0,0 +1,106 @@
+import unittest
+import ast
+import gzip
+import json
+import os
+import tempfile
+from .main_generator import generate_holoforms_from_tree
+from .operation_records import to_json_value
+from .holochain_parser import HoloChainParser
+from .project_parser import _build_call_graph
+from .jsonl_stream import (
+    INDEX_SUFFIX, JsonlReader, JsonlWriter, call_edge_records, holochain_records, read_jsonl, write_jsonl,
+)
+
+CODE = """
+def load(path, retries):
+    data = read(path)
+    cache["last"] = data
+    return data
+
+def read(path):
+    return open(path)
+
+class Loader:
+    def run(self, path):
+        self.result = load(path, 3)
+"""
+
+class TestJsonlStream(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.holoforms = generate_holoforms_from_tree(ast.parse(CODE), CODE.splitlines())
+        self.plain = json.loads(json.dumps(self.holoforms, default=to_json_value))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self._tmp.name, name)
+
+    def test_round_trip_and_seek_with_each_compression(self):
+        for name in ("holoforms.jsonl", "holoforms.jsonl.gz", "holoforms.jsonl.bz2", "holoforms.jsonl.xz"):
+            with self.subTest(name=name):
+                path = self.path(name)
+                self.assertEqual(write_jsonl(path, self.holoforms), 4)
+                self.assertEqual(list(read_jsonl(path)), self.plain)
+                reader = JsonlReader(path)
+                self.assertEqual(len(reader), 4)
+                self.assertEqual(reader[2], self.plain[2])
+                self.assertEqual(reader[-1]["id"], "Loader.run_auto_v1")
+                self.assertEqual(list(reader.iter_from(1)), self.plain[1:])
+                with self.assertRaises(IndexError):
+                    reader[4]
+
+    def test_append_adds_frames_and_index_entries(self):
+        path = self.path("edges.jsonl.gz")
+        call_graph = _build_call_graph(self.holoforms)
+        edges = list(call_edge_records(call_graph))
+        self.assertIn({"caller_id": "load_auto_v1", "callee_id": "read_auto_v1"}, edges)
+        # A tiny frame size gives one frame per line.
+        with JsonlWriter(path, frame_size=1) as writer:
+            writer.write_all(edges)
+        parser = HoloChainParser()
+        parser.parse_code(CODE, "loader.py")
+        records = list(holochain_records(parser, "loader.py"))
+        self.assertEqual(write_jsonl(path, records, append=True), len(edges) + len(records))
+
+        reader = JsonlReader(path)
+        self.assertEqual(len(reader), len(edges) + len(records))
+        self.assertEqual(reader[len(edges)], records[0])
+        # Appended frames are gzip members, so the file is one valid gzip stream.
+        with gzip.open(path, "rt") as f:
+            self.assertEqual([json.loads(line) for line in f], edges + records)
+
+    def test_append_to_a_file_without_an_index(self):
+        for name in ("holoforms.jsonl", "holoforms.jsonl.gz"):
+            with self.subTest(name=name):
+                path = self.path(name)
+                write_jsonl(path, self.holoforms[:2])
+                os.remove(path + INDEX_SUFFIX)
+                self.assertEqual(write_jsonl(path, self.holoforms[2:], append=True), 4)
+
+                reader = JsonlReader(path)
+                self.assertEqual(len(reader), 4)
+                self.assertEqual(reader[0], self.plain[0])
+                self.assertEqual(list(reader.iter_from(1)), self.plain[1:])
+
+    def test_missing_index_is_rebuilt_without_the_truncated_frame(self):
+        path = self.path("holoforms.jsonl.gz")
+        with JsonlWriter(path, frame_size=1) as writer:
+            writer.write_all(self.holoforms)
+        os.remove(path + INDEX_SUFFIX)
+        reader = JsonlReader(path)
+        self.assertEqual(len(reader), 4)
+        self.assertEqual(reader[3], self.plain[3])
+
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-5])
+        os.remove(path + INDEX_SUFFIX)
+        self.assertEqual([holoform["id"] for holoform in JsonlReader(path).iter_from(0)],
+                         [holoform["id"] for holoform in self.plain[:3]])
+
+if __name__ == "__main__":
+    unittest.main()
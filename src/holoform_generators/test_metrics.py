@@ -0,0 +1,26 @@
+import unittest
+import ast
+from .main_generator import generate_holoform_from_code_string, generate_holoforms_from_tree
+from .metrics import calculate_semantic_compression_ratio, calculate_semantic_fidelity_score
+
+CODE = """
+def update(user, data):
+    result = user.save(data)
+    if result:
+        log(result, level=2)
+    return result
+"""
+
+class TestMetrics(unittest.TestCase):
+    def test_metrics_accept_generated_holoforms(self):
+        holoform = generate_holoform_from_code_string(CODE)
+        scr = calculate_semantic_compression_ratio(CODE, holoform)
+        self.assertIsInstance(scr, float)
+        self.assertLess(scr, 1)
+        self.assertEqual(calculate_semantic_fidelity_score(CODE, holoform), 0.5)
+
+        (tree_holoform,) = generate_holoforms_from_tree(ast.parse(CODE), CODE.splitlines())
+        self.assertEqual(calculate_semantic_compression_ratio(CODE, tree_holoform), scr)
+
+if __name__ == '__main__':
+    unittest.main()
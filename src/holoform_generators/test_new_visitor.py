@@ -136,6 +136,113 @@ def my_function():
         self.assertEqual(len(holoform[C.KEY_OPERATIONS][0]["handlers"][0]["body"]), 1)
         self.assertEqual(holoform[C.KEY_OPERATIONS][0]["handlers"][0]["body"][0]["op_type"], "assignment")
 
+    def test_nested_control_flow_step_ids(self):
+        code = """
+def my_function(a):
+    b = a
+    while a:
+        if b:
+            c = 1
+        else:
+            try:
+                d = 2
+            finally:
+                e = 3
+        f = 4
+    return b
+"""
+        visitor = HoloformGeneratorVisitor(code.splitlines())
+        holoform = visitor.visit(ast.parse(code))
+
+        operations = holoform[C.KEY_OPERATIONS]
+        self.assertEqual([op["step_id"] for op in operations], ["s_assign_0", "s_while_1", "s_return_2"])
+        loop_body = operations[1]["body"]
+        self.assertEqual([op["step_id"] for op in loop_body], ["s_if_0", "s_assign_1"])
+        self.assertEqual(loop_body[0]["body"][0]["step_id"], "s_assign_0")
+        try_op = loop_body[0]["orelse"][0]
+        self.assertEqual(try_op["step_id"], "s_try_0")
+        self.assertEqual(try_op["body"][0]["assign_to_variable"], "d")
+        self.assertEqual(try_op["finalbody"][0]["assign_to_variable"], "e")
+        self.assertEqual(holoform[C.KEY_OUTPUT_VARIABLE_NAME], "Name(id='b')")
+
+    def test_deep_nesting_does_not_recurse(self):
+        depth = 1000
+        body = [ast.Assign(targets=[ast.Name(id="x", ctx=ast.Store())], value=ast.Constant(value=1), lineno=1)]
+        for _ in range(depth):
+            body = [ast.If(test=ast.Name(id="a", ctx=ast.Load()), body=body, orelse=[])]
+        function = ast.FunctionDef(
+            name="deep", args=ast.arguments(posonlyargs=[], args=[ast.arg(arg="a")], kwonlyargs=[],
+                                            kw_defaults=[], defaults=[]),
+            body=body, decorator_list=[], returns=None)
+
+        visitor = HoloformGeneratorVisitor([])
+        holoform = visitor.visit(function)
+
+        operations = holoform[C.KEY_OPERATIONS]
+        for _ in range(depth):
+            self.assertEqual(len(operations), 1)
+            self.assertEqual(operations[0]["subtype"], "if")
+            operations = operations[0]["body"]
+        self.assertEqual(operations[0]["assign_to_variable"], "x")
+
+    def test_for_and_with(self):
+        code = """
+async def copy(paths, sink):
+    for i, path in enumerate(paths):
+        with open(path) as fh:
+            data = fh.read()
+    else:
+        sink.close()
+    async for chunk in sink:
+        log(chunk)
+"""
+        visitor = HoloformGeneratorVisitor(code.splitlines())
+        holoform = visitor.visit(ast.parse(code))
+
+        for_op, async_for_op = holoform[C.KEY_OPERATIONS]
+        self.assertEqual(for_op["step_id"], "s_for_0")
+        self.assertEqual(for_op[C.KEY_OP_LOOP_TARGET_VARIABLE], "i, path")
+        self.assertEqual(for_op[C.KEY_OP_LOOP_ITERABLE_REPR], "Call(func=Name(id='enumerate'), args=[Name(id='paths')])")
+        self.assertEqual(for_op["def_use"], {"defs": ["i", "path"], "uses": ["enumerate", "paths"]})
+        self.assertEqual(for_op["orelse"][0]["target_function_name"], "close")
+
+        with_op = for_op[C.KEY_OP_LOOP_BODY_OPERATIONS][0]
+        self.assertEqual(with_op["subtype"], "with")
+        self.assertEqual(with_op["with_items"], [{"context_expr": "Call(func=Name(id='open'), args=[Name(id='path')])",
+                                                  "optional_vars": "fh"}])
+        self.assertEqual(dict(with_op.items())["subtype"], "with")
+        self.assertEqual(with_op["def_use"], {"defs": ["fh"], "uses": ["open", "path"]})
+        self.assertEqual(with_op["body"][0]["assign_to_variable"], "data")
+
+        self.assertEqual(async_for_op["step_id"], "s_async_for_1")
+        self.assertEqual(async_for_op[C.KEY_OP_LOOP_TARGET_VARIABLE], "chunk")
+
+    @unittest.skipUnless(hasattr(ast, "Match"), "match statements need Python 3.10")
+    def test_match(self):
+        code = """
+def area(shape, unit):
+    match shape:
+        case Circle(radius=r) if r > unit:
+            result = r
+        case {"w": w, **rest}:
+            result = w
+        case _:
+            result = None
+    return result
+"""
+        visitor = HoloformGeneratorVisitor(code.splitlines())
+        holoform = visitor.visit(ast.parse(code))
+
+        match_op = holoform[C.KEY_OPERATIONS][0]
+        self.assertEqual(match_op["step_id"], "s_match_0")
+        self.assertEqual(match_op["subject"], "Name(id='shape')")
+        self.assertEqual([case["pattern"] for case in match_op["cases"]],
+                         ["Circle(radius=r)", "{'w': w, **rest}", "_"])
+        self.assertEqual(match_op["cases"][0]["def_use"], {"defs": ["r"], "uses": ["Circle", "r", "unit"]})
+        self.assertEqual(match_op["cases"][1]["def_use"]["defs"], ["w", "rest"])
+        self.assertIsNone(match_op["cases"][2]["guard"])
+        self.assertEqual(match_op["cases"][2]["body"][0]["step_id"], "s_assign_0")
+
     def test_data_flow(self):
         code = """
 def my_function(a, b):
@@ -0,0 +1,68 @@
+import unittest
+import ast
+import tempfile
+from .main_generator import generate_holoforms_from_tree
+from .operation_columns import OperationColumns, numpy, read_operation_columns
+
+CODE = """
+def load(path, retries):
+    data = read(path, retries)
+    for line in data:
+        if line:
+            emit(line)
+    return data
+
+def read(path, mode):
+    try:
+        handle = open(path, mode)
+    except OSError as error:
+        log(error)
+    return handle
+"""
+
+class TestOperationColumns(unittest.TestCase):
+    def setUp(self):
+        self.holoforms = generate_holoforms_from_tree(ast.parse(CODE), CODE.splitlines())
+
+    def check_aggregations(self, columns):
+        self.assertEqual(columns.value_counts("op_type")["function_call"], 4)
+        self.assertEqual(columns.value_counts("holoform", where={"op_type": "function_call"}),
+                         {"load_auto_v1": 2, "read_auto_v1": 2})
+        self.assertEqual(columns.value_counts("target_function_name", where={"holoform": "read_auto_v1"}),
+                         {None: 2, "open": 1, "log": 1})
+        self.assertEqual(columns.value_counts("op_type", where={"op_type": "no_such_op"}), {})
+        self.assertEqual(columns.sum("num_args", by="target_function_name", where={"op_type": "function_call"}),
+                         {"read": 2, "emit": 1, "open": 2, "log": 1})
+        self.assertEqual(columns.sum("num_children"), len(columns) - columns.value_counts("depth")[0])
+        self.assertEqual(columns.mean("num_args", where={"target_function_name": "read"}), 2)
+        self.assertIsNone(columns.mean("num_args", where={"depth": 9}))
+        self.assertEqual(columns.value_counts("op_type", where={"depth": "x"}), {})
+        self.assertEqual(columns.value_counts("op_type", where={"depth": 0.0, "num_args": 2}), {"function_call": 1})
+
+    def test_operations_are_flattened_in_preorder(self):
+        columns = OperationColumns(self.holoforms, use_numpy=False)
+        self.assertEqual(columns.strings("target_function_name"),
+                         ["read", None, None, "emit", None, None, "open", "log", None])
+        self.assertEqual(list(columns.column("parent")), [-1, -1, 1, 2, -1, -1, 5, 5, -1])
+        self.assertEqual(list(columns.column("depth")), [0, 0, 1, 2, 0, 0, 1, 1, 0])
+        self.assertEqual(list(columns.column("num_children")), [0, 1, 1, 0, 0, 2, 0, 0, 0])
+        self.check_aggregations(columns)
+
+    def test_write_and_read_back(self):
+        columns = OperationColumns(self.holoforms, use_numpy=False)
+        with tempfile.TemporaryDirectory() as directory:
+            columns.write(directory)
+            loaded = read_operation_columns(directory, use_numpy=False)
+        for name in columns.names:
+            self.assertEqual(loaded.column(name), columns.column(name))
+        self.assertEqual(loaded.strings("op_type"), columns.strings("op_type"))
+        self.check_aggregations(loaded)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_aggregations_match(self):
+        columns = OperationColumns(self.holoforms, use_numpy=True)
+        self.assertEqual(columns.column("depth").tolist(), [0, 0, 1, 2, 0, 0, 1, 1, 0])
+        self.check_aggregations(columns)
+
+if __name__ == "__main__":
+    unittest.main()
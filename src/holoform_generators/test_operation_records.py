@@ -0,0 +1,108 @@
+import unittest
+import ast
+import io
+import json
+import pickle
+from .main_generator import generate_holoform_from_code_string
+from .operation_records import CallOperation, DefUse, holoform_to_dict, to_json_value, write_json
+from .serialization import serialize_holoform, write_holoform
+
+CODE = """
+def update(user, data):
+    result = user.save(data)
+    user.name = data
+    data["k"] = result
+    user.flush()
+    return result
+"""
+
+NESTED_CODE = """
+def update(user, data):
+    with open(data) as f, lock:
+        for line in f:
+            if line:
+                log("d\u00e9j\u00e0", line, level=2)
+    try:
+        match data:
+            case {"k": v} if v:
+                pass
+    except (OSError, ValueError) as error:
+        raise
+    finally:
+        user.flush()
+    return data
+"""
+
+class TestOperationRecords(unittest.TestCase):
+    def setUp(self):
+        self.holoform = generate_holoform_from_code_string(CODE)
+
+    def test_records_read_like_the_dicts_they_replace(self):
+        call, attribute, subscript, flush, ret = self.holoform["operations"]
+        self.assertEqual(call, {
+            "step_id": "s_function_call_0",
+            "op_type": "function_call",
+            "assign_to_variable": "result",
+            "target_function_name": "save",
+            "parameter_mapping": {"arg0": "Name(id='data')"},
+            "target_object": "Name(id='user')",
+            "def_use": {"defs": ["result"], "uses": ["user", "data"]},
+        })
+        self.assertEqual(list(attribute), ["step_id", "op_type", "subtype", "target_object", "attribute", "value", "def_use"])
+        # The value is evaluated before the object it is stored on.
+        self.assertEqual(attribute["def_use"]["uses"], ["data", "user"])
+        self.assertEqual(subscript.get("key"), "Constant(value_type='str')")
+        self.assertEqual(flush.get("def_use"), {"defs": [], "uses": ["user"]})
+        self.assertIsNone(flush.get("assign_to_variable"))
+        self.assertNotIn("target_object", ret)
+        self.assertEqual(ret["def_use"]["uses"], ["result"])
+        with self.assertRaises(KeyError):
+            ret["missing"]
+
+    def test_records_have_no_instance_dict(self):
+        call = self.holoform["operations"][0]
+        self.assertFalse(hasattr(call, "__dict__"))
+        self.assertIsInstance(call, CallOperation)
+
+    def test_serialization_boundary_produces_plain_dicts(self):
+        plain = holoform_to_dict(self.holoform)
+        self.assertIs(type(plain["operations"][0]), dict)
+        self.assertIs(type(plain["operations"][0]["def_use"]), dict)
+        self.assertEqual(json.loads(json.dumps(self.holoform, default=to_json_value)), plain)
+        self.assertEqual(pickle.loads(pickle.dumps(self.holoform)), plain)
+        self.assertIn('"op_type": "function_call"', serialize_holoform(self.holoform))
+
+    def test_write_json_matches_json_dumps(self):
+        values = [
+            self.holoform,
+            holoform_to_dict(self.holoform),
+            {"a": (1, 2.5, float("nan"), -float("inf")), 3: None, 1.5: [], None: {}, True: "\u2603\n"},
+            [DefUse(["x"], ()), {"nested": [[], [DefUse([], ["y", 0])]]}],
+            "plain", 7, False,
+        ]
+        for value in values:
+            buffer = io.StringIO()
+            write_json(value, buffer.write)
+            self.assertEqual(buffer.getvalue(), json.dumps(value, default=to_json_value))
+        with self.assertRaises(TypeError):
+            write_json({"bad": object()}, io.StringIO().write)
+
+    @unittest.skipUnless(hasattr(ast, "Match"), "match statements need Python 3.10")
+    def test_write_json_matches_json_dumps_for_nested_blocks(self):
+        holoform = generate_holoform_from_code_string(NESTED_CODE)
+        for value in (holoform, holoform_to_dict(holoform)):
+            buffer = io.StringIO()
+            write_json(value, buffer.write)
+            self.assertEqual(buffer.getvalue(), json.dumps(value, default=to_json_value))
+
+    def test_serialized_text_is_unchanged(self):
+        lines = ["Function: update_auto_v1", f"Description: {self.holoform['description']}",
+                 "Inputs: user, data", f"Output: {self.holoform['output_variable_name']}", "Operations:"]
+        lines += [f"  - {json.dumps(op, default=to_json_value)}" for op in self.holoform["operations"]]
+        self.assertEqual(serialize_holoform(self.holoform), "\n".join(lines))
+        buffer = io.StringIO()
+        write_holoform(self.holoform, buffer)
+        self.assertEqual(buffer.getvalue(), "\n".join(lines))
+
+if __name__ == '__main__':
+    unittest.main()
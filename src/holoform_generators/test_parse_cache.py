@@ -0,0 +1,71 @@
+import unittest
+import ast
+from unittest import mock
+from . import parse_cache
+from .parse_cache import ParseCache, TREE_BYTES_PER_SOURCE_CHAR, parse_source
+from .differential_analyzer import DifferentialAnalyzer
+
+CODE = """
+def transfer(account, amount):
+    account.balance = account.balance - amount
+    return account
+"""
+
+class TestParseCache(unittest.TestCase):
+    def test_same_source_shares_one_tree(self):
+        cache = ParseCache()
+        tree = cache.parse(CODE, "bank.py")
+        self.assertIs(cache.parse(CODE, "other.py"), tree)
+        self.assertEqual(ast.dump(tree), ast.dump(ast.parse(CODE)))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats()["tree_bytes"], len(CODE) * TREE_BYTES_PER_SOURCE_CHAR)
+
+    def test_options_are_part_of_the_key(self):
+        cache = ParseCache()
+        code = "def f(x):\n    # type: (int) -> int\n    return x\n"
+        plain = cache.parse(code)
+        typed = cache.parse(code, type_comments=True)
+        old = cache.parse(code, feature_version=(3, 7))
+        self.assertEqual(len({id(plain), id(typed), id(old)}), 3)
+        self.assertIsNone(plain.body[0].type_comment)
+        self.assertEqual(typed.body[0].type_comment, "(int) -> int")
+        with self.assertRaises(SyntaxError):
+            cache.parse("async = 1\n", feature_version=(3, 8))
+        self.assertIsInstance(cache.parse("async = 1\n", feature_version=(3, 6)), ast.Module)
+        # ast.parse also takes the minor version alone.
+        self.assertIs(cache.parse(code, feature_version=7), old)
+        with self.assertRaises(SyntaxError):
+            parse_source("async = 1\n", feature_version=8, cache=None)
+
+    def test_evicts_least_recently_used_by_tree_size(self):
+        sources = [f"x{i} = {i}\n" for i in range(3)]
+        cache = ParseCache(max_tree_bytes=2 * len(sources[0]) * TREE_BYTES_PER_SOURCE_CHAR)
+        first = cache.parse(sources[0])
+        cache.parse(sources[1])
+        cache.parse(sources[0])
+        cache.parse(sources[2])
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+        self.assertIs(cache.parse(sources[0]), first)
+        cache.parse(sources[1])
+        self.assertEqual(cache.misses, 4)
+
+        cache.parse("y = 1\n" * 1000)
+        self.assertEqual(len(cache), 2)
+
+    def test_syntax_errors_are_not_cached(self):
+        cache = ParseCache()
+        for _ in range(2):
+            with self.assertRaises(SyntaxError):
+                cache.parse("def broken(:\n")
+        self.assertEqual((len(cache), cache.misses), (0, 2))
+
+    def test_differential_analyzer_parses_a_block_once(self):
+        block = "x = {'a': 1}\nif x:\n    x['b'] = 2\n"
+        parse_cache.PARSE_CACHE.clear()
+        with mock.patch.object(parse_cache, "compile_module", wraps=parse_cache.compile_module) as compile_module:
+            DifferentialAnalyzer().analyze(block)
+            parse_source(block.strip(), cache=None)
+        self.assertEqual(compile_module.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
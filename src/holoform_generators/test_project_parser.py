@@ -0,0 +1,239 @@
+import unittest
+import ast
+import json
+import os
+import tempfile
+from unittest import mock
+from . import project_parser
+from .holoform_store import HoloformStore
+from .operation_records import to_json_value
+from .main_generator import generate_holoform_from_code_string, generate_holoforms_from_tree
+from .query_api import execute_query
+
+MODULE_CODE = """
+def helper(a, b):
+    c = a + b
+    return c
+
+class Widget:
+    \"\"\"A widget.\"\"\"
+    size = 1
+    def grow(self):
+        self.size = 2
+
+def main(x):
+    w = Widget()
+    total = helper(x, 1)
+    return total
+"""
+
+class TestProjectParser(unittest.TestCase):
+    def setUp(self):
+        self._old_cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        self.project_dir = os.path.join(self._tmp.name, "project")
+        os.makedirs(self.project_dir)
+        with open(os.path.join(self.project_dir, "module.py"), "w") as f:
+            f.write(MODULE_CODE)
+
+    def tearDown(self):
+        os.chdir(self._old_cwd)
+        self._tmp.cleanup()
+
+    def test_tree_generation_matches_per_definition_generation(self):
+        holoforms = generate_holoforms_from_tree(ast.parse(MODULE_CODE), MODULE_CODE.splitlines())
+        expected = [
+            generate_holoform_from_code_string(MODULE_CODE, target_name=name)
+            for name in ("helper", "Widget", "Widget.grow", "main")
+        ]
+        self.assertEqual(holoforms, expected)
+
+    def test_methods_nested_and_async_functions_get_qualified_ids(self):
+        code = (
+            "class Service:\n"
+            "    async def fetch(self, key):\n"
+            "        def decode(raw):\n"
+            "            return raw\n"
+            "        data = decode(key)\n"
+            "        return data\n"
+            "    class Config:\n"
+            "        def load(self):\n"
+            "            return 1\n"
+            "def outer():\n"
+            "    def inner():\n"
+            "        return 2\n"
+            "    x = inner()\n"
+            "    return x\n"
+        )
+        holoforms = generate_holoforms_from_tree(ast.parse(code), code.splitlines())
+
+        self.assertEqual([h["id"] for h in holoforms], [
+            "Service_auto_v1", "Service.fetch_auto_v1", "Service.fetch.<locals>.decode_auto_v1",
+            "Service.Config_auto_v1", "Service.Config.load_auto_v1",
+            "outer_auto_v1", "outer.<locals>.inner_auto_v1",
+        ])
+        fetch = holoforms[1]
+        self.assertIn("async", fetch["tags"])
+        self.assertEqual([op["step_id"] for op in fetch["operations"]], ["s_function_call_0", "s_return_1"])
+        self.assertEqual(holoforms[0]["methods"], ["fetch"])
+        self.assertEqual([op["op_type"] for op in holoforms[5]["operations"]], ["function_call", "return"])
+        self.assertEqual(generate_holoform_from_code_string(code, target_name="outer.<locals>.inner"), holoforms[6])
+
+    def test_definitions_under_module_and_class_blocks_get_holoforms(self):
+        code = (
+            "try:\n"
+            "    from fast import encode\n"
+            "except ImportError:\n"
+            "    def encode(data):\n"
+            "        return data\n"
+            "if sys.version_info >= (3, 10):\n"
+            "    class Codec:\n"
+            "        if DEBUG:\n"
+            "            def check(self, data):\n"
+            "                self.run(data)\n"
+            "        def run(self, data):\n"
+            "            encode(data)\n"
+        )
+        holoforms = generate_holoforms_from_tree(ast.parse(code), code.splitlines())
+
+        self.assertEqual([h["id"] for h in holoforms], [
+            "encode_auto_v1", "Codec_auto_v1", "Codec.check_auto_v1", "Codec.run_auto_v1"])
+        self.assertEqual(holoforms[1]["methods"], ["check", "run"])
+        call_graph = project_parser._build_call_graph(holoforms)
+        self.assertEqual(call_graph["Codec.check_auto_v1"], ["Codec.run_auto_v1"])
+        self.assertEqual(call_graph["Codec.run_auto_v1"], ["encode_auto_v1"])
+        self.assertEqual(generate_holoform_from_code_string(code), holoforms[0])
+
+    def test_method_and_nested_calls_reach_their_holoforms(self):
+        code = (
+            "class Service:\n"
+            "    def run(self, x):\n"
+            "        self.helper(x)\n"
+            "        other.helper(x)\n"
+            "    def helper(self, x):\n"
+            "        def step(y):\n"
+            "            inner(y)\n"
+            "        step(x)\n"
+            "def outer(a):\n"
+            "    def inner(b):\n"
+            "        return b\n"
+            "    inner(a)\n"
+            "    helper(a)\n"
+        )
+        holoforms = generate_holoforms_from_tree(ast.parse(code), code.splitlines())
+        call_graph = project_parser._build_call_graph(holoforms)
+
+        self.assertEqual(call_graph["Service.run_auto_v1"], ["Service.helper_auto_v1", "helper_auto_v1"])
+        self.assertEqual(call_graph["Service.helper_auto_v1"], ["Service.helper.<locals>.step_auto_v1"])
+        # inner is local to outer only, so from step it is a module-level name.
+        self.assertEqual(call_graph["Service.helper.<locals>.step_auto_v1"], ["inner_auto_v1"])
+        self.assertEqual(call_graph["outer_auto_v1"], ["outer.<locals>.inner_auto_v1", "helper_auto_v1"])
+        query = 'MATCH (caller)-[:CALLS]->(callee) WHERE callee.id == "Service.helper_auto_v1" RETURN caller.id'
+        self.assertEqual(execute_query(query, call_graph), ["Service.run_auto_v1"])
+
+    def test_parse_project_parses_each_file_once(self):
+        with mock.patch.object(project_parser, "parse_source", wraps=project_parser.parse_source) as parse:
+            holoforms, call_graph = project_parser.parse_project(self.project_dir)
+
+        self.assertEqual(parse.call_count, 1)
+        # Project files are parsed once, so they bypass the shared parse cache.
+        self.assertIsNone(parse.call_args.kwargs["cache"])
+        self.assertEqual([h["id"] for h in holoforms], ["helper_auto_v1", "Widget_auto_v1", "Widget.grow_auto_v1", "main_auto_v1"])
+        self.assertEqual(call_graph["main_auto_v1"], ["Widget_auto_v1", "helper_auto_v1"])
+
+    def test_parallel_output_matches_serial(self):
+        for i in range(6):
+            package_dir = os.path.join(self.project_dir, f"pkg{i % 2}")
+            os.makedirs(package_dir, exist_ok=True)
+            with open(os.path.join(package_dir, f"mod{i}.py"), "w") as f:
+                f.write(MODULE_CODE.replace("helper", f"helper{i}"))
+
+        serial = project_parser.parse_project(self.project_dir)
+        os.remove(project_parser.CACHE_FILE)
+        parallel = project_parser.parse_project(self.project_dir, workers=2, chunksize=2)
+
+        self.assertEqual(json.dumps(parallel, default=to_json_value), json.dumps(serial, default=to_json_value))
+
+    def test_warm_run_replays_cached_holoforms(self):
+        cold = project_parser.parse_project(self.project_dir)
+        with mock.patch.object(project_parser, "_parse_file") as parse_file:
+            warm = project_parser.parse_project(self.project_dir)
+
+        parse_file.assert_not_called()
+        self.assertEqual(warm, cold)
+
+    def test_changed_file_or_generator_version_is_regenerated(self):
+        project_parser.parse_project(self.project_dir)
+        with open(os.path.join(self.project_dir, "module.py"), "a") as f:
+            f.write("\ndef extra():\n    return 1\n")
+        holoforms, _ = project_parser.parse_project(self.project_dir)
+        self.assertEqual(holoforms[-1]["id"], "extra_auto_v1")
+
+        with mock.patch.object(project_parser.C, "GENERATOR_VERSION", -1), \
+                mock.patch.object(project_parser, "_parse_file", wraps=project_parser._parse_file) as parse_file:
+            project_parser.parse_project(self.project_dir)
+        self.assertEqual(parse_file.call_count, 1)
+
+    def test_unchanged_stat_skips_hashing_unless_paranoid(self):
+        project_parser.parse_project(self.project_dir)
+        with mock.patch.object(project_parser, "_get_file_hash", wraps=project_parser._get_file_hash) as get_hash:
+            project_parser.parse_project(self.project_dir)
+            self.assertEqual(get_hash.call_count, 0)
+            project_parser.parse_project(self.project_dir, paranoid=True)
+            self.assertEqual(get_hash.call_count, 1)
+
+    def test_touched_file_is_hashed_but_not_regenerated(self):
+        filepath = os.path.join(self.project_dir, "module.py")
+        project_parser.parse_project(self.project_dir)
+        st = os.stat(filepath)
+        os.utime(filepath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        with mock.patch.object(project_parser, "_parse_file") as parse_file:
+            project_parser.parse_project(self.project_dir)
+        parse_file.assert_not_called()
+        with HoloformStore(project_parser.CACHE_FILE) as store:
+            self.assertEqual(store.get_file(filepath)["stat"], project_parser._get_file_stat(filepath))
+
+    def test_changed_file_is_read_once(self):
+        filepath = os.path.join(self.project_dir, "module.py")
+        project_parser.parse_project(self.project_dir)
+        with open(filepath, "a") as f:
+            f.write("\ndef extra():\n    return 1\n")
+
+        with mock.patch("builtins.open", wraps=open) as opened:
+            holoforms, _ = project_parser.parse_project(self.project_dir)
+        self.assertEqual([call.args[0] for call in opened.call_args_list].count(filepath), 1)
+        self.assertEqual(holoforms[-1]["id"], "extra_auto_v1")
+
+    def test_paranoid_mode_detects_change_hidden_from_stat(self):
+        filepath = os.path.join(self.project_dir, "module.py")
+        project_parser.parse_project(self.project_dir)
+        st = os.stat(filepath)
+        with open(filepath, "w") as f:
+            f.write(MODULE_CODE.replace("helper", "helpor"))
+        os.utime(filepath, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        holoforms, _ = project_parser.parse_project(self.project_dir)
+        self.assertEqual(holoforms[0]["id"], "helper_auto_v1")
+        holoforms, _ = project_parser.parse_project(self.project_dir, paranoid=True)
+        self.assertEqual(holoforms[0]["id"], "helpor_auto_v1")
+
+    def test_iter_project_holoforms_streams_file_by_file(self):
+        with open(os.path.join(self.project_dir, "other.py"), "w") as f:
+            f.write("def other():\n    helper(1, 2)\n")
+
+        builder = project_parser.CallGraphBuilder()
+        with mock.patch.object(project_parser, "_parse_file", wraps=project_parser._parse_file) as parse_file:
+            stream = builder.consume(project_parser.iter_project_holoforms(self.project_dir))
+            first = next(stream)
+            self.assertEqual(parse_file.call_count, 1)
+            streamed = [first] + list(stream)
+        self.assertEqual(parse_file.call_count, 2)
+
+        holoforms, call_graph = project_parser.parse_project(self.project_dir, cache_path="fresh.sqlite")
+        self.assertEqual(streamed, holoforms)
+        self.assertEqual(builder.call_graph, call_graph)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+from . import project_parser
+from .project_watcher import ProjectWatcher, CHANGE_ADDED, CHANGE_MODIFIED, CHANGE_DELETED
+
+MAIN_CODE = """
+def main(x):
+    total = helper(x, 1)
+    return total
+"""
+
+HELPER_CODE = """
+def helper(a, b):
+    return a + b
+"""
+
+class TestProjectWatcher(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.project_dir = os.path.join(self._tmp.name, "project")
+        os.makedirs(self.project_dir)
+        self._write("main.py", MAIN_CODE)
+        self._write("helper.py", HELPER_CODE)
+        self.watcher = ProjectWatcher(self.project_dir, cache_path=os.path.join(self._tmp.name, "store.sqlite"))
+
+    def tearDown(self):
+        self.watcher.close()
+        self._tmp.cleanup()
+
+    def _write(self, relpath, code, mtime_offset_ns=0):
+        filepath = os.path.join(self.project_dir, relpath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "w") as f:
+            f.write(code)
+        if mtime_offset_ns:
+            st = os.stat(filepath)
+            os.utime(filepath, ns=(st.st_atime_ns, st.st_mtime_ns + mtime_offset_ns))
+        return filepath
+
+    def _fresh_call_graph(self):
+        _, call_graph = project_parser.parse_project(self.project_dir, cache_path=os.path.join(self._tmp.name, "fresh.sqlite"))
+        return call_graph
+
+    def test_no_changes_no_events(self):
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_modified_file_patches_call_graph(self):
+        filepath = self._write("main.py", "def main(x):\n    report(x)\n    return x\n", mtime_offset_ns=10**9)
+
+        (event,) = self.watcher.poll()
+
+        self.assertEqual(event["path"], filepath)
+        self.assertEqual(event["change_type"], CHANGE_MODIFIED)
+        self.assertEqual(event["added_call_edges"], [("main_auto_v1", "report_auto_v1")])
+        self.assertEqual(event["removed_call_edges"], [("main_auto_v1", "helper_auto_v1")])
+        self.assertEqual(self.watcher.call_graph, self._fresh_call_graph())
+
+    def test_added_and_deleted_files(self):
+        added = self._write(os.path.join("pkg", "extra.py"), "def extra():\n    main(1)\n")
+        os.remove(os.path.join(self.project_dir, "helper.py"))
+
+        events = {event["change_type"]: event for event in self.watcher.poll()}
+
+        self.assertEqual(events[CHANGE_ADDED]["path"], added)
+        self.assertEqual(events[CHANGE_ADDED]["added_call_edges"], [("extra_auto_v1", "main_auto_v1")])
+        self.assertEqual(events[CHANGE_DELETED]["removed_holoform_ids"], ["helper_auto_v1"])
+        self.assertEqual(self.watcher.call_graph, self._fresh_call_graph())
+
+    def test_touched_file_without_content_change_emits_nothing(self):
+        self._write("helper.py", HELPER_CODE, mtime_offset_ns=10**9)
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_file_deleted_between_stat_and_read_is_removed(self):
+        helper = self._write("helper.py", "def helper(a, b):\n    return a\n", mtime_offset_ns=10**9)
+        added = self._write("new.py", "def new():\n    return 1\n")
+        get_file_stat = project_parser._get_file_stat
+
+        def stat_then_delete(filepath):
+            file_stat = get_file_stat(filepath)
+            if filepath in (helper, added):
+                os.remove(filepath)
+            return file_stat
+
+        with mock.patch.object(project_parser, "_get_file_stat", side_effect=stat_then_delete):
+            events = self.watcher.poll()
+
+        self.assertEqual([(event["path"], event["change_type"]) for event in events], [(helper, CHANGE_DELETED)])
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.call_graph, self._fresh_call_graph())
+
+    def test_watch_yields_events(self):
+        self._write("helper.py", "def helper(a, b):\n    return a\n", mtime_offset_ns=10**9)
+        events = list(self.watcher.watch(max_polls=1))
+        self.assertEqual([event["change_type"] for event in events], [CHANGE_MODIFIED])
+
+if __name__ == '__main__':
+    unittest.main()
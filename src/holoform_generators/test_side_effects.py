@@ -0,0 +1,113 @@
+import unittest
+import ast
+from .main_generator import generate_holoforms_from_tree
+from .side_effects import SideEffectSummaries
+
+HIDDEN_STATE = """
+def process_user_data(user_id):
+    user = get_user(user_id)
+    validate_user(user)
+    update_user_stats(user)
+    return user
+
+def get_user(user_id):
+    return user_id
+
+def validate_user(user):
+    if not user["email"]:
+        user["status"] = "invalid"
+
+def update_user_stats(user):
+    if user["status"] == "invalid":
+        user["login_count"] = 0
+
+def register(account, settings):
+    current = account
+    validate_user(current)
+    settings.owner = account
+
+def reassigning(user):
+    user = {}
+    user["status"] = 1
+"""
+
+RECURSIVE = """
+def ping(node, depth):
+    node.seen = depth
+    pong(depth, node)
+
+def pong(depth, other):
+    other["hops"] = depth
+    ping(other, depth)
+"""
+
+def _holoforms(code):
+    return generate_holoforms_from_tree(ast.parse(code), code.splitlines())
+
+class TestSideEffectSummaries(unittest.TestCase):
+    def test_writes_are_propagated_through_calls_and_aliases(self):
+        summaries = SideEffectSummaries(_holoforms(HIDDEN_STATE))
+
+        self.assertEqual(summaries["validate_user_auto_v1"].to_dict(), {"reads": ["user"], "writes": ["user[*]"]})
+        self.assertEqual(summaries["update_user_stats_auto_v1"].to_dict(), {"reads": ["user"], "writes": ["user[*]"]})
+        # The user is created locally, so nothing leaks to the caller.
+        self.assertEqual(summaries["process_user_data_auto_v1"].to_dict(), {"reads": ["user_id"], "writes": []})
+        self.assertEqual(summaries["register_auto_v1"].to_dict(),
+                         {"reads": ["account", "settings"], "writes": ["account[*]", "settings.owner"]})
+        self.assertEqual(summaries["reassigning_auto_v1"].writes, frozenset())
+
+    def test_keyword_splats_bind_no_parameter(self):
+        code = (
+            "def configure(options, target):\n"
+            "    apply(target, **options)\n"
+            "def apply(target, mode=None):\n"
+            "    target.mode = mode\n"
+        )
+        summaries = SideEffectSummaries(_holoforms(code))
+        self.assertEqual(summaries["configure_auto_v1"].to_dict(),
+                         {"reads": ["options", "target"], "writes": ["target.mode"]})
+
+    def test_method_calls_bind_the_target_object_to_self(self):
+        code = (
+            "class Registry:\n"
+            "    def add(self, user, tags):\n"
+            "        self.validate(user, tags)\n"
+            "    def validate(self, user, tags):\n"
+            "        user['status'] = 'checked'\n"
+            "        self.count = tags\n"
+        )
+        summaries = SideEffectSummaries(_holoforms(code))
+        self.assertEqual(summaries["Registry.validate_auto_v1"].writes, {"user[*]", "self.count"})
+        self.assertEqual(summaries["Registry.add_auto_v1"].to_dict(),
+                         {"reads": ["self", "tags", "user"], "writes": ["self.count", "user[*]"]})
+
+    def test_recursive_components_reach_a_fixpoint(self):
+        summaries = SideEffectSummaries(_holoforms(RECURSIVE))
+
+        self.assertEqual(summaries["ping_auto_v1"].to_dict(),
+                         {"reads": ["depth", "node"], "writes": ["node.seen", "node[*]"]})
+        self.assertEqual(summaries["pong_auto_v1"].to_dict(),
+                         {"reads": ["depth", "other"], "writes": ["other.seen", "other[*]"]})
+
+    def test_update_recomputes_only_affected_components(self):
+        summaries = SideEffectSummaries(_holoforms(HIDDEN_STATE + RECURSIVE))
+        # ping and pong form one component.
+        self.assertEqual(summaries.last_recomputed_components, 7)
+
+        self.assertEqual(summaries.update(_holoforms(RECURSIVE)), set())
+        self.assertEqual(summaries.last_recomputed_components, 0)
+
+        pure_validate = "def validate_user(user):\n    return user\n"
+        changed = summaries.update(_holoforms(pure_validate))
+        self.assertEqual(changed, {"validate_user_auto_v1", "register_auto_v1"})
+        # validate_user, then its callers process_user_data and register.
+        self.assertEqual(summaries.last_recomputed_components, 3)
+        self.assertEqual(summaries["register_auto_v1"].writes, frozenset({"settings.owner"}))
+
+        changed = summaries.update(removed_ids=["pong_auto_v1"])
+        self.assertEqual(changed, {"pong_auto_v1", "ping_auto_v1"})
+        self.assertNotIn("pong_auto_v1", summaries)
+        self.assertEqual(summaries["ping_auto_v1"].writes, frozenset({"node.seen"}))
+
+if __name__ == '__main__':
+    unittest.main()
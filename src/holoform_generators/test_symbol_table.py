@@ -0,0 +1,91 @@
+import unittest
+import ast
+import json
+from .main_generator import generate_holoform_from_code_string, generate_holoforms_from_tree
+from .ast_visitor import HoloformGeneratorVisitor
+from .operation_records import holoform_to_dict, to_json_value
+from .symbol_table import CompactHoloform, SymbolTable, compact_holoforms
+
+CODE = """
+def load(path, retries):
+    data = read(path)
+    for attempt in attempts(retries):
+        if data:
+            data = read(path)
+    cache["last"] = data
+    return data
+
+class Loader:
+    def run(self, path):
+        self.result = load(path, 3)
+        self.log(path)
+"""
+
+class TestSymbolTable(unittest.TestCase):
+    def setUp(self):
+        self.holoforms = generate_holoforms_from_tree(ast.parse(CODE), CODE.splitlines())
+        self.compact, self.table = compact_holoforms(self.holoforms)
+
+    def test_compact_holoforms_read_like_the_originals(self):
+        for holoform, compact in zip(self.holoforms, self.compact):
+            self.assertEqual(list(compact), list(holoform))
+            self.assertEqual(holoform_to_dict(compact), holoform_to_dict(holoform))
+            self.assertEqual(json.dumps(compact, default=to_json_value),
+                             json.dumps(holoform, default=to_json_value))
+        load = self.compact[0]
+        self.assertEqual(load["id"], "load_auto_v1")
+        self.assertEqual(load["operations"][1]["loop_body_operations"][0]["subtype"], "if")
+
+    def test_identifiers_are_shared_ints(self):
+        self.assertEqual(self.table.intern("path"), self.table.lookup("path"))
+        self.assertEqual(self.table.resolve(self.table.lookup("path")), "path")
+        self.assertIsNone(self.table.lookup("never_seen"))
+        # Each distinct string is stored once for the whole project.
+        self.assertEqual(len(self.table.strings), len(set(self.table.strings)))
+
+        read_id = self.table.lookup("read")
+        load_calls = self.compact[0].symbol_ids("target_function_name")
+        # The loop's iterable is not a call operation of its own.
+        self.assertEqual(load_calls, [read_id, read_id])
+        self.assertEqual(self.compact[0].symbol_ids("assign_to_variable"),
+                         [self.table.lookup("data"), self.table.lookup("data")])
+        run = self.compact[2]
+        # self.result = load(...) is an attribute assignment, not a call operation.
+        self.assertEqual([self.table.resolve(i) for i in run.symbol_ids("target_function_name")], ["log"])
+        self.assertEqual(self.compact[1].symbol_ids("target_function_name"), [])
+
+    def test_unknown_fields_match_no_keys(self):
+        code = "def f(a, **kw):\n    x = g(a, **kw)\n    return x\n"
+        compact = CompactHoloform(generate_holoform_from_code_string(code), SymbolTable())
+        plain = CompactHoloform(holoform_to_dict(generate_holoform_from_code_string(code)), SymbolTable())
+        for holoform in (compact, plain):
+            self.assertEqual(holoform.symbol_ids("no_such_field"), [])
+            # A record slot is found even though its name was never interned.
+            self.assertEqual(holoform.symbol_ids("target_function_name"), [holoform.table.lookup("g")])
+
+    def test_plain_dict_operations(self):
+        holoform = holoform_to_dict(self.holoforms[0])
+        compact = CompactHoloform(holoform, self.table)
+        self.assertEqual(compact.to_dict(), holoform)
+        self.assertEqual(compact.symbol_ids("target_function_name"), self.compact[0].symbol_ids("target_function_name"))
+
+    def test_deep_nesting_does_not_recurse(self):
+        depth = 1000
+        body = [ast.Assign(targets=[ast.Name(id="x", ctx=ast.Store())], value=ast.Constant(value=1), lineno=1)]
+        for _ in range(depth):
+            body = [ast.If(test=ast.Name(id="a", ctx=ast.Load()), body=body, orelse=[])]
+        function = ast.FunctionDef(
+            name="deep", args=ast.arguments(posonlyargs=[], args=[ast.arg(arg="a")], kwonlyargs=[],
+                                            kw_defaults=[], defaults=[]),
+            body=body, decorator_list=[], returns=None)
+        compact = CompactHoloform(HoloformGeneratorVisitor([]).visit(function), SymbolTable())
+
+        operations = compact["operations"]
+        for _ in range(depth):
+            self.assertEqual(operations[0]["subtype"], "if")
+            operations = operations[0]["body"]
+        self.assertEqual(operations[0]["assign_to_variable"], "x")
+        self.assertEqual(compact.symbol_ids("assign_to_variable"), [compact.table.lookup("x")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,14 @@
 import os
+from src.holoform_generators.ignore_rules import WalkStats
 from src.holoform_generators.project_parser import parse_project
 
 def simulated_zero_in(project_path, entry_point_func, bug_description):
     """
     Simulates the "zero-in" process of bug localization using a project-level call graph.
     """
-    holoforms, call_graph = parse_project(project_path)
+    walk_stats = WalkStats()
+    holoforms, call_graph = parse_project(project_path, walk_stats=walk_stats)
+    print(walk_stats.report())
 
     print("--- Project Holoforms ---")
     for holoform in holoforms: